@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+
+from aiconsole.core.gpt.telemetry import llm_telemetry
+
+router = APIRouter()
+
+
+@router.get("/llm")
+def get_llm_telemetry(
+    chat_id: str | None = None,
+    agent_id: str | None = None,
+    model: str | None = None,
+    since: float | None = None,
+    until: float | None = None,
+):
+    """
+    Totals and p50/p90/p99 of time to first token, duration and tokens per second of LLM requests, optionally
+    filtered by chat, agent, model and a time range (unix timestamps).
+    """
+
+    return llm_telemetry().summary(chat_id=chat_id, agent_id=agent_id, model=model, since=since, until=until)
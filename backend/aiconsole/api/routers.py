@@ -23,6 +23,7 @@ from aiconsole.api.endpoints import (
     materials,
     projects,
     settings,
+    telemetry,
     tools,
     websockets,
 )
@@ -35,5 +36,6 @@ app_router.include_router(code.router, prefix="/api/code", tags=["code"])
 app_router.include_router(materials.router, prefix="/api/materials", tags=["materials"])
 app_router.include_router(projects.router, prefix="/api/projects", tags=["projects"])
 app_router.include_router(settings.router, prefix="/api/settings", tags=["settings"])
+app_router.include_router(telemetry.router, prefix="/api/telemetry", tags=["telemetry"])
 app_router.include_router(tools.router, prefix="/api/tools", tags=["tools"])
 app_router.include_router(websockets.router, prefix="/ws", tags=["websockets"])
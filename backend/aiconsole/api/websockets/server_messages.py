@@ -57,6 +57,9 @@ class AssetsUpdatedServerMessage(BaseServerMessage):
     initial: bool
     asset_type: AssetType
     count: int
+    # Set when only some assets were reloaded, otherwise all of them were
+    changed_ids: list[str] | None = None
+    deleted_ids: list[str] | None = None
 
 
 class SettingsServerMessage(BaseServerMessage):
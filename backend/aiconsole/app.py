@@ -28,6 +28,7 @@ from aiconsole.core.db.database import db
 from aiconsole.core.project.paths import get_project_directory_safe
 from aiconsole.core.settings.settings import settings
 from aiconsole.core.storage.db_storage import DatabaseStorage
+from aiconsole.utils.file_watcher import file_watcher
 
 if "BE_SENTRY_DSN" in os.environ:
     sentry_sdk.init(
@@ -48,6 +49,9 @@ async def lifespan(app: FastAPI):
     settings().configure(DatabaseStorage(project_path=get_project_directory_safe()))
     yield
 
+    settings().destroy()
+    file_watcher().stop()
+
 
 def app():
     origin = os.getenv("CORS_ORIGIN", None)
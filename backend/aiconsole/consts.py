@@ -51,8 +51,42 @@ COMMANDS_HISTORY_JSON: str = "command_history.json"
 DIRECTOR_MIN_TOKENS: int = 250
 DIRECTOR_PREFERRED_TOKENS: int = 1000
 
+# Budget of one director run (all steps started by a single user message)
+DIRECTOR_MAX_STEPS: int = int(os.environ.get("AICONSOLE_DIRECTOR_MAX_STEPS", 25))
+DIRECTOR_MAX_TOKENS: int = int(os.environ.get("AICONSOLE_DIRECTOR_MAX_TOKENS", 500_000))
+DIRECTOR_MAX_SECONDS: float = float(os.environ.get("AICONSOLE_DIRECTOR_MAX_SECONDS", 30 * 60))
+
+# With more enabled materials than this, the director only chooses among the ones most relevant to the conversation
+DIRECTOR_MAX_MATERIALS: int = int(os.environ.get("AICONSOLE_DIRECTOR_MAX_MATERIALS", 30))
+
 MAX_RECENT_PROJECTS = 8
 
+# Opt-in on-disk cache of LLM responses, repeated identical requests are replayed without calling the API
+LLM_CACHE_ENABLED: bool = os.environ.get("AICONSOLE_LLM_CACHE", "").lower() in ("1", "true", "yes")
+LLM_CACHE_TTL_SECONDS: int = int(os.environ.get("AICONSOLE_LLM_CACHE_TTL_SECONDS", 7 * 24 * 60 * 60))
+LLM_CACHE_MAX_BYTES: int = int(os.environ.get("AICONSOLE_LLM_CACHE_MAX_MB", 256)) * 1024 * 1024
+# Requests sampled above this temperature are not cached, raise it to also replay agent answers (0.2)
+LLM_CACHE_MAX_TEMPERATURE: float = float(os.environ.get("AICONSOLE_LLM_CACHE_MAX_TEMPERATURE", 0))
+
+# "stable" lists agents, materials and enums in prompts sorted by id, so identical requests share a cacheable prefix,
+# "shuffle" randomises them on every request to counter the bias of LLMs towards the first items
+PROMPT_ORDERING: str = os.environ.get("AICONSOLE_PROMPT_ORDERING", "stable")
+
+# Memory budget of rendered static text and API materials kept between renders
+MATERIAL_RENDER_CACHE_MAX_BYTES: int = int(os.environ.get("AICONSOLE_MATERIAL_RENDER_CACHE_MAX_MB", 32)) * 1024 * 1024
+
+# Materials of one step are rendered concurrently, a render taking longer than the timeout is replaced by an error stub
+MATERIAL_RENDER_MAX_CONCURRENCY: int = int(os.environ.get("AICONSOLE_MATERIAL_RENDER_MAX_CONCURRENCY", 8))
+MATERIAL_RENDER_TIMEOUT_SECONDS: float = float(os.environ.get("AICONSOLE_MATERIAL_RENDER_TIMEOUT_SECONDS", 30))
+
+# Threads parsing asset files when all assets of a type are loaded
+ASSET_LOADING_MAX_WORKERS: int = int(
+    os.environ.get("AICONSOLE_ASSET_LOADING_MAX_WORKERS", min(32, (os.cpu_count() or 1) + 4))
+)
+
+# How often the settings database is checked for changes made by other connections or processes
+SETTINGS_POLL_INTERVAL_SECONDS: float = float(os.environ.get("AICONSOLE_SETTINGS_POLL_INTERVAL_SECONDS", 0.5))
+
 
 LOG_FORMAT: str = "{name} {funcName} {message}"
 LOG_STYLE: str = "{"
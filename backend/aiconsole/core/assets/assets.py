@@ -15,23 +15,28 @@
 # limitations under the License.
 import datetime
 import logging
+from pathlib import Path
 from typing import Dict, List, Optional, TYPE_CHECKING
 
-import watchdog.events
-import watchdog.observers
-
 from aiconsole.api.websockets.connection_manager import connection_manager
-from aiconsole.api.websockets.server_messages import AssetsUpdatedServerMessage
+from aiconsole.api.websockets.server_messages import (
+    AssetsUpdatedServerMessage,
+    ErrorServerMessage,
+)
+from aiconsole.core.assets.fs.asset_file_index import AssetFileIndex
 from aiconsole.core.assets.fs.delete_asset_from_fs import delete_asset_from_fs
+from aiconsole.core.assets.fs.load_asset_from_fs import load_asset_from_fs
 from aiconsole.core.assets.fs.move_asset_in_fs import move_asset_in_fs
 from aiconsole.core.assets.fs.project_asset_exists_fs import project_asset_exists_fs
 from aiconsole.core.assets.fs.save_asset_to_fs import save_asset_to_fs
+from aiconsole.core.assets.materials.material_index import material_index
 from aiconsole.core.assets.types import Asset, AssetLocation, AssetStatus, AssetType
 from aiconsole.core.project import project
 from aiconsole.core.project.paths import get_project_assets_directory
 from aiconsole.core.settings.settings import settings
 from aiconsole.core.storage.db_storage import create_storage
-from aiconsole.utils.BatchingWatchDogHandler import BatchingWatchDogHandler
+from aiconsole.utils.file_watcher import file_watcher
+from aiconsole.utils.list_files_in_file_system import list_files_in_file_system
 from aiconsole_toolkit.settings.partial_settings_data import PartialSettingsData
 from aiconsole.core.db.database import db
 from aiconsole.core.db.models import Asset as AssetModel
@@ -50,40 +55,30 @@ class Assets:
     def __init__(self, asset_type: AssetType):
         self._suppress_notification_until: datetime.datetime | None = None
         self.asset_type = asset_type
+        self._file_index = AssetFileIndex()
         self._storage = create_storage(project.get_project_path())
 
-        self.observer = watchdog.observers.Observer()
-
         get_project_assets_directory(asset_type).mkdir(parents=True, exist_ok=True)
-        self.observer.schedule(
-            BatchingWatchDogHandler(self.reload),
+        self._subscription = file_watcher().subscribe(
             get_project_assets_directory(asset_type),
+            self._when_files_changed,
             recursive=True,
+            extension=".toml",
         )
-        self.observer.start()
-
-        self._load_assets()
 
     def stop(self):
-        self.observer.stop()
+        self._subscription.cancel()
 
-    def _load_assets(self) -> None:
-        """Load assets from database"""
-        assets = db.get_all_assets()
-        self._assets = {asset.id: asset for asset in assets if asset.type == self.asset_type}
+    async def _when_files_changed(self, paths: set[Path]):
+        await self.reload(paths=paths)
 
     async def load_assets(self):
-        """Load assets from database"""
-        self._assets = {}
-        
-        # Get all assets of this type
-        assets = self._storage.get_all_assets(self.asset_type)
-        
-        # Organize by ID
-        for asset in assets:
-            if asset.id not in self._assets:
-                self._assets[asset.id] = []
-            self._assets[asset.id].append(asset)
+        """Load project assets from the project directory, followed by the preinstalled ones"""
+        from aiconsole.core.assets.load_all_assets import load_all_assets
+
+        self._assets = await load_all_assets(self.asset_type)
+
+        self._update_material_index()
 
     async def save_asset(self, asset: Asset, old_asset_id: str, create: bool):
         """Save asset to database"""
@@ -123,6 +118,7 @@ class Assets:
 
         self._assets[asset.id].insert(0, asset)
 
+        self._update_material_index()
         self._suppress_notification()
 
         return rename
@@ -136,8 +132,14 @@ class Assets:
 
         self._storage.delete_asset(self.asset_type, asset_id)
 
+        self._update_material_index()
         self._suppress_notification()
 
+    def _update_material_index(self):
+        # Only the changed materials are re-indexed
+        if self.asset_type == AssetType.MATERIAL:
+            material_index().update(self.get_all_assets())  # type: ignore
+
     def _suppress_notification(self):
         self._suppress_notification_until = datetime.datetime.now() + datetime.timedelta(seconds=10)
 
@@ -151,24 +153,76 @@ class Assets:
         """Get all assets from in-memory cache"""
         return [assets[0] for assets in self._assets.values() if len(assets) > 0]
 
-    async def reload(self, initial: bool = False):
-        from aiconsole.core.assets.load_all_assets import load_all_assets
+    def _project_files(self) -> list[Path]:
+        directory = get_project_assets_directory(self.asset_type).absolute()
+        return [path for path in list_files_in_file_system(directory) if path.suffix == ".toml"]
+
+    def _is_notification_suppressed(self) -> bool:
+        return bool(self._suppress_notification_until and self._suppress_notification_until >= datetime.datetime.now())
+
+    async def reload(self, initial: bool = False, paths: set[Path] | None = None):
+        """
+        Reloads all assets, or with paths only the assets whose files among them were added, modified or deleted.
+        """
+
+        if paths is not None:
+            await self._reload_paths(paths)
+            return
 
         _log.info(f"Reloading {self.asset_type}s ...")
 
         await self.load_assets()
+        self._file_index.index(self._project_files())
 
         await connection_manager().send_to_all(
             AssetsUpdatedServerMessage(
-                initial=(
-                    initial
-                    or not (
-                        not self._suppress_notification_until
-                        or self._suppress_notification_until < datetime.datetime.now()
+                initial=initial or self._is_notification_suppressed(),
+                asset_type=self.asset_type,
+                count=len(self._assets),
+            )
+        )
+
+    async def _reload_paths(self, paths: set[Path]):
+        changed_paths = self._file_index.changed(paths)
+
+        if not changed_paths:
+            _log.debug(f"No {self.asset_type} files changed")
+            return
+
+        changed_ids: list[str] = []
+        deleted_ids: list[str] = []
+
+        for id in sorted({path.stem for path in changed_paths}):
+            assets = [asset for asset in self._assets.get(id, []) if asset.defined_in != AssetLocation.PROJECT_DIR]
+
+            if (get_project_assets_directory(self.asset_type) / f"{id}.toml").exists():
+                try:
+                    assets.insert(0, await load_asset_from_fs(self.asset_type, id, AssetLocation.PROJECT_DIR))
+                except Exception as e:
+                    await connection_manager().send_to_all(
+                        ErrorServerMessage(error=f"Invalid {self.asset_type} {id} {e}")
                     )
-                ),
+                    continue
+
+            if assets:
+                self._assets[id] = assets
+                changed_ids.append(id)
+            elif self._assets.pop(id, None) is not None:
+                deleted_ids.append(id)
+
+        if not changed_ids and not deleted_ids:
+            return
+
+        _log.info(f"Reloaded {self.asset_type}s: {len(changed_ids)} changed, {len(deleted_ids)} deleted")
+        self._update_material_index()
+
+        await connection_manager().send_to_all(
+            AssetsUpdatedServerMessage(
+                initial=self._is_notification_suppressed(),
                 asset_type=self.asset_type,
                 count=len(self._assets),
+                changed_ids=changed_ids,
+                deleted_ids=deleted_ids,
             )
         )
 
@@ -0,0 +1,70 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+
+@dataclass(frozen=True, slots=True)
+class AssetFileState:
+    mtime_ns: int
+    size: int
+    content_hash: str
+
+
+def _content_hash(path: Path) -> str:
+    with open(path, "rb") as file:
+        return hashlib.blake2b(file.read(), digest_size=16).hexdigest()
+
+
+class AssetFileIndex:
+    """
+    mtime, size and content hash of the asset files seen so far.
+
+    changed() tells which of the reported paths were really added, modified or deleted, a file is only hashed when
+    its mtime or size differ from the indexed ones, so that touching a file or saving it unchanged does not count.
+    """
+
+    def __init__(self):
+        self._files: dict[Path, AssetFileState] = {}
+
+    def __len__(self):
+        return len(self._files)
+
+    def __contains__(self, path: Path):
+        return path in self._files
+
+    def update(self, path: Path) -> bool:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return self._files.pop(path, None) is not None
+
+        state = self._files.get(path)
+
+        if state is not None and state.mtime_ns == stat.st_mtime_ns and state.size == stat.st_size:
+            return False
+
+        try:
+            content_hash = _content_hash(path)
+        except FileNotFoundError:
+            return self._files.pop(path, None) is not None
+
+        self._files[path] = AssetFileState(stat.st_mtime_ns, stat.st_size, content_hash)
+        return state is None or state.content_hash != content_hash
+
+    def changed(self, paths: Iterable[Path]) -> set[Path]:
+        return {path for path in paths if self.update(path)}
+
+    def index(self, paths: Iterable[Path]):
+        """
+        Replaces the index with the given files, e.g. after a full reload.
+        """
+
+        paths = set(paths)
+
+        for path in [path for path in self._files if path not in paths]:
+            del self._files[path]
+
+        for path in paths:
+            self.update(path)
@@ -0,0 +1,86 @@
+import hashlib
+import logging
+import os
+import pickle
+import sys
+from importlib import metadata
+from pathlib import Path
+
+import pydantic
+
+from aiconsole.consts import AICONSOLE_USER_CONFIG_DIR
+from aiconsole.core.assets.types import Asset, AssetType
+
+_log = logging.getLogger(__name__)
+
+# Bump when the pickled layout changes
+_SNAPSHOT_FORMAT = 1
+
+
+def _package_version() -> str:
+    try:
+        return metadata.version("aiconsole")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def core_assets_snapshot_key(directory: Path) -> str:
+    """
+    Changes with the package version, the versions of python and pydantic the assets were pickled with, and for
+    editable installs with the mtime of the core assets directory (files added, removed or replaced by editors).
+    """
+
+    try:
+        directory_mtime = os.stat(directory).st_mtime_ns
+    except FileNotFoundError:
+        directory_mtime = 0
+
+    key = f"{_SNAPSHOT_FORMAT}|{_package_version()}|{sys.version_info[:2]}|{pydantic.VERSION}|{directory_mtime}"
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+
+def _snapshots_directory() -> Path:
+    return AICONSOLE_USER_CONFIG_DIR() / "snapshots"
+
+
+def _snapshot_path(asset_type: AssetType, key: str) -> Path:
+    return _snapshots_directory() / f"core_{asset_type.value}s_{key}.pickle"
+
+
+def read_core_assets_snapshot(asset_type: AssetType, key: str) -> dict[str, Asset] | None:
+    try:
+        with open(_snapshot_path(asset_type, key), "rb") as file:
+            assets = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        _log.warning(f"Ignoring unreadable snapshot of core {asset_type}s: {e}")
+        return None
+
+    if not isinstance(assets, dict):
+        return None
+
+    return assets
+
+
+def write_core_assets_snapshot(asset_type: AssetType, key: str, assets: dict[str, Asset]):
+    """
+    Written atomically, snapshots of other keys for the same asset type are removed.
+    """
+
+    path = _snapshot_path(asset_type, key)
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_suffix(f".{os.getpid()}.tmp")
+
+        with open(temporary_path, "wb") as file:
+            pickle.dump(assets, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temporary_path, path)
+
+        for stale_path in path.parent.glob(f"core_{asset_type.value}s_*.pickle"):
+            if stale_path != path:
+                stale_path.unlink(missing_ok=True)
+    except (OSError, pickle.PicklingError) as e:
+        _log.warning(f"Could not write snapshot of core {asset_type}s: {e}")
@@ -16,12 +16,17 @@
 
 import logging
 import os
+from pathlib import Path
 
 import rtoml
 
 from aiconsole.core.assets.agents.agent import AICAgent
 from aiconsole.core.assets.fs.exceptions import UserIsAnInvalidAgentIdError
-from aiconsole.core.assets.materials.material import Material, MaterialContentType
+from aiconsole.core.assets.materials.material import (
+    Material,
+    MaterialCacheScope,
+    MaterialContentType,
+)
 from aiconsole.core.assets.types import Asset, AssetLocation, AssetStatus, AssetType
 from aiconsole.core.gpt.consts import GPTMode
 from aiconsole.core.project.paths import (
@@ -58,11 +63,24 @@ async def load_asset_from_fs(asset_type: AssetType, asset_id: str, location: Ass
     else:
         raise KeyError(f"Asset {asset_id} not found")
 
-    with open(path, "r", encoding="utf8", errors="replace") as file:
-        tomldoc = rtoml.loads(file.read())
+    override = location == AssetLocation.PROJECT_DIR and (core_resource_path / f"{asset_id}.toml").exists()
+
+    return parse_asset_file(asset_type, path, location, override)
+
+
+def parse_asset_file(asset_type: AssetType, path: Path, location: AssetLocation, override: bool = False) -> Asset:
+    """
+    Blocking, safe to call from worker threads.
+    """
 
     asset_id = os.path.splitext(os.path.basename(path))[0]
 
+    if asset_type == AssetType.AGENT and asset_id == _USER_AGENT_ID:
+        raise UserIsAnInvalidAgentIdError()
+
+    with open(path, "r", encoding="utf8", errors="replace") as file:
+        tomldoc = rtoml.loads(file.read())
+
     params = {
         "id": asset_id,
         "name": str(tomldoc.get("name", asset_id)).strip(),
@@ -71,7 +89,7 @@ async def load_asset_from_fs(asset_type: AssetType, asset_id: str, location: Ass
         "usage": str(tomldoc["usage"]).strip(),
         "usage_examples": tomldoc.get("usage_examples", []),
         "default_status": AssetStatus(str(tomldoc.get("default_status", "enabled")).strip()),
-        "override": location == AssetLocation.PROJECT_DIR and (core_resource_path / f"{asset_id}.toml").exists(),
+        "override": override,
     }
 
     if asset_type == AssetType.MATERIAL:
@@ -92,6 +110,12 @@ async def load_asset_from_fs(asset_type: AssetType, asset_id: str, location: Ass
         if "content_api" in tomldoc and material.content_type == MaterialContentType.API:
             material.content = str(tomldoc["content_api"]).strip()
 
+        if "cache_ttl" in tomldoc:
+            material.cache_ttl = float(tomldoc["cache_ttl"])
+
+        if "cache_scope" in tomldoc:
+            material.cache_scope = MaterialCacheScope(str(tomldoc["cache_scope"]).strip())
+
         return material
 
     if asset_type == AssetType.AGENT:
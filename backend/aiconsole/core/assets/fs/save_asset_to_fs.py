@@ -103,6 +103,10 @@ async def save_asset_to_fs(asset: Asset, old_asset_id: str) -> Asset:
                 ),
             }[asset.content_type]()
 
+            if material.cache_ttl is not None:
+                doc.append("cache_ttl", tomlkit.item(material.cache_ttl))
+                doc.append("cache_scope", tomlkit.string(material.cache_scope))
+
         if isinstance(asset, AICAgent):
             doc.append("system", tomlkit.string(asset.system))
             doc.append("gpt_mode", tomlkit.string(asset.gpt_mode))
@@ -0,0 +1,49 @@
+import os
+
+from aiconsole.core.assets.fs.asset_file_index import AssetFileIndex
+
+
+def test_reports_added_modified_and_deleted_files(tmp_path):
+    index = AssetFileIndex()
+    added = tmp_path / "added.toml"
+    modified = tmp_path / "modified.toml"
+    deleted = tmp_path / "deleted.toml"
+
+    modified.write_text("name = 'before'")
+    deleted.write_text("name = 'deleted'")
+    index.index([modified, deleted])
+
+    added.write_text("name = 'added'")
+    modified.write_text("name = 'after, longer'")
+    deleted.unlink()
+
+    assert index.changed([added, modified, deleted]) == {added, modified, deleted}
+    assert index.changed([added, modified, deleted]) == set()
+    assert deleted not in index
+
+
+def test_ignores_files_saved_without_changes(tmp_path):
+    index = AssetFileIndex()
+    path = tmp_path / "material.toml"
+    path.write_text("name = 'material'")
+    index.index([path])
+
+    path.write_text("name = 'material'")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert index.changed([path]) == set()
+
+
+def test_index_forgets_files_that_are_gone(tmp_path):
+    index = AssetFileIndex()
+    first = tmp_path / "first.toml"
+    second = tmp_path / "second.toml"
+    first.write_text("")
+    second.write_text("")
+
+    index.index([first, second])
+    index.index([second])
+
+    assert len(index) == 1
+    assert first not in index
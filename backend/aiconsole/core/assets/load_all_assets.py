@@ -1,52 +1,146 @@
+import asyncio
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 from aiconsole.api.websockets.connection_manager import connection_manager
 from aiconsole.api.websockets.server_messages import ErrorServerMessage
+from aiconsole.consts import ASSET_LOADING_MAX_WORKERS
 from aiconsole.core.assets.assets import Assets
-from aiconsole.core.assets.fs.load_asset_from_fs import load_asset_from_fs
+from aiconsole.core.assets.fs.core_assets_snapshot import (
+    core_assets_snapshot_key,
+    read_core_assets_snapshot,
+    write_core_assets_snapshot,
+)
+from aiconsole.core.assets.fs.load_asset_from_fs import parse_asset_file
 from aiconsole.core.assets.types import Asset, AssetLocation, AssetStatus, AssetType
 from aiconsole.core.project.paths import (
     get_core_assets_directory,
     get_project_assets_directory,
 )
-from aiconsole.utils.list_files_in_file_system import list_files_in_file_system
+
+_log = logging.getLogger(__name__)
+
+
+@lru_cache
+def _executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=ASSET_LOADING_MAX_WORKERS, thread_name_prefix="asset-loader")
+
+
+def scan_asset_files(directory: Path) -> dict[str, Path]:
+    """
+    Asset ids and files in directory, read with a single scandir.
+    """
+
+    try:
+        with os.scandir(directory) as entries:
+            return {
+                entry.name[: -len(".toml")]: Path(entry.path)
+                for entry in entries
+                if entry.name.endswith(".toml") and entry.is_file()
+            }
+    except FileNotFoundError:
+        return {}
+
+
+async def _parse_asset_files(
+    asset_type: AssetType, jobs: list[tuple[str, Path, AssetLocation, bool]]
+) -> list[Asset | Exception]:
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *[
+            loop.run_in_executor(_executor(), parse_asset_file, asset_type, path, location, override)
+            for _, path, location, override in jobs
+        ],
+        return_exceptions=True,
+    )
+
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            raise result
+
+    return results  # type: ignore
+
+
+async def _report_invalid_asset(asset_type: AssetType, id: str, error: Exception):
+    await connection_manager().send_to_all(
+        ErrorServerMessage(
+            error=f"Invalid {asset_type} {id} {error}",
+        )
+    )
+
+
+_core_assets: dict[tuple[AssetType, str], dict[str, Asset]] = {}
+
+
+async def load_core_assets(asset_type: AssetType) -> dict[str, Asset]:
+    """
+    Preinstalled assets only change with the package, they are parsed once and kept in a snapshot keyed by version.
+    Project opens reach this through Assets.reload and load_all_assets, later runs unpickle the snapshot and later
+    opens in the same process reuse it from memory. Returns copies, callers are free to modify them.
+    """
+
+    directory = get_core_assets_directory(asset_type)
+    key = core_assets_snapshot_key(directory)
+
+    assets = _core_assets.get((asset_type, key)) or read_core_assets_snapshot(asset_type, key)
+
+    if assets is None:
+        jobs = [
+            (id, path, AssetLocation.AICONSOLE_CORE, False) for id, path in sorted(scan_asset_files(directory).items())
+        ]
+        assets = {}
+        valid = True
+
+        for (id, _, _, _), result in zip(jobs, await _parse_asset_files(asset_type, jobs)):
+            if isinstance(result, Exception):
+                valid = False
+                await _report_invalid_asset(asset_type, id, result)
+            else:
+                assets[id] = result
+
+        # Invalid core assets are reported on every load instead of being left out of a snapshot
+        if valid:
+            write_core_assets_snapshot(asset_type, key, assets)
+            _log.info(f"Created snapshot of {len(assets)} core {asset_type}s")
+
+    _core_assets[(asset_type, key)] = assets
+
+    return {id: asset.model_copy() for id, asset in assets.items()}
 
 
 async def load_all_assets(asset_type: AssetType) -> dict[str, list[Asset]]:
+    """
+    Project assets come first, the preinstalled ones (read from their snapshot) follow them.
+    """
+
     _assets: dict[str, list[Asset]] = {}
 
-    locations = [
-        [AssetLocation.PROJECT_DIR, get_project_assets_directory(asset_type)],
-        [AssetLocation.AICONSOLE_CORE, get_core_assets_directory(asset_type)],
+    core_assets = await load_core_assets(asset_type)
+
+    jobs = [
+        (id, path, AssetLocation.PROJECT_DIR, id in core_assets)
+        for id, path in sorted(scan_asset_files(get_project_assets_directory(asset_type)).items())
     ]
+    project_assets: list[tuple[str, Asset | Exception]] = list(
+        zip([id for id, _, _, _ in jobs], await _parse_asset_files(asset_type, jobs))
+    )
 
-    for [location, dir] in locations:
-        ids = set(
-            [
-                os.path.splitext(os.path.basename(path))[0]
-                for path in list_files_in_file_system(dir)
-                if os.path.splitext(Path(path))[-1] == ".toml"
-            ]
-        )
+    for id, result in project_assets + list(core_assets.items()):
+        if isinstance(result, Exception):
+            await _report_invalid_asset(asset_type, id, result)
+            continue
+
+        asset = result
+
+        # Legacy support (for v. prior to 0.2.11)
+        if Assets.get_status(asset.type, asset.id) == AssetStatus.FORCED:
+            Assets.set_status(asset.type, asset.id, AssetStatus.ENABLED)
 
-        for id in ids:
-            try:
-                asset = await load_asset_from_fs(asset_type, id, location)
-
-                # Legacy support (for v. prior to 0.2.11)
-                if Assets.get_status(asset.type, asset.id) == AssetStatus.FORCED:
-                    Assets.set_status(asset.type, asset.id, AssetStatus.ENABLED)
-
-                if id not in _assets:
-                    _assets[id] = []
-                _assets[id].append(asset)
-            except Exception as e:
-                await connection_manager().send_to_all(
-                    ErrorServerMessage(
-                        error=f"Invalid {asset_type} {id} {e}",
-                    )
-                )
-                continue
+        if id not in _assets:
+            _assets[id] = []
+        _assets[id].append(asset)
 
     return _assets
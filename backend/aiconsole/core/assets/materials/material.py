@@ -13,16 +13,21 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import hashlib
+import os
 import traceback
 from dataclasses import dataclass
 from enum import Enum
-from typing import TYPE_CHECKING
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Hashable
 
 from aiconsole.core.assets.materials.documentation_from_code import (
     documentation_from_code,
 )
+from aiconsole.core.assets.materials.render_cache import material_render_cache
 from aiconsole.core.assets.materials.rendered_material import RenderedMaterial
 from aiconsole.core.assets.types import Asset, AssetLocation, AssetStatus, AssetType
+from aiconsole.core.project.paths import get_project_directory_safe
 from aiconsole.utils.events import InternalEvent, internal_events
 
 if TYPE_CHECKING:
@@ -42,6 +47,20 @@ class MaterialContentType(str, Enum):
     API = "api"
 
 
+class MaterialCacheScope(str, Enum):
+    GLOBAL = "global"
+    CHAT = "chat"
+    AGENT = "agent"
+
+
+# Hooks keying cached renders of dynamic materials by the part of the context they depend on
+CACHE_SCOPE_KEYS: dict[MaterialCacheScope, Callable[["ContentEvaluationContext"], Hashable]] = {
+    MaterialCacheScope.GLOBAL: lambda context: None,
+    MaterialCacheScope.CHAT: lambda context: context.chat.id,
+    MaterialCacheScope.AGENT: lambda context: context.agent.id,
+}
+
+
 class Material(Asset):
     type: AssetType = AssetType.MATERIAL
     id: str
@@ -54,41 +73,91 @@ class Material(Asset):
     content_type: MaterialContentType = MaterialContentType.STATIC_TEXT
     content: str = ""
 
+    # Seconds a render of dynamic content stays fresh, None renders it every time
+    cache_ttl: float | None = None
+    cache_scope: MaterialCacheScope = MaterialCacheScope.GLOBAL
+
     def __hash__(self):
         return hash(self.id + self.version + self.name + self.usage + self.content_type + self.content)
 
+    def _content_file_path(self) -> Path | None:
+        # if starts with file:// then load the file, take into account file://./relative paths
+        if not self.content.startswith("file://"):
+            return None
+
+        content_file = self.content[len("file://") :]
+
+        from aiconsole.core.project.paths import (
+            get_core_assets_directory,
+            get_project_assets_directory,
+        )
+
+        project_dir_path = get_project_assets_directory(self.type)
+        core_resource_path = get_core_assets_directory(self.type)
+        # TODO: content_file path is relative. If material is default, only .toml file is copied to project
+        #  directory, so content_file is not found. If material is in project, then content_file is found.
+        # if self.defined_in == AssetLocation.PROJECT_DIR:
+        #     base_search_path = project_dir_path
+        # else:
+        #     base_search_path = core_resource_path
+
+        # This is a workaround for now, but it should be fixed in the future
+        if (project_dir_path / content_file).exists():
+            base_search_path = project_dir_path
+        else:
+            base_search_path = core_resource_path
+
+        return base_search_path / content_file
+
     @property
     def inlined_content(self):
-        # if starts with file:// then load the file, take into account file://./relative paths
-        if self.content.startswith("file://"):
-            content_file = self.content[len("file://") :]
-
-            from aiconsole.core.project.paths import (
-                get_core_assets_directory,
-                get_project_assets_directory,
-            )
-
-            project_dir_path = get_project_assets_directory(self.type)
-            core_resource_path = get_core_assets_directory(self.type)
-            # TODO: content_file path is relative. If material is default, only .toml file is copied to project
-            #  directory, so content_file is not found. If material is in project, then content_file is found.
-            # if self.defined_in == AssetLocation.PROJECT_DIR:
-            #     base_search_path = project_dir_path
-            # else:
-            #     base_search_path = core_resource_path
-
-            # This is a workaround for now, but it should be fixed in the future
-            if (project_dir_path / content_file).exists():
-                base_search_path = project_dir_path
-            else:
-                base_search_path = core_resource_path
+        content_file_path = self._content_file_path()
 
-            with open(base_search_path / content_file, "r", encoding="utf8", errors="replace") as file:
+        if content_file_path is not None:
+            with open(content_file_path, "r", encoding="utf8", errors="replace") as file:
                 return file.read()
 
         return self.content
 
+    def render_cache_key(self, context: "ContentEvaluationContext | None" = None) -> Hashable | None:
+        """
+        Renders of static text and API materials only depend on the material, for file:// content also on the
+        modification time of the file. Dynamic materials with a cache_ttl are additionally keyed by their cache_scope
+        and by the open project, whose cwd and venv they may read. None for materials that must be rendered every time.
+        """
+
+        if self.content_type == MaterialContentType.DYNAMIC_TEXT:
+            if self.cache_ttl is None or context is None:
+                return None
+            scope_key = (self.cache_scope, get_project_directory_safe(), CACHE_SCOPE_KEYS[self.cache_scope](context))
+        else:
+            scope_key = None
+
+        content_hash = hashlib.blake2b(
+            "\0".join((self.name, self.content_type, self.content)).encode(), digest_size=16
+        ).hexdigest()
+        source_mtime = None
+        content_file_path = self._content_file_path()
+
+        if content_file_path is not None:
+            try:
+                stat = os.stat(content_file_path)
+            except OSError:
+                return None
+            source_mtime = (str(content_file_path), stat.st_mtime_ns, stat.st_size)
+
+        return (self.id, self.version, content_hash, source_mtime, scope_key)
+
     async def render(self, context: "ContentEvaluationContext"):
+        cache_key = self.render_cache_key(context)
+
+        if cache_key is None:
+            return await self._render(context)
+
+        ttl = self.cache_ttl if self.content_type == MaterialContentType.DYNAMIC_TEXT else None
+        return await material_render_cache().render(cache_key, lambda: self._render(context), ttl)
+
+    async def _render(self, context: "ContentEvaluationContext"):
         header = f"# {self.name}\n\n"
 
         match self.content_type:
@@ -0,0 +1,129 @@
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable
+
+from aiconsole.core.assets.materials.material import Material
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do for from how i in is it its me my of on or that the this to use used using was "
+    "we what when with you your".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def _material_text(material: Material) -> str:
+    return " ".join([material.id, material.name, material.usage, *material.usage_examples])
+
+
+class _Document:
+    __slots__ = ("signature", "term_counts", "length")
+
+    def __init__(self, signature: int, term_counts: Counter[str]):
+        self.signature = signature
+        self.term_counts = term_counts
+        self.length = sum(term_counts.values())
+
+
+class MaterialIndex:
+    """
+    BM25 index over id, name, usage and usage examples of materials.
+
+    update() takes all current materials and only re-tokenizes the ones whose indexed fields changed, so it can be
+    called on every reload of the materials.
+    """
+
+    def __init__(self):
+        self._documents: dict[str, _Document] = {}
+        self._document_frequency: Counter[str] = Counter()
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._documents)
+
+    def update(self, materials: Iterable[Material]):
+        seen = set()
+
+        for material in materials:
+            seen.add(material.id)
+            text = _material_text(material)
+            signature = hash(text)
+            document = self._documents.get(material.id)
+
+            if document is not None and document.signature == signature:
+                continue
+
+            if document is not None:
+                self._remove(material.id)
+
+            self._add(material.id, _Document(signature, Counter(tokenize(text))))
+
+        for material_id in [material_id for material_id in self._documents if material_id not in seen]:
+            self._remove(material_id)
+
+    def _add(self, material_id: str, document: _Document):
+        self._documents[material_id] = document
+        self._document_frequency.update(document.term_counts.keys())
+        self._total_length += document.length
+
+    def _remove(self, material_id: str):
+        document = self._documents.pop(material_id)
+        self._total_length -= document.length
+
+        for term in document.term_counts:
+            self._document_frequency[term] -= 1
+
+            if self._document_frequency[term] <= 0:
+                del self._document_frequency[term]
+
+    def scores(self, query: str) -> dict[str, float]:
+        terms = set(tokenize(query))
+        count = len(self._documents)
+
+        if not terms or not count:
+            return {}
+
+        average_length = self._total_length / count or 1
+        inverse_frequencies = {
+            term: math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            for term in terms
+            if (frequency := self._document_frequency[term]) > 0
+        }
+
+        scores = {}
+        for material_id, document in self._documents.items():
+            score = 0.0
+
+            for term, inverse_frequency in inverse_frequencies.items():
+                term_count = document.term_counts.get(term)
+
+                if term_count:
+                    normalisation = BM25_K1 * (1 - BM25_B + BM25_B * document.length / average_length)
+                    score += inverse_frequency * term_count * (BM25_K1 + 1) / (term_count + normalisation)
+
+            if score:
+                scores[material_id] = score
+
+        return scores
+
+    def top(self, query: str, material_ids: Iterable[str], k: int) -> list[str]:
+        """
+        The k of the given material ids most relevant to the query, ties (e.g. no match at all) resolved by id.
+        """
+
+        scores = self.scores(query)
+        return sorted(material_ids, key=lambda material_id: (-scores.get(material_id, 0.0), material_id))[:k]
+
+
+@lru_cache
+def material_index() -> MaterialIndex:
+    return MaterialIndex()
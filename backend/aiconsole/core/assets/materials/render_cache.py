@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import sys
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Awaitable, Callable, Hashable
+
+from aiconsole.consts import MATERIAL_RENDER_CACHE_MAX_BYTES
+from aiconsole.core.assets.materials.rendered_material import RenderedMaterial
+
+_log = logging.getLogger(__name__)
+
+
+def _size(rendered_material: RenderedMaterial) -> int:
+    return sys.getsizeof(rendered_material.content) + sys.getsizeof(rendered_material.error)
+
+
+class _Entry:
+    __slots__ = ("rendered_material", "size", "expires_at", "stale_until")
+
+    def __init__(self, rendered_material: RenderedMaterial, size: int, ttl: float | None):
+        now = time.monotonic()
+        self.rendered_material = rendered_material
+        self.size = size
+        self.expires_at = now + ttl if ttl is not None else None
+        # A stale render is only served for one more ttl, e.g. not a date rendered before the app sat idle overnight
+        self.stale_until = now + 2 * ttl if ttl is not None else None
+
+    def fresh(self, now: float) -> bool:
+        return self.expires_at is None or now < self.expires_at
+
+    def servable(self, now: float) -> bool:
+        return self.stale_until is None or now < self.stale_until
+
+
+class MaterialRenderCache:
+    """
+    Least recently used renders of materials, keyed by Material.render_cache_key(), evicted once their contents
+    exceed max_bytes. Every get returns a copy, so the cached render can not be modified by callers.
+
+    Renders put with a ttl go stale after it, for one more ttl render() keeps serving a stale render while a fresh one
+    is rendered in the background (stale-while-revalidate), after that it waits for the fresh one. Concurrent renders
+    of a missing key share a single render.
+    """
+
+    def __init__(self, max_bytes: int = MATERIAL_RENDER_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._renders: dict[Hashable, asyncio.Task[RenderedMaterial]] = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable, allow_stale: bool = False) -> RenderedMaterial | None:
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is None or not (entry.fresh(now) or (allow_stale and entry.servable(now))):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry.rendered_material.model_copy()
+
+    def put(self, key: Hashable, rendered_material: RenderedMaterial, ttl: float | None = None):
+        size = _size(rendered_material)
+
+        if size > self.max_bytes:
+            return
+
+        self.discard(key)
+        self._entries[key] = _Entry(rendered_material.model_copy(), size, ttl)
+        self.size += size
+
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+            self.evictions += 1
+
+    def discard(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+
+        if entry is not None:
+            self.size -= entry.size
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    async def render(
+        self, key: Hashable, render: Callable[[], Awaitable[RenderedMaterial]], ttl: float | None = None
+    ) -> RenderedMaterial:
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None and entry.servable(now):
+            if not entry.fresh(now) and key not in self._renders:
+                _log.debug(f"Refreshing stale render {key} in the background")
+                self._start_render(key, render, ttl)
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry.rendered_material.model_copy()
+
+        self.misses += 1
+        task = self._renders.get(key) or self._start_render(key, render, ttl)
+
+        # Shielded, a caller that gets cancelled does not cancel the render other callers wait for
+        return (await asyncio.shield(task)).model_copy()
+
+    def _start_render(
+        self, key: Hashable, render: Callable[[], Awaitable[RenderedMaterial]], ttl: float | None
+    ) -> asyncio.Task[RenderedMaterial]:
+        async def _render() -> RenderedMaterial:
+            try:
+                rendered_material = await render()
+                self.put(key, rendered_material, ttl)
+                return rendered_material
+            finally:
+                self._renders.pop(key, None)
+
+        task = asyncio.create_task(_render())
+        task.add_done_callback(self._when_rendered)
+        self._renders[key] = task
+        return task
+
+    @staticmethod
+    def _when_rendered(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            _log.debug(f"Material render failed: {task.exception()}")
+
+
+@lru_cache
+def material_render_cache() -> MaterialRenderCache:
+    return MaterialRenderCache()
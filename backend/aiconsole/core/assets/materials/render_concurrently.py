@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import traceback
+from typing import Awaitable, Callable
+
+from aiconsole.consts import (
+    MATERIAL_RENDER_MAX_CONCURRENCY,
+    MATERIAL_RENDER_TIMEOUT_SECONDS,
+)
+from aiconsole.core.assets.materials.material import Material, MaterialRenderErrorEvent
+from aiconsole.core.assets.materials.rendered_material import RenderedMaterial
+from aiconsole.utils.events import internal_events
+
+_log = logging.getLogger(__name__)
+
+
+def _error_stub(material: Material, reason: str, error: str) -> RenderedMaterial:
+    return RenderedMaterial(
+        id=material.id,
+        content=f"# {material.name}\n\nThis material could not be rendered ({reason}).",
+        error=error,
+    )
+
+
+async def render_concurrently(
+    materials: list[Material],
+    render: Callable[[Material], Awaitable[RenderedMaterial]],
+    max_concurrency: int = MATERIAL_RENDER_MAX_CONCURRENCY,
+    timeout: float = MATERIAL_RENDER_TIMEOUT_SECONDS,
+) -> list[RenderedMaterial]:
+    """
+    Renders at most max_concurrency materials at a time and returns the renders in the order of the materials.
+
+    A material that fails or does not render within timeout seconds is replaced by an error stub, so that one broken
+    or slow material does not stop the others from being used.
+    """
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _render(material: Material) -> RenderedMaterial:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(render(material), timeout)
+            except asyncio.TimeoutError:
+                _log.warning(f"Rendering material {material.id} timed out after {timeout}s")
+                await internal_events().emit(
+                    MaterialRenderErrorEvent(), details=f"Material `{material.id}` timed out after {timeout}s"
+                )
+                return _error_stub(material, "timed out", f"Rendering timed out after {timeout}s")
+            except ValueError as e:
+                # Materials report their errors as ValueError(message, RenderedMaterial with the details)
+                if len(e.args) > 1 and isinstance(e.args[1], RenderedMaterial):
+                    _log.warning(f"Rendering material {material.id} failed: {e.args[0]}")
+                    return _error_stub(material, e.args[0], e.args[1].error)
+                _log.exception(f"Rendering material {material.id} failed")
+                return _error_stub(material, str(e), traceback.format_exc())
+            except Exception as e:
+                _log.exception(f"Rendering material {material.id} failed")
+                return _error_stub(material, str(e) or type(e).__name__, traceback.format_exc())
+
+    return list(await asyncio.gather(*[_render(material) for material in materials]))
@@ -0,0 +1,51 @@
+from aiconsole.core.assets.materials.material import Material
+from aiconsole.core.assets.materials.material_index import MaterialIndex
+from aiconsole.core.assets.types import AssetLocation
+
+
+def _material(material_id: str, usage: str, usage_examples: list[str] = []) -> Material:
+    return Material(
+        id=material_id,
+        name=material_id.replace("_", " ").title(),
+        usage=usage,
+        usage_examples=usage_examples,
+        defined_in=AssetLocation.AICONSOLE_CORE,
+        override=False,
+    )
+
+
+MATERIALS = [
+    _material("python_api", "Writing and running python code", ["Plot a chart with matplotlib"]),
+    _material("sending_emails", "Sending emails through SMTP", ["Send an email to my boss"]),
+    _material("weather", "Checking the current weather forecast"),
+]
+
+
+def test_ranks_materials_by_relevance():
+    index = MaterialIndex()
+    index.update(MATERIALS)
+
+    assert index.top("please send an email with the chart", ["python_api", "sending_emails", "weather"], 1) == [
+        "sending_emails"
+    ]
+    assert index.top("what is the weather tomorrow", ["python_api", "sending_emails", "weather"], 2) == [
+        "weather",
+        "python_api",
+    ]
+
+
+def test_updates_only_changed_materials():
+    index = MaterialIndex()
+    index.update(MATERIALS)
+    unchanged = index._documents["weather"]
+
+    index.update([MATERIALS[0], _material("sending_emails", "Reading the inbox"), MATERIALS[2]])
+
+    assert index._documents["weather"] is unchanged
+    assert "smtp" not in index._document_frequency
+    assert index.top("smtp inbox", ["python_api", "sending_emails", "weather"], 1) == ["sending_emails"]
+
+    index.update(MATERIALS[:1])
+
+    assert len(index) == 1
+    assert index._total_length == index._documents["python_api"].length
@@ -0,0 +1,204 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from aiconsole.core.assets.materials import material as material_module
+from aiconsole.core.assets.materials.material import (
+    Material,
+    MaterialCacheScope,
+    MaterialContentType,
+)
+from aiconsole.core.assets.materials.render_cache import MaterialRenderCache
+from aiconsole.core.assets.materials.rendered_material import RenderedMaterial
+from aiconsole.core.assets.types import AssetLocation
+from aiconsole.core.project import paths
+
+
+def _rendered(id: str, content: str) -> RenderedMaterial:
+    return RenderedMaterial(id=id, content=content, error="")
+
+
+def test_evicts_least_recently_used_renders_over_budget():
+    cache = MaterialRenderCache(max_bytes=10_000)
+    cache.put("a", _rendered("a", "x" * 3000))
+    entry_size = cache.size
+    cache.max_bytes = entry_size * 2
+
+    cache.put("b", _rendered("b", "y" * 3000))
+    assert cache.get("a") is not None
+
+    cache.put("c", _rendered("c", "z" * 3000))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.size <= cache.max_bytes
+    assert cache.evictions == 1
+
+
+def test_returns_copies():
+    cache = MaterialRenderCache()
+    cache.put("a", _rendered("a", "content"))
+
+    cache.get("a").content = "changed"  # type: ignore
+
+    assert cache.get("a").content == "content"  # type: ignore
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    cache = MaterialRenderCache()
+    monkeypatch.setattr(material_module, "material_render_cache", lambda: cache)
+    monkeypatch.setattr(paths, "get_project_assets_directory", lambda asset_type: tmp_path / "project")
+    monkeypatch.setattr(paths, "get_core_assets_directory", lambda asset_type: tmp_path)
+    return cache
+
+
+def _material(content: str, content_type: MaterialContentType = MaterialContentType.STATIC_TEXT) -> Material:
+    return Material(
+        id="material",
+        name="Material",
+        usage="",
+        usage_examples=[],
+        defined_in=AssetLocation.AICONSOLE_CORE,
+        override=False,
+        content_type=content_type,
+        content=content,
+    )
+
+
+@pytest.mark.asyncio
+async def test_serves_static_renders_from_memory_until_the_file_changes(cache, tmp_path):
+    source = tmp_path / "material.md"
+    source.write_text("first")
+    material = _material("file://material.md")
+
+    assert (await material.render(None)).content == "# Material\n\nfirst"  # type: ignore
+    assert (await material.render(None)).content == "# Material\n\nfirst"  # type: ignore
+
+    source.write_text("second!")
+
+    assert (await material.render(None)).content == "# Material\n\nsecond!"  # type: ignore
+    assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_keys_renders_by_content(cache):
+    api = _material('def api():\n    """Does things"""\n', MaterialContentType.API)
+
+    first = await api.render(None)  # type: ignore
+    assert (await api.render(None)) == first  # type: ignore
+
+    changed = api.model_copy(update={"content": 'def other():\n    """Does other things"""\n'})
+    assert "other" in (await changed.render(None)).content  # type: ignore
+    assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_does_not_cache_dynamic_materials(cache):
+    dynamic = _material("async def content(context):\n    return 'dynamic'\n", MaterialContentType.DYNAMIC_TEXT)
+
+    await dynamic.render(None)  # type: ignore
+    await dynamic.render(None)  # type: ignore
+
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_serves_stale_renders_while_revalidating():
+    cache = MaterialRenderCache()
+    renders = 0
+
+    async def render():
+        nonlocal renders
+        renders += 1
+        await asyncio.sleep(0.01)
+        return _rendered("a", f"render {renders}")
+
+    assert (await cache.render("a", render, ttl=0.05)).content == "render 1"
+    assert (await cache.render("a", render, ttl=0.05)).content == "render 1"
+
+    await asyncio.sleep(0.06)
+
+    assert (await cache.render("a", render, ttl=0.05)).content == "render 1"
+    assert (await cache.render("a", render, ttl=0.05)).content == "render 1"
+    await asyncio.sleep(0.02)
+
+    assert (await cache.render("a", render, ttl=0.05)).content == "render 2"
+    assert renders == 2
+
+
+@pytest.mark.asyncio
+async def test_renders_again_when_stale_for_longer_than_the_ttl():
+    cache = MaterialRenderCache()
+    renders = 0
+
+    async def render():
+        nonlocal renders
+        renders += 1
+        return _rendered("a", f"render {renders}")
+
+    assert (await cache.render("a", render, ttl=0.05)).content == "render 1"
+
+    await asyncio.sleep(0.12)
+
+    assert cache.get("a", allow_stale=True) is None
+    assert (await cache.render("a", render, ttl=0.05)).content == "render 2"
+    assert renders == 2
+
+
+@pytest.mark.asyncio
+async def test_shares_one_render_between_concurrent_misses():
+    cache = MaterialRenderCache()
+    renders = 0
+
+    async def render():
+        nonlocal renders
+        renders += 1
+        await asyncio.sleep(0.01)
+        return _rendered("a", "content")
+
+    results = await asyncio.gather(*[cache.render("a", render, ttl=10) for _ in range(5)])
+
+    assert renders == 1
+    assert all(result.content == "content" for result in results)
+
+
+def test_keys_dynamic_renders_by_scope():
+    dynamic = _material("async def content(context):\n    return 'dynamic'\n", MaterialContentType.DYNAMIC_TEXT)
+    context = SimpleNamespace(chat=SimpleNamespace(id="chat"), agent=SimpleNamespace(id="agent"))
+    other_chat = SimpleNamespace(chat=SimpleNamespace(id="other"), agent=SimpleNamespace(id="agent"))
+
+    assert dynamic.render_cache_key(context) is None  # type: ignore
+
+    dynamic.cache_ttl = 60
+    assert dynamic.render_cache_key(context) == dynamic.render_cache_key(other_chat)  # type: ignore
+
+    dynamic.cache_scope = MaterialCacheScope.CHAT
+    assert dynamic.render_cache_key(context) != dynamic.render_cache_key(other_chat)  # type: ignore
+
+
+def test_keys_dynamic_renders_by_project(monkeypatch, tmp_path):
+    dynamic = _material("async def content(context):\n    return 'dynamic'\n", MaterialContentType.DYNAMIC_TEXT)
+    dynamic.cache_ttl = 60
+    context = SimpleNamespace(chat=SimpleNamespace(id="chat"), agent=SimpleNamespace(id="agent"))
+
+    monkeypatch.setattr(material_module, "get_project_directory_safe", lambda: tmp_path / "first")
+    first_project_key = dynamic.render_cache_key(context)  # type: ignore
+    monkeypatch.setattr(material_module, "get_project_directory_safe", lambda: tmp_path / "second")
+
+    assert dynamic.render_cache_key(context) != first_project_key  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_caches_dynamic_materials_with_a_ttl(cache):
+    dynamic = _material(
+        "import random\nasync def content(context):\n    return str(random.random())\n",
+        MaterialContentType.DYNAMIC_TEXT,
+    )
+    dynamic.cache_ttl = 60
+    context = SimpleNamespace(chat=SimpleNamespace(id="chat"), agent=SimpleNamespace(id="agent"))
+
+    first = await dynamic.render(context)  # type: ignore
+
+    assert (await dynamic.render(context)).content == first.content  # type: ignore
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from aiconsole.core.assets.materials.material import Material, MaterialContentType
+from aiconsole.core.assets.materials.render_concurrently import render_concurrently
+from aiconsole.core.assets.materials.rendered_material import RenderedMaterial
+from aiconsole.core.assets.types import AssetLocation
+
+
+def _material(id: str) -> Material:
+    return Material(
+        id=id,
+        name=id.title(),
+        usage="",
+        usage_examples=[],
+        defined_in=AssetLocation.AICONSOLE_CORE,
+        override=False,
+        content_type=MaterialContentType.STATIC_TEXT,
+        content=id,
+    )
+
+
+@pytest.mark.asyncio
+async def test_keeps_order_and_caps_concurrency():
+    materials = [_material(f"m{i}") for i in range(6)]
+    running = 0
+    max_running = 0
+
+    async def render(material: Material) -> RenderedMaterial:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        # Later materials finish first
+        await asyncio.sleep(0.01 * (len(materials) - int(material.id[1:])))
+        running -= 1
+        return RenderedMaterial(id=material.id, content=material.id, error="")
+
+    rendered = await render_concurrently(materials, render, max_concurrency=2, timeout=5)
+
+    assert [rendered_material.id for rendered_material in rendered] == [material.id for material in materials]
+    assert max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_failures_and_timeouts_become_error_stubs():
+    materials = [_material("ok"), _material("slow"), _material("broken"), _material("invalid")]
+
+    async def render(material: Material) -> RenderedMaterial:
+        if material.id == "slow":
+            await asyncio.sleep(10)
+        if material.id == "broken":
+            raise RuntimeError("boom")
+        if material.id == "invalid":
+            raise ValueError("Error in invalid material", RenderedMaterial(id="invalid", content="", error="trace"))
+        return RenderedMaterial(id=material.id, content="content", error="")
+
+    ok, slow, broken, invalid = await render_concurrently(materials, render, timeout=0.05)
+
+    assert ok.content == "content" and not ok.error
+    assert slow.id == "slow" and "timed out" in slow.error
+    assert broken.id == "broken" and "boom" in broken.error
+    assert invalid.id == "invalid" and invalid.error == "trace"
@@ -0,0 +1,123 @@
+from types import SimpleNamespace
+
+import pytest
+
+from aiconsole.core.assets import assets as assets_module
+from aiconsole.core.assets import load_all_assets
+from aiconsole.core.assets.fs import core_assets_snapshot, load_asset_from_fs
+from aiconsole.core.assets.types import AssetLocation, AssetStatus, AssetType
+
+_MATERIAL = """
+name = "{name}"
+usage = "Testing"
+content_type = "static_text"
+content_static_text = "{name}"
+"""
+
+
+@pytest.fixture
+def directories(tmp_path, monkeypatch):
+    project = tmp_path / "project"
+    core = tmp_path / "core"
+    project.mkdir()
+    core.mkdir()
+
+    messages = []
+
+    async def send_to_all(message):
+        messages.append(message)
+
+    connection = SimpleNamespace(send_to_all=send_to_all)
+    subscription = SimpleNamespace(cancel=lambda: None)
+
+    for module in (assets_module, load_all_assets, load_asset_from_fs):
+        monkeypatch.setattr(module, "get_project_assets_directory", lambda asset_type: project)
+    for module in (load_all_assets, load_asset_from_fs):
+        monkeypatch.setattr(module, "get_core_assets_directory", lambda asset_type: core)
+    for module in (assets_module, load_all_assets):
+        monkeypatch.setattr(module, "connection_manager", lambda: connection)
+
+    monkeypatch.setattr(assets_module, "project", SimpleNamespace(get_project_path=lambda: project))
+    monkeypatch.setattr(assets_module, "create_storage", lambda project_path: None)
+    monkeypatch.setattr(
+        assets_module, "file_watcher", lambda: SimpleNamespace(subscribe=lambda *args, **kwargs: subscription)
+    )
+    monkeypatch.setattr(assets_module, "material_index", lambda: SimpleNamespace(update=lambda materials: None))
+    monkeypatch.setattr(assets_module.Assets, "get_status", staticmethod(lambda asset_type, id: AssetStatus.ENABLED))
+    monkeypatch.setattr(core_assets_snapshot, "_snapshots_directory", lambda: tmp_path / "snapshots")
+    monkeypatch.setattr(load_all_assets, "_core_assets", {})
+
+    return project, core, messages
+
+
+@pytest.mark.asyncio
+async def test_reload_loads_project_and_core_assets(directories):
+    project, core, messages = directories
+    (core / "shared.toml").write_text(_MATERIAL.format(name="core shared"))
+    (core / "core_only.toml").write_text(_MATERIAL.format(name="core only"))
+    (project / "shared.toml").write_text(_MATERIAL.format(name="project shared"))
+
+    materials = assets_module.Assets(AssetType.MATERIAL)
+    await materials.reload(initial=True)
+
+    assert materials.get_asset("shared").name == "project shared"  # type: ignore
+    assert materials.get_asset("shared").override  # type: ignore
+    assert materials.get_asset("core_only").defined_in == AssetLocation.AICONSOLE_CORE  # type: ignore
+    assert messages[-1].count == 2 and messages[-1].changed_ids is None
+
+
+@pytest.mark.asyncio
+async def test_reload_reads_core_assets_from_the_snapshot(directories, monkeypatch):
+    project, core, messages = directories
+    (core / "material.toml").write_text(_MATERIAL.format(name="core"))
+    await assets_module.Assets(AssetType.MATERIAL).reload(initial=True)
+
+    # As in a new run: nothing in memory, only the snapshot on disk
+    parsed = []
+    monkeypatch.setattr(load_all_assets, "parse_asset_file", lambda *args: parsed.append(args))
+    monkeypatch.setattr(load_all_assets, "_core_assets", {})
+
+    materials = assets_module.Assets(AssetType.MATERIAL)
+    await materials.reload(initial=True)
+
+    assert not parsed
+    assert materials.get_asset("material").name == "core"  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_reload_of_paths_applies_only_changed_files(directories):
+    project, core, messages = directories
+    (core / "shared.toml").write_text(_MATERIAL.format(name="core shared"))
+    (project / "shared.toml").write_text(_MATERIAL.format(name="project shared"))
+    (project / "edited.toml").write_text(_MATERIAL.format(name="before"))
+    (project / "untouched.toml").write_text(_MATERIAL.format(name="untouched"))
+
+    materials = assets_module.Assets(AssetType.MATERIAL)
+    await materials.reload(initial=True)
+
+    (project / "edited.toml").write_text(_MATERIAL.format(name="after the edit"))
+    (project / "shared.toml").unlink()
+    (project / "added.toml").write_text(_MATERIAL.format(name="added"))
+
+    await materials.reload(paths={project / name for name in ("edited.toml", "shared.toml", "added.toml")})
+
+    assert materials.get_asset("edited").name == "after the edit"  # type: ignore
+    assert materials.get_asset("added").name == "added"  # type: ignore
+    assert materials.get_asset("shared").defined_in == AssetLocation.AICONSOLE_CORE  # type: ignore
+    assert materials.get_asset("untouched").name == "untouched"  # type: ignore
+    assert set(messages[-1].changed_ids) == {"added", "edited", "shared"}
+
+
+@pytest.mark.asyncio
+async def test_reload_of_paths_drops_deleted_project_only_assets(directories):
+    project, core, messages = directories
+    (project / "deleted.toml").write_text(_MATERIAL.format(name="deleted"))
+
+    materials = assets_module.Assets(AssetType.MATERIAL)
+    await materials.reload(initial=True)
+
+    (project / "deleted.toml").unlink()
+    await materials.reload(paths={project / "deleted.toml"})
+
+    assert materials.get_asset("deleted") is None
+    assert messages[-1].deleted_ids == ["deleted"]
@@ -0,0 +1,111 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from aiconsole.core.assets import load_all_assets as module
+from aiconsole.core.assets.fs import core_assets_snapshot
+from aiconsole.core.assets.types import AssetLocation, AssetStatus, AssetType
+
+_MATERIAL = """
+name = "{name}"
+usage = "Testing"
+content_type = "static_text"
+content_static_text = "{name}"
+"""
+
+
+@pytest.fixture
+def directories(tmp_path, monkeypatch):
+    project = tmp_path / "project"
+    core = tmp_path / "core"
+    project.mkdir()
+    core.mkdir()
+
+    errors = []
+
+    async def send_to_all(message):
+        errors.append(message.error)
+
+    monkeypatch.setattr(module, "get_project_assets_directory", lambda asset_type: project)
+    monkeypatch.setattr(module, "get_core_assets_directory", lambda asset_type: core)
+    monkeypatch.setattr(module, "connection_manager", lambda: SimpleNamespace(send_to_all=send_to_all))
+    monkeypatch.setattr(module.Assets, "get_status", staticmethod(lambda asset_type, id: AssetStatus.ENABLED))
+    monkeypatch.setattr(core_assets_snapshot, "_snapshots_directory", lambda: tmp_path / "snapshots")
+    monkeypatch.setattr(module, "_core_assets", {})
+
+    return project, core, errors
+
+
+def test_scans_only_toml_files(tmp_path):
+    (tmp_path / "a.toml").write_text("")
+    (tmp_path / "b.txt").write_text("")
+    (tmp_path / "nested.toml").mkdir()
+
+    assert module.scan_asset_files(tmp_path) == {"a": tmp_path / "a.toml"}
+    assert module.scan_asset_files(tmp_path / "missing") == {}
+
+
+@pytest.mark.asyncio
+async def test_loads_project_and_core_assets(directories):
+    project, core, errors = directories
+
+    for index in range(20):
+        (core / f"material_{index}.toml").write_text(_MATERIAL.format(name=f"core {index}"))
+    (project / "material_0.toml").write_text(_MATERIAL.format(name="project 0"))
+    (project / "broken.toml").write_text("usage = ")
+
+    assets = await module.load_all_assets(AssetType.MATERIAL)
+
+    assert len(assets) == 20
+    assert [asset.name for asset in assets["material_0"]] == ["project 0", "core 0"]
+    assert assets["material_0"][0].defined_in == AssetLocation.PROJECT_DIR
+    assert assets["material_0"][0].override
+    assert not assets["material_1"][0].override
+    assert len(errors) == 1 and "broken" in errors[0]
+
+
+@pytest.mark.asyncio
+async def test_reads_core_assets_from_the_snapshot(directories, monkeypatch):
+    project, core, errors = directories
+    (core / "material.toml").write_text(_MATERIAL.format(name="core"))
+
+    first = await module.load_core_assets(AssetType.MATERIAL)
+
+    parsed = []
+    monkeypatch.setattr(module, "parse_asset_file", lambda *args: parsed.append(args))
+    monkeypatch.setattr(module, "_core_assets", {})
+
+    second = await module.load_core_assets(AssetType.MATERIAL)
+
+    assert not parsed
+    assert second == first
+    assert second["material"] is not first["material"]
+
+
+@pytest.mark.asyncio
+async def test_project_open_reads_core_assets_from_the_snapshot(directories, monkeypatch):
+    project, core, errors = directories
+    (core / "material.toml").write_text(_MATERIAL.format(name="core"))
+    await module.load_all_assets(AssetType.MATERIAL)
+
+    parsed = []
+    monkeypatch.setattr(module, "parse_asset_file", lambda *args: parsed.append(args))
+    monkeypatch.setattr(module, "_core_assets", {})
+
+    assets = await module.load_all_assets(AssetType.MATERIAL)
+
+    assert not parsed
+    assert [asset.name for asset in assets["material"]] == ["core"]
+
+
+@pytest.mark.asyncio
+async def test_rebuilds_the_snapshot_when_core_assets_change(directories):
+    project, core, errors = directories
+    (core / "material.toml").write_text(_MATERIAL.format(name="core"))
+    await module.load_core_assets(AssetType.MATERIAL)
+
+    (core / "added.toml").write_text(_MATERIAL.format(name="added"))
+    os.utime(core, ns=(0, core.stat().st_mtime_ns + 1_000_000_000))
+
+    assert set(await module.load_core_assets(AssetType.MATERIAL)) == {"material", "added"}
@@ -0,0 +1,242 @@
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import Callable, Protocol
+
+from aiconsole.core.assets.materials.rendered_material import RenderedMaterial
+from aiconsole.core.gpt.consts import GPTMode
+from aiconsole.core.gpt.create_full_prompt_with_materials import (
+    create_full_prompt_with_materials,
+)
+from aiconsole.core.gpt.request import (
+    EXTRA_BUFFER_FOR_ENCODING_OVERHEAD,
+    get_model_config,
+)
+from aiconsole.core.gpt.token_counter import token_counter
+from aiconsole.core.gpt.tool_definition import ToolDefinition
+from aiconsole.core.gpt.types import (
+    GPTRequestMessage,
+    GPTRequestTextMessage,
+    GPTRequestToolMessage,
+)
+
+_log = logging.getLogger(__name__)
+
+KEEP_RECENT_GROUPS = 2
+TRUNCATED_TOOL_OUTPUT_CHARS = 1000
+SUMMARY_LINE_CHARS = 200
+MAX_CACHED_SUMMARIES = 256
+
+
+@dataclass
+class PromptContext:
+    """
+    Everything that ends up in a prompt, kept apart so the budget stages can trim each part on its own.
+
+    Message groups are the converted message groups of a chat (oldest first), rendered materials are ordered from
+    the most to the least important one, trailing messages (e.g. the last director prompt) are never trimmed.
+    """
+
+    intro: str
+    message_groups: list[list[GPTRequestMessage]]
+    rendered_materials: list[RenderedMaterial] = field(default_factory=list)
+    trailing_messages: list[GPTRequestMessage] = field(default_factory=list)
+    tools: list[ToolDefinition] = field(default_factory=list)
+
+    @property
+    def system_message(self) -> str:
+        return create_full_prompt_with_materials(intro=self.intro, materials=self.rendered_materials)
+
+    @property
+    def messages(self) -> list[GPTRequestMessage]:
+        return [*(message for group in self.message_groups for message in group), *self.trailing_messages]
+
+    def count_tokens(self, model: str) -> int:
+        # Mirrors GPTRequest.all_messages
+        system_message = self.system_message
+        messages = [
+            *([GPTRequestTextMessage(role="system", content=system_message)] if system_message else []),
+            *self.messages,
+        ]
+
+        return token_counter().count_prompt(
+            model, [message.model_dump(exclude_none=True) for message in messages], self.tools
+        )
+
+
+IsOverBudget = Callable[[PromptContext], bool]
+
+
+class ContextBudgetStage(Protocol):
+    def __call__(self, context: PromptContext, is_over_budget: IsOverBudget) -> PromptContext:  # fmt: off
+        ...
+
+
+class Summariser(Protocol):
+    def __call__(self, messages: list[GPTRequestMessage]) -> str:  # fmt: off
+        ...
+
+
+def extractive_summary(messages: list[GPTRequestMessage]) -> str:
+    """
+    Cheap summary that does not need a GPT call, the first line of every message.
+    """
+
+    lines = []
+
+    for message in messages:
+        if isinstance(message, GPTRequestToolMessage) or not message.content:
+            continue
+
+        first_line = message.content.strip().split("\n", 1)[0]
+        if len(first_line) > SUMMARY_LINE_CHARS:
+            first_line = first_line[:SUMMARY_LINE_CHARS] + "..."
+
+        author = message.name or message.role
+        lines.append(f"* {author}: {first_line}")
+
+    return "\n".join(lines)
+
+
+@dataclass
+class TruncateOldToolOutputs:
+    keep_recent_groups: int = KEEP_RECENT_GROUPS
+    max_chars: int = TRUNCATED_TOOL_OUTPUT_CHARS
+
+    def __call__(self, context: PromptContext, is_over_budget: IsOverBudget) -> PromptContext:
+        groups = list(context.message_groups)
+
+        for index in range(max(len(groups) - self.keep_recent_groups, 0)):
+            groups[index] = [self._truncate(message) for message in groups[index]]
+            context = replace(context, message_groups=list(groups))
+
+            if not is_over_budget(context):
+                break
+
+        return context
+
+    def _truncate(self, message: GPTRequestMessage) -> GPTRequestMessage:
+        if not isinstance(message, GPTRequestToolMessage) or not message.content:
+            return message
+
+        if len(message.content) <= self.max_chars:
+            return message
+
+        removed = len(message.content) - self.max_chars
+        return message.model_copy(
+            update={"content": f"{message.content[:self.max_chars]}\n[... {removed} characters of output truncated]"}
+        )
+
+
+@dataclass
+class SummariseOldGroups:
+    keep_recent_groups: int = KEEP_RECENT_GROUPS
+    summariser: Summariser = extractive_summary
+    _summaries: OrderedDict[bytes, str] = field(default_factory=OrderedDict, repr=False)
+
+    def __call__(self, context: PromptContext, is_over_budget: IsOverBudget) -> PromptContext:
+        groups = context.message_groups
+        collapsed = context
+
+        for count in range(1, len(groups) - self.keep_recent_groups + 1):
+            summary = GPTRequestTextMessage(
+                role="system",
+                name="summary",
+                content="Summary of the earlier part of this conversation:\n" + self._summary(groups[:count]),
+            )
+            collapsed = replace(context, message_groups=[[summary], *groups[count:]])
+
+            if not is_over_budget(collapsed):
+                break
+
+        return collapsed
+
+    def _summary(self, groups: list[list[GPTRequestMessage]]) -> str:
+        messages = [message for group in groups for message in group]
+        key = hashlib.blake2b(
+            json.dumps([message.model_dump(exclude_none=True) for message in messages]).encode("utf8"),
+            digest_size=16,
+        ).digest()
+
+        if key in self._summaries:
+            self._summaries.move_to_end(key)
+            return self._summaries[key]
+
+        summary = self.summariser(messages)
+        self._summaries[key] = summary
+
+        if len(self._summaries) > MAX_CACHED_SUMMARIES:
+            self._summaries.popitem(last=False)
+
+        return summary
+
+
+def drop_low_priority_materials(context: PromptContext, is_over_budget: IsOverBudget) -> PromptContext:
+    materials = list(context.rendered_materials)
+
+    while materials and is_over_budget(context):
+        dropped = materials.pop()
+        _log.info(f"Dropping material {dropped.id} from the prompt to fit the context window")
+        context = replace(context, rendered_materials=list(materials))
+
+    return context
+
+
+def drop_oldest_groups(context: PromptContext, is_over_budget: IsOverBudget) -> PromptContext:
+    groups = list(context.message_groups)
+
+    while len(groups) > 1 and is_over_budget(context):
+        groups.pop(0)
+        context = replace(context, message_groups=list(groups))
+
+    return context
+
+
+class ContextBudget:
+    """
+    Fits a prompt into the context window of a gpt mode by running budget stages in order until it fits.
+
+    The default stages first shrink old history (tool outputs, then summaries of old message groups), only then drop
+    the least important materials, and as a last resort the oldest message groups. The last message group and the
+    trailing messages are always kept, so a prompt that still does not fit fails in GPTRequest with a TokenError.
+    """
+
+    def __init__(self, stages: list[ContextBudgetStage] | None = None, max_prompt_tokens: int | None = None):
+        self.stages: list[ContextBudgetStage] = (
+            stages
+            if stages is not None
+            else [
+                TruncateOldToolOutputs(),
+                SummariseOldGroups(),
+                drop_low_priority_materials,
+                drop_oldest_groups,
+            ]
+        )
+        self.max_prompt_tokens = max_prompt_tokens
+
+    def fit(self, context: PromptContext, gpt_mode: GPTMode, min_tokens: int = 0) -> PromptContext:
+        model_config = get_model_config(gpt_mode)
+
+        limit = model_config.max_tokens - EXTRA_BUFFER_FOR_ENCODING_OVERHEAD - min_tokens
+        if self.max_prompt_tokens is not None:
+            limit = min(limit, self.max_prompt_tokens)
+
+        def is_over_budget(context: PromptContext) -> bool:
+            return context.count_tokens(model_config.encoding) > limit
+
+        for stage in self.stages:
+            if not is_over_budget(context):
+                break
+
+            _log.info(f"Prompt exceeds {limit} tokens, applying {getattr(stage, '__name__', type(stage).__name__)}")
+            context = stage(context, is_over_budget)
+
+        return context
+
+
+@lru_cache
+def context_budget() -> ContextBudget:
+    return ContextBudget()
@@ -72,12 +72,13 @@ def convert_message(group: AICMessageGroup, message: AICMessage) -> list[GPTRequ
     return result
 
 
-def convert_messages(chat: Chat) -> list[GPTRequestMessage]:
+def convert_message_groups(chat: Chat) -> list[list[GPTRequestMessage]]:
     last_system_message = None
 
-    messages: list[GPTRequestMessage] = []
+    groups: list[list[GPTRequestMessage]] = []
 
     for message_group in chat.message_groups:
+        messages: list[GPTRequestMessage] = []
         is_last_group = message_group == chat.message_groups[-1]
         if message_group.task:
             # Augment the messages with system messages with meta data about which agent is speaking and what materials were available
@@ -102,7 +103,13 @@ As a director I have assigned you ({message_group.actor_id.id}) and given you ac
         for message in message_group.messages:
             messages.extend(convert_message(message_group, message))
 
+        groups.append(messages)
+
         if is_last_group:
             break
 
-    return messages
+    return groups
+
+
+def convert_messages(chat: Chat) -> list[GPTRequestMessage]:
+    return [message for group in convert_message_groups(chat) for message in group]
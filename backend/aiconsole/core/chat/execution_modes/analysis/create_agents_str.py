@@ -14,16 +14,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import random
-
 from aiconsole.core.chat.execution_modes.analysis.agents_to_choose_from import (
     agents_to_choose_from,
 )
+from aiconsole.core.gpt.prompt_ordering import order_for_prompt
 
 
 def create_agents_str(agent_id) -> str:
     """
-    Randomization of agents is done because LLMs have a tendency to overfit to the first few examples.
+    Agents can be randomized (PROMPT_ORDERING=shuffle) because LLMs have a tendency to overfit to the first few
+    examples, by default they are sorted so the director prompt stays cacheable by the provider.
     """
 
     # Forced agents if available or enabled agents otherwise
@@ -33,8 +33,8 @@ def create_agents_str(agent_id) -> str:
         possible_agent_choices = agents_to_choose_from()
 
     new_line = "\n"
-    random_agents = new_line.join(
-        [f"* {c.id} - {c.usage}" for c in random.sample(possible_agent_choices, len(possible_agent_choices))]
+    agents = new_line.join(
+        [f"* {c.id} - {c.usage}" for c in order_for_prompt(possible_agent_choices, key=lambda c: c.id)]
     )
 
-    return random_agents
+    return agents
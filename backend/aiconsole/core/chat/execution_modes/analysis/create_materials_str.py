@@ -14,13 +14,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import random
-
 from aiconsole.core.assets.types import AssetStatus
+from aiconsole.core.chat.execution_modes.analysis.materials_to_choose_from import (
+    enabled_materials_to_choose_from,
+)
+from aiconsole.core.chat.types import Chat
+from aiconsole.core.gpt.prompt_ordering import order_for_prompt
 from aiconsole.core.project import project
 
 
-def create_materials_str(materials_ids: list | None, let_ai_add_extra_materials: bool) -> str:
+def create_materials_str(chat: Chat) -> str:
+    materials_ids = chat.chat_options.materials_ids
+    let_ai_add_extra_materials = chat.chat_options.let_ai_add_extra_materials
     new_line = "\n"
 
     # We add forced becuase it may influence the choice of enabled materials
@@ -34,13 +39,13 @@ def create_materials_str(materials_ids: list | None, let_ai_add_extra_materials:
         available_materials = [
             *available_materials,
             *project.get_project_materials().assets_with_status(AssetStatus.FORCED),
-            *project.get_project_materials().assets_with_status(AssetStatus.ENABLED),
+            *enabled_materials_to_choose_from(chat),
         ]
 
-    random_materials = (
-        new_line.join([f"* {c.id} - {c.usage}" for c in random.sample(available_materials, len(available_materials))])
+    materials = (
+        new_line.join([f"* {c.id} - {c.usage}" for c in order_for_prompt(available_materials, key=lambda c: c.id)])
         if available_materials
         else ""
     )
 
-    return random_materials
+    return materials
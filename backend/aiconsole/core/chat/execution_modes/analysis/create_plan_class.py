@@ -14,11 +14,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import random
-
 from pydantic import Field
 
 from aiconsole.core.gpt.function_calls import OpenAISchema
+from aiconsole.core.gpt.prompt_ordering import order_for_prompt
 
 
 def create_plan_class(available_agents, available_materials):
@@ -32,27 +31,16 @@ def create_plan_class(available_agents, available_materials):
             json_schema_extra={"type": "string"},
         )
 
-        next_step: str = Field(
-            description="A short actionable description of the next single atomic task to move this conversation "
-            "forward.",
-            json_schema_extra={"type": "string"},
-        )
-
-        is_final_step: bool = Field(
-            ...,
-            description="Whether this is the final step to be done by the agents, and after it, it will be the user's turn.",
-            json_schema_extra={"type": "boolean"},
-        )
-
         is_users_turn: bool = Field(
             ...,
             description="Whether the initiative is on the user side or on assistant side.",
             json_schema_extra={"type": "boolean"},
         )
 
+        # Agent and materials come before the next step, so that materials can be rendered while it streams
         agent_id: str = Field(
             description="Chosen agent to perform the next step.",
-            json_schema_extra={"enum": [s.id for s in random.sample(available_agents, len(available_agents))]},
+            json_schema_extra={"enum": [s.id for s in order_for_prompt(available_agents, key=lambda s: s.id)]},
         )
 
         relevant_material_ids: list[str] = Field(
@@ -60,10 +48,22 @@ def create_plan_class(available_agents, available_materials):
             description="Chosen material ids relevant for the task",
             json_schema_extra={
                 "items": {
-                    "enum": [k.id for k in random.sample(available_materials, len(available_materials))],
+                    "enum": [k.id for k in order_for_prompt(available_materials, key=lambda k: k.id)],
                     "type": "string",
                 }
             },
         )
 
+        next_step: str = Field(
+            description="A short actionable description of the next single atomic task to move this conversation "
+            "forward.",
+            json_schema_extra={"type": "string"},
+        )
+
+        is_final_step: bool = Field(
+            ...,
+            description="Whether this is the final step to be done by the agents, and after it, it will be the user's turn.",
+            json_schema_extra={"type": "boolean"},
+        )
+
     return Plan
@@ -103,18 +103,12 @@ Now analyse the chat.
 async def director_analyse(chat_mutator: ChatMutator, message_group_id: str):
     initial_system_prompt = INITIAL_SYSTEM_PROMPT.format(
         agents=create_agents_str(agent_id=chat_mutator.chat.chat_options.agent_id),
-        materials=create_materials_str(
-            materials_ids=chat_mutator.chat.chat_options.materials_ids,
-            let_ai_add_extra_materials=chat_mutator.chat.chat_options.let_ai_add_extra_materials,
-        ),
+        materials=create_materials_str(chat_mutator.chat),
     )
 
     last_system_prompt = LAST_SYSTEM_PROMPT.format(
         agents=create_agents_str(agent_id=chat_mutator.chat.chat_options.agent_id),
-        materials=create_materials_str(
-            materials_ids=chat_mutator.chat.chat_options.materials_ids,
-            let_ai_add_extra_materials=chat_mutator.chat.chat_options.let_ai_add_extra_materials,
-        ),
+        materials=create_materials_str(chat_mutator.chat),
     )
 
     return await gpt_analysis_function_step(
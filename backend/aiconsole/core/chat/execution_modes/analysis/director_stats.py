@@ -0,0 +1,31 @@
+import logging
+from functools import lru_cache
+
+_log = logging.getLogger(__name__)
+
+
+class DirectorStats:
+    """
+    Counts director analyses that went to the model and those that were decided locally because the chat options left
+    no choice to make.
+    """
+
+    def __init__(self):
+        self.gpt_calls = 0
+        self.skipped_calls = 0
+
+    def record_gpt_call(self):
+        self.gpt_calls += 1
+
+    def record_skipped_call(self, reason: str):
+        self.skipped_calls += 1
+        _log.info(f"Skipped director call ({reason}), {self.skipped_calls} of {self.total} calls saved so far")
+
+    @property
+    def total(self) -> int:
+        return self.gpt_calls + self.skipped_calls
+
+
+@lru_cache
+def director_stats() -> DirectorStats:
+    return DirectorStats()
@@ -30,13 +30,21 @@ from aiconsole.core.chat.chat_mutations import (
     SetTaskMessageGroupMutation,
 )
 from aiconsole.core.chat.chat_mutator import ChatMutator
-from aiconsole.core.chat.convert_messages import convert_messages
+from aiconsole.core.chat.context_budget import PromptContext, context_budget
+from aiconsole.core.chat.convert_messages import convert_message_groups
 from aiconsole.core.chat.execution_modes.analysis.agents_to_choose_from import (
     agents_to_choose_from,
 )
 from aiconsole.core.chat.execution_modes.analysis.create_plan_class import (
     create_plan_class,
 )
+from aiconsole.core.chat.execution_modes.analysis.director_stats import director_stats
+from aiconsole.core.chat.execution_modes.analysis.materials_to_choose_from import (
+    enabled_materials_to_choose_from,
+)
+from aiconsole.core.chat.execution_modes.analysis.speculative_material_rendering import (
+    SpeculativeMaterialRenderer,
+)
 from aiconsole.core.chat.types import Chat
 from aiconsole.core.gpt.consts import GPTMode
 from aiconsole.core.gpt.gpt_executor import GPTExecutor
@@ -51,6 +59,44 @@ from aiconsole.core.project import project
 
 _log = logging.getLogger(__name__)
 
+PINNED_NEXT_STEP = "Respond to the latest messages of the conversation."
+
+
+def _user_agent() -> AICAgent:
+    return AICAgent(
+        id="user",
+        name="User",
+        usage="When a human user needs to respond",
+        usage_examples=[],
+        system="",
+        defined_in=AssetLocation.AICONSOLE_CORE,
+        override=False,
+    )
+
+
+def create_director_request(
+    context: PromptContext, gpt_mode: GPTMode, forced_function: str | None = None
+) -> GPTRequest:
+    request = GPTRequest(
+        system_message=context.system_message,
+        gpt_mode=gpt_mode,
+        messages=context.messages,
+        tools=context.tools,
+        # The plan is a classification, sampled at 0 the same conversation gets the same (cacheable) answer
+        temperature=0,
+        presence_penalty=2,
+        min_tokens=DIRECTOR_MIN_TOKENS,
+        preferred_tokens=DIRECTOR_PREFERRED_TOKENS,
+    )
+
+    if forced_function:
+        request.tool_choice = EnforcedFunctionCall(
+            type="function",
+            function=EnforcedFunctionCallFuncSpec(name=forced_function),
+        )
+
+    return request
+
 
 def pick_agent(arguments, chat: Chat, available_agents: list[AICAgent]) -> AICAgent:
     # Try support first
@@ -63,15 +109,7 @@ def pick_agent(arguments, chat: Chat, available_agents: list[AICAgent]) -> AICAg
     is_users_turn = arguments.is_users_turn
 
     if is_users_turn:
-        picked_agent = AICAgent(
-            id="user",
-            name="User",
-            usage="When a human user needs to respond",
-            usage_examples=[],
-            system="",
-            defined_in=AssetLocation.AICONSOLE_CORE,
-            override=False,
-        )
+        picked_agent = _user_agent()
     else:
         try:
             picked_agent = next((agent for agent in available_agents if agent.id == arguments.agent_id))
@@ -106,12 +144,104 @@ def _get_relevant_materials(relevant_material_ids: list[str]) -> list[Material]:
     return relevant_materials
 
 
+def _speculated_plan(arguments_dict: dict, available_agents: list[AICAgent]) -> tuple[AICAgent, list[str]] | None:
+    """
+    Agent and material ids of a plan that is still streaming, only the values that are already complete.
+    """
+
+    keys = list(arguments_dict)
+
+    if "agent_id" not in keys or "relevant_material_ids" not in keys or arguments_dict.get("is_users_turn"):
+        return None
+
+    # The last value of a partial plan may still be growing
+    if keys[-1] == "agent_id":
+        return None
+
+    agent = next((agent for agent in available_agents if agent.id == arguments_dict["agent_id"]), None)
+    material_ids = arguments_dict["relevant_material_ids"]
+
+    if agent is None or not isinstance(material_ids, list):
+        return None
+
+    if keys[-1] == "relevant_material_ids":
+        material_ids = material_ids[:-1]
+
+    return agent, [material_id for material_id in material_ids if isinstance(material_id, str)]
+
+
+def _is_users_turn(chat: Chat) -> bool:
+    """
+    Local guess of whose turn it is, used when there is no agent or material to choose (the last message group is
+    the one being analysed).
+    """
+
+    previous_groups = chat.message_groups[:-1]
+
+    if not previous_groups or previous_groups[-1].role == "user":
+        return False
+
+    # An agent that ran code should comment on its output
+    return not any(
+        tool_call.output is not None for message in previous_groups[-1].messages for tool_call in message.tool_calls
+    )
+
+
 @dataclass
 class AnalysisResult:
     agent: AICAgent
     relevant_materials: list[Material]
     next_step: str
     is_final_step: bool
+    material_renderer: SpeculativeMaterialRenderer
+
+
+async def _pinned_analysis(
+    message_group_id: str,
+    chat_mutator: ChatMutator,
+    agent: AICAgent,
+    forced_materials: list[Material],
+) -> AnalysisResult:
+    """
+    Analysis without a GPT call for chats where the agent and the materials are fixed, it's the agent's turn unless
+    it just answered, and the agent performs a single step.
+    """
+
+    director_stats().record_skipped_call("agent and materials are pinned")
+
+    picked_agent = _user_agent() if _is_users_turn(chat_mutator.chat) else agent
+    relevant_materials = _get_relevant_materials([])
+    # Assets are not hashable, deduplicated by id
+    materials_ids = list(dict.fromkeys(material.id for material in [*forced_materials, *relevant_materials]))
+
+    await chat_mutator.mutate(
+        SetActorIdMessageGroupMutation(
+            message_group_id=message_group_id,
+            actor_id=ActorId(type="agent", id=picked_agent.id),
+        )
+    )
+
+    await chat_mutator.mutate(
+        SetMaterialsIdsMessageGroupMutation(
+            message_group_id=message_group_id,
+            materials_ids=materials_ids,
+        )
+    )
+
+    await chat_mutator.mutate(
+        SetTaskMessageGroupMutation(
+            message_group_id=message_group_id,
+            task=PINNED_NEXT_STEP,
+        )
+    )
+
+    return AnalysisResult(
+        agent=picked_agent,
+        relevant_materials=relevant_materials,
+        next_step=PINNED_NEXT_STEP,
+        is_final_step=True,
+        material_renderer=SpeculativeMaterialRenderer(chat_mutator.chat),
+    )
 
 
 async def gpt_analysis_function_step(
@@ -145,48 +275,39 @@ async def gpt_analysis_function_step(
         available_materials = [
             *forced_materials,
             *project.get_project_materials().assets_with_status(AssetStatus.FORCED),
-            *project.get_project_materials().assets_with_status(AssetStatus.ENABLED),
+            *enabled_materials_to_choose_from(chat_mutator.chat),
         ]
 
+    if len(possible_agent_choices) == 1 and not chat_mutator.chat.chat_options.let_ai_add_extra_materials:
+        return await _pinned_analysis(message_group_id, chat_mutator, possible_agent_choices[0], forced_materials)
+
+    director_stats().record_gpt_call()
+
     plan_class = create_plan_class(
         [
-            AICAgent(
-                id="user",
-                name="User",
-                usage="When a human user needs to respond",
-                usage_examples=[],
-                system="",
-                defined_in=AssetLocation.AICONSOLE_CORE,
-                override=False,
-            ),
+            _user_agent(),
             *possible_agent_choices,
         ],
         available_materials,
     )
 
-    request = GPTRequest(
-        system_message=initial_system_prompt,
+    context = context_budget().fit(
+        PromptContext(
+            intro=initial_system_prompt,
+            message_groups=convert_message_groups(chat_mutator.chat),
+            trailing_messages=[GPTRequestTextMessage(role="system", content=last_system_prompt)],
+            tools=[
+                ToolDefinition(
+                    type="function",
+                    function=ToolFunctionDefinition(**plan_class.openai_schema()),
+                )
+            ],
+        ),
         gpt_mode=gpt_mode,
-        messages=[
-            *convert_messages(chat_mutator.chat),
-            GPTRequestTextMessage(role="system", content=last_system_prompt),
-        ],
-        tools=[
-            ToolDefinition(
-                type="function",
-                function=ToolFunctionDefinition(**plan_class.openai_schema()),
-            )
-        ],
-        presence_penalty=2,
         min_tokens=DIRECTOR_MIN_TOKENS,
-        preferred_tokens=DIRECTOR_PREFERRED_TOKENS,
     )
 
-    if force_call:
-        request.tool_choice = EnforcedFunctionCall(
-            type="function",
-            function=EnforcedFunctionCallFuncSpec(name=plan_class.__name__),
-        )
+    request = create_director_request(context, gpt_mode, plan_class.__name__ if force_call else None)
 
     await chat_mutator.mutate(
         SetIsAnalysisInProgressMutation(
@@ -201,8 +322,11 @@ async def gpt_analysis_function_step(
         )
     )
 
+    material_renderer = SpeculativeMaterialRenderer(chat_mutator.chat)
+    speculated_plan = None
+
     try:
-        async for chunk in gpt_executor.execute(request):
+        async for chunk in gpt_executor.execute(request, queue_id=chat_mutator.chat.id, agent_id="director"):
             if len(gpt_executor.partial_response.choices) > 0:
                 tool_calls = gpt_executor.partial_response.choices[0].message.tool_calls
                 for tool_call in tool_calls:
@@ -210,6 +334,13 @@ async def gpt_analysis_function_step(
                     arguments_dict = function_call.arguments_dict
 
                     if arguments_dict:
+                        plan_so_far = _speculated_plan(arguments_dict, possible_agent_choices)
+
+                        if plan_so_far is not None and plan_so_far != speculated_plan:
+                            speculated_plan = plan_so_far
+                            agent, material_ids = plan_so_far
+                            material_renderer.speculate(agent, _get_relevant_materials(material_ids))
+
                         # Current fix for https://github.com/10clouds/aiconsole/issues/785
                         if "agent_id" in arguments_dict and "relevant_material_ids" in arguments_dict:
                             await chat_mutator.mutate(
@@ -310,7 +441,11 @@ async def gpt_analysis_function_step(
             relevant_materials=relevant_materials,
             next_step=plan.next_step,
             is_final_step=plan.is_final_step,
+            material_renderer=material_renderer,
         )
+    except BaseException:
+        material_renderer.cancel()
+        raise
     finally:
         await chat_mutator.mutate(
             SetIsAnalysisInProgressMutation(
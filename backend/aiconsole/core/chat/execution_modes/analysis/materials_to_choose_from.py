@@ -0,0 +1,32 @@
+from aiconsole.consts import DIRECTOR_MAX_MATERIALS
+from aiconsole.core.assets.materials.material import Material
+from aiconsole.core.assets.materials.material_index import material_index
+from aiconsole.core.assets.types import AssetStatus
+from aiconsole.core.chat.types import Chat
+from aiconsole.core.project import project
+
+QUERY_MESSAGE_GROUPS = 4
+
+
+def _conversation_query(chat: Chat) -> str:
+    return "\n".join(
+        text
+        for message_group in chat.message_groups[-QUERY_MESSAGE_GROUPS:]
+        for text in [message_group.task, *(message.content for message in message_group.messages)]
+        if text
+    )
+
+
+def enabled_materials_to_choose_from(chat: Chat, k: int = DIRECTOR_MAX_MATERIALS) -> list[Material]:
+    """
+    Enabled materials offered to the director, with more than k of them only the k most relevant to the recent
+    messages of the chat (local BM25 ranking), so the director prompt does not grow with the number of materials.
+    """
+
+    materials = project.get_project_materials().assets_with_status(AssetStatus.ENABLED)
+
+    if len(materials) <= k:
+        return materials
+
+    top_ids = set(material_index().top(_conversation_query(chat), [material.id for material in materials], k))
+    return [material for material in materials if material.id in top_ids]
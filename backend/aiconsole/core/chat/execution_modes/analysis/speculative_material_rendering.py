@@ -0,0 +1,84 @@
+import asyncio
+import logging
+
+from aiconsole.core.assets.agents.agent import AICAgent
+from aiconsole.core.assets.materials.content_evaluation_context import (
+    ContentEvaluationContext,
+)
+from aiconsole.core.assets.materials.material import Material
+from aiconsole.core.assets.materials.render_concurrently import render_concurrently
+from aiconsole.core.assets.materials.rendered_material import RenderedMaterial
+from aiconsole.core.chat.types import Chat
+
+_log = logging.getLogger(__name__)
+
+
+def _retrieve_exception(task: asyncio.Task):
+    if not task.cancelled():
+        task.exception()
+
+
+class SpeculativeMaterialRenderer:
+    """
+    Renders materials while the director is still streaming its plan, as soon as the agent and the material ids appear,
+    so that the agent can start right after the plan is done.
+
+    Renders are keyed by agent and material (content included), renders that the final plan does not use are cancelled.
+    Speculative renders see the materials known at the time they started as relevant_materials.
+    """
+
+    def __init__(self, chat: Chat):
+        self._chat = chat
+        self._materials: list[Material] = []
+        self._tasks: dict[tuple[str, str, int], asyncio.Task[RenderedMaterial]] = {}
+
+    def _context(self, agent: AICAgent, materials: list[Material]) -> ContentEvaluationContext:
+        return ContentEvaluationContext(
+            chat=self._chat,
+            agent=agent,
+            gpt_mode=agent.gpt_mode,
+            relevant_materials=materials,
+        )
+
+    def speculate(self, agent: AICAgent, materials: list[Material]):
+        for material in materials:
+            if material not in self._materials:
+                self._materials.append(material)
+
+        for material in materials:
+            key = (agent.id, material.id, hash(material))
+
+            if key not in self._tasks:
+                _log.debug(f"Speculatively rendering {material.id} for {agent.id}")
+                self._tasks[key] = asyncio.create_task(material.render(self._context(agent, list(self._materials))))
+
+    async def render(self, agent: AICAgent, materials: list[Material]) -> list[RenderedMaterial]:
+        context = self._context(agent, materials)
+        speculated = 0
+
+        async def _render(material: Material) -> RenderedMaterial:
+            nonlocal speculated
+            task = self._tasks.pop((agent.id, material.id, hash(material)), None)
+
+            if task is not None and not task.cancelled():
+                speculated += 1
+                return await task
+
+            return await material.render(context)
+
+        try:
+            rendered_materials = await render_concurrently(materials, _render)
+        finally:
+            self.cancel()
+
+        if materials:
+            _log.info(f"Rendered {speculated}/{len(materials)} materials speculatively")
+
+        return rendered_materials
+
+    def cancel(self):
+        for task in self._tasks.values():
+            task.cancel()
+            task.add_done_callback(_retrieve_exception)
+
+        self._tasks.clear()
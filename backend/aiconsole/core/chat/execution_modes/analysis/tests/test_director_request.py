@@ -0,0 +1,27 @@
+from types import SimpleNamespace
+
+from aiconsole.core.chat.context_budget import PromptContext
+from aiconsole.core.chat.execution_modes.analysis.gpt_analysis_function_step import (
+    create_director_request,
+)
+from aiconsole.core.gpt import request as request_module
+from aiconsole.core.gpt.consts import SPEED_GPT_MODE
+from aiconsole.core.gpt.llm_cache import LLMCache
+from aiconsole.core.gpt.router import build_request_dict
+from aiconsole.core.gpt.types import GPTModeConfig, GPTRequestTextMessage
+
+
+def test_director_requests_are_cacheable(monkeypatch):
+    unified_settings = SimpleNamespace(
+        gpt_modes={SPEED_GPT_MODE: GPTModeConfig(model="gpt-4o")}, extra={}, openai_api_key="sk-test"
+    )
+    monkeypatch.setattr(request_module, "settings", lambda: SimpleNamespace(unified_settings=unified_settings))
+
+    context = PromptContext(
+        intro="You are a director",
+        message_groups=[[GPTRequestTextMessage(role="user", content="Hi")]],
+        trailing_messages=[GPTRequestTextMessage(role="system", content="Pick the next agent")],
+    )
+    request = create_director_request(context, SPEED_GPT_MODE, forced_function="Plan")
+
+    assert LLMCache.is_cacheable(build_request_dict(request))
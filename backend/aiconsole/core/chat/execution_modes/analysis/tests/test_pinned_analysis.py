@@ -0,0 +1,116 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from aiconsole.core.assets.agents.agent import AICAgent
+from aiconsole.core.assets.materials.material import Material, MaterialContentType
+from aiconsole.core.assets.types import AssetLocation
+from aiconsole.core.chat.actor_id import ActorId
+from aiconsole.core.chat.chat_mutations import (
+    SetActorIdMessageGroupMutation,
+    SetMaterialsIdsMessageGroupMutation,
+    SetTaskMessageGroupMutation,
+)
+from aiconsole.core.chat.execution_modes.analysis import (
+    gpt_analysis_function_step as module,
+)
+from aiconsole.core.chat.execution_modes.analysis.gpt_analysis_function_step import (
+    PINNED_NEXT_STEP,
+    _is_users_turn,
+    gpt_analysis_function_step,
+)
+from aiconsole.core.chat.types import (
+    AICMessage,
+    AICMessageGroup,
+    AICToolCall,
+    Chat,
+    ChatOptions,
+)
+from aiconsole.core.gpt.consts import QUALITY_GPT_MODE
+
+
+def _group(role, tool_output: str | None = None) -> AICMessageGroup:
+    tool_calls = [AICToolCall(id="call", code="print(1)", headline="", output=tool_output)] if tool_output else []
+
+    return AICMessageGroup(
+        id=f"group_{role}",
+        actor_id=ActorId(type="user" if role == "user" else "agent", id="user" if role == "user" else "assistant"),
+        role=role,
+        analysis="",
+        task="",
+        materials_ids=[],
+        messages=[AICMessage(id="message", timestamp="", content="Hi", tool_calls=tool_calls)],
+    )
+
+
+def _chat(*groups: AICMessageGroup) -> Chat:
+    # The last group is the one created for the analysed step
+    return Chat(id="chat", name="Chat", last_modified=datetime.now(), message_groups=[*groups, _group("assistant")])
+
+
+def test_agent_answers_the_user():
+    assert not _is_users_turn(_chat(_group("user")))
+
+
+def test_agent_comments_on_code_output():
+    assert not _is_users_turn(_chat(_group("user"), _group("assistant", tool_output="1")))
+
+
+def test_user_answers_the_agent():
+    assert _is_users_turn(_chat(_group("user"), _group("assistant")))
+
+
+class _FailingExecutor:
+    async def execute(self, *args, **kwargs):
+        raise AssertionError("The director must not call GPT for a pinned chat")
+        yield
+
+
+class _RecordingMutator:
+    def __init__(self, chat: Chat):
+        self.chat = chat
+        self.mutations: list = []
+
+    async def mutate(self, mutation):
+        self.mutations.append(mutation)
+
+
+@pytest.mark.asyncio
+async def test_pinned_agent_and_materials_skip_the_gpt_call(monkeypatch):
+    agent = AICAgent(
+        id="assistant", name="Assistant", usage="", usage_examples=[], system="", defined_in=AssetLocation.PROJECT_DIR
+    )
+    material = Material(
+        id="notes",
+        name="Notes",
+        usage="",
+        usage_examples=[],
+        defined_in=AssetLocation.PROJECT_DIR,
+        content_type=MaterialContentType.STATIC_TEXT,
+        content="Notes",
+    )
+    materials = SimpleNamespace(_assets={"notes": [material]}, assets_with_status=lambda status: [])
+
+    monkeypatch.setattr(module, "GPTExecutor", _FailingExecutor)
+    monkeypatch.setattr(module, "agents_to_choose_from", lambda all=False: [agent])
+    monkeypatch.setattr(module, "project", SimpleNamespace(get_project_materials=lambda: materials))
+
+    chat = _chat(_group("user"))
+    chat.chat_options = ChatOptions(agent_id="assistant", materials_ids=["notes"])
+    chat_mutator = _RecordingMutator(chat)
+
+    result = await gpt_analysis_function_step(
+        "group_assistant", chat_mutator, QUALITY_GPT_MODE, "", "", force_call=False  # type: ignore
+    )
+
+    assert result.agent is agent
+    assert result.is_final_step
+    assert [type(mutation) for mutation in chat_mutator.mutations] == [
+        SetActorIdMessageGroupMutation,
+        SetMaterialsIdsMessageGroupMutation,
+        SetTaskMessageGroupMutation,
+    ]
+    assert chat_mutator.mutations[0].actor_id == ActorId(type="agent", id="assistant")
+    assert chat_mutator.mutations[1].materials_ids == ["notes"]
+    assert chat_mutator.mutations[2].task == PINNED_NEXT_STEP
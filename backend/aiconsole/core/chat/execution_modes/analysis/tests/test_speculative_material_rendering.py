@@ -0,0 +1,90 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from aiconsole.core.assets.agents.agent import AICAgent
+from aiconsole.core.assets.materials.material import Material
+from aiconsole.core.assets.types import AssetLocation
+from aiconsole.core.chat.execution_modes.analysis.gpt_analysis_function_step import (
+    _speculated_plan,
+)
+from aiconsole.core.chat.execution_modes.analysis.speculative_material_rendering import (
+    SpeculativeMaterialRenderer,
+)
+from aiconsole.core.chat.types import Chat
+
+AGENT = AICAgent(
+    id="assistant",
+    name="Assistant",
+    usage="",
+    usage_examples=[],
+    system="",
+    defined_in=AssetLocation.AICONSOLE_CORE,
+    override=False,
+)
+
+
+class CountingMaterial(Material):
+    async def render(self, context):
+        self.__class__.renders += 1
+        await asyncio.sleep(0)
+        return await super().render(context)
+
+
+def _material(material_id: str) -> CountingMaterial:
+    return CountingMaterial(
+        id=material_id,
+        name=material_id,
+        usage="",
+        usage_examples=[],
+        defined_in=AssetLocation.AICONSOLE_CORE,
+        override=False,
+        content=f"Content of {material_id}",
+    )
+
+
+def _chat() -> Chat:
+    return Chat(id="chat", name="Chat", last_modified=datetime.now(), message_groups=[])
+
+
+@pytest.mark.asyncio
+async def test_reuses_speculative_renders():
+    CountingMaterial.renders = 0
+    python, shell = _material("python"), _material("shell")
+    renderer = SpeculativeMaterialRenderer(_chat())
+
+    renderer.speculate(AGENT, [python])
+    renderer.speculate(AGENT, [python, shell])
+    rendered = await renderer.render(AGENT, [python, shell])
+
+    assert [material.content for material in rendered] == [
+        "# python\n\nContent of python",
+        "# shell\n\nContent of shell",
+    ]
+    assert CountingMaterial.renders == 2
+
+
+@pytest.mark.asyncio
+async def test_cancels_renders_the_plan_did_not_pick():
+    CountingMaterial.renders = 0
+    python, shell = _material("python"), _material("shell")
+    renderer = SpeculativeMaterialRenderer(_chat())
+
+    renderer.speculate(AGENT, [python, shell])
+    rendered = await renderer.render(AGENT, [shell])
+
+    assert [material.id for material in rendered] == ["shell"]
+    assert renderer._tasks == {}
+
+
+def test_speculates_only_on_complete_values():
+    partial = {"thinking_process": "Plan", "is_users_turn": False, "agent_id": "assistant"}
+
+    assert _speculated_plan(partial, [AGENT]) is None
+    assert _speculated_plan({**partial, "relevant_material_ids": ["python", "sh"]}, [AGENT]) == (AGENT, ["python"])
+    assert _speculated_plan({**partial, "relevant_material_ids": ["python", "shell"], "next_step": ""}, [AGENT]) == (
+        AGENT,
+        ["python", "shell"],
+    )
+    assert _speculated_plan({**partial, "is_users_turn": True, "relevant_material_ids": []}, [AGENT]) is None
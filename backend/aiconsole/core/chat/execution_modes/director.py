@@ -14,15 +14,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import logging
+import time
 from uuid import uuid4
 
 from aiconsole.api.websockets.connection_manager import connection_manager
 from aiconsole.api.websockets.server_messages import NotificationServerMessage
 from aiconsole.core.assets.agents.agent import AICAgent
-from aiconsole.core.assets.materials.content_evaluation_context import (
-    ContentEvaluationContext,
-)
 from aiconsole.core.assets.materials.material import Material
 from aiconsole.core.assets.materials.rendered_material import RenderedMaterial
 from aiconsole.core.chat.actor_id import ActorId
@@ -36,17 +35,20 @@ from aiconsole.core.chat.execution_modes.execution_mode import ExecutionMode
 from aiconsole.core.chat.execution_modes.utils.import_and_validate_execution_mode import (
     import_and_validate_execution_mode,
 )
+from aiconsole.core.chat.execution_modes.utils.step_budget import (
+    BudgetExceeded,
+    StepBudget,
+    StepTiming,
+)
+from aiconsole.core.gpt.usage_meter import metered
 
 _log = logging.getLogger(__name__)
 
 
-async def _execution_mode_process(
-    chat_mutator: ChatMutator,
-    agent: AICAgent,
-    materials: list[Material],
-    rendered_materials: list[RenderedMaterial],
-):
-    _log.debug("execution_mode_director")
+async def _director_step(chat_mutator: ChatMutator, step: StepTiming) -> bool:
+    """
+    Analyses the chat and lets the chosen agent perform the step, returns whether another step should follow.
+    """
 
     # Assumes an existing message group that was created for us
     last_message_group = chat_mutator.chat.message_groups[-1]
@@ -63,67 +65,129 @@ async def _execution_mode_process(
 
         await chat_mutator.mutate(DeleteMessageGroupMutation(message_group_id=last_message_group.id))
 
-        return
+        return False
 
     last_messages = chat_mutator.chat.message_groups[-2].messages
     for message in last_messages:
         if message.tool_calls and not all(call.output for call in message.tool_calls):
             await chat_mutator.mutate(DeleteMessageGroupMutation(message_group_id=last_message_group.id))
-            return
+            return False
 
+    started_at = time.monotonic()
     analysis = await director_analyse(chat_mutator, last_message_group.id)
+    step.analysis_seconds = time.monotonic() - started_at
+    step.agent_id = analysis.agent.id
 
-    if analysis.agent.id != "user" and analysis.next_step:
-        content_context = ContentEvaluationContext(
-            chat=chat_mutator.chat,
-            agent=analysis.agent,
-            gpt_mode=analysis.agent.gpt_mode,
-            relevant_materials=analysis.relevant_materials,
-        )
+    if analysis.agent.id == "user" or not analysis.next_step:
+        analysis.material_renderer.cancel()
 
-        rendered_materials = [
-            await material.render(content_context) for material in content_context.relevant_materials
-        ]
+        # Delete the current message group
+        await chat_mutator.mutate(DeleteMessageGroupMutation(message_group_id=last_message_group.id))
 
-        execution_mode = await import_and_validate_execution_mode(analysis.agent, chat_mutator.chat.id)
+        return False
 
-        await execution_mode.process_chat(
-            chat_mutator=chat_mutator,
-            agent=analysis.agent,
-            materials=analysis.relevant_materials,
-            rendered_materials=rendered_materials,
+    started_at = time.monotonic()
+    # Most of the materials were already rendered while the plan was streaming
+    rendered_materials = await analysis.material_renderer.render(analysis.agent, analysis.relevant_materials)
+    step.rendering_seconds = time.monotonic() - started_at
+
+    execution_mode = await import_and_validate_execution_mode(analysis.agent, chat_mutator.chat.id)
+
+    started_at = time.monotonic()
+    await execution_mode.process_chat(
+        chat_mutator=chat_mutator,
+        agent=analysis.agent,
+        materials=analysis.relevant_materials,
+        rendered_materials=rendered_materials,
+    )
+    step.execution_seconds = time.monotonic() - started_at
+
+    return not analysis.is_final_step
+
+
+async def _create_next_message_group(chat_mutator: ChatMutator, agent: AICAgent) -> str:
+    message_group_id = str(uuid4())
+
+    if chat_mutator.chat.chat_options.materials_ids:
+        materials_ids = chat_mutator.chat.chat_options.materials_ids
+    else:
+        materials_ids = []
+
+    await chat_mutator.mutate(
+        CreateMessageGroupMutation(
+            message_group_id=message_group_id,
+            actor_id=ActorId(type="agent", id=agent.id),
+            role="assistant",
+            materials_ids=materials_ids,
+            analysis="",
+            task="",
         )
+    )
+
+    return message_group_id
 
-        if not analysis.is_final_step:
-            # Repeat the process for the next step
 
-            message_group_id = str(uuid4())
-
-            if chat_mutator.chat.chat_options.materials_ids:
-                materials_ids = chat_mutator.chat.chat_options.materials_ids
-            else:
-                materials_ids = []
-
-            await chat_mutator.mutate(
-                CreateMessageGroupMutation(
-                    message_group_id=message_group_id,
-                    actor_id=ActorId(type="agent", id=agent.id),
-                    role="assistant",
-                    materials_ids=materials_ids,
-                    analysis="",
-                    task="",
+async def _execution_mode_process(
+    chat_mutator: ChatMutator,
+    agent: AICAgent,
+    materials: list[Material],
+    rendered_materials: list[RenderedMaterial],
+):
+    _log.debug("execution_mode_director")
+
+    budget = StepBudget()
+    next_message_group_id = None
+
+    with metered(budget.usage):
+        while True:
+            try:
+                await budget.checkpoint()
+            except BudgetExceeded as error:
+                _log.warning(f"Director stopped: {error}")
+
+                await connection_manager().send_to_chat(
+                    message=NotificationServerMessage(title="Stopped", message=f"The agents stopped, they {error}."),
+                    chat_id=chat_mutator.chat.id,
                 )
-            )
-
-            await _execution_mode_process(
-                chat_mutator=chat_mutator,
-                agent=agent,
-                materials=[],
-                rendered_materials=[],
-            )
-    else:
-        # Delete the current message group
-        await chat_mutator.mutate(DeleteMessageGroupMutation(message_group_id=last_message_group.id))
+
+                # The group prepared for the next step will not be used
+                if next_message_group_id:
+                    await chat_mutator.mutate(DeleteMessageGroupMutation(message_group_id=next_message_group_id))
+
+                break
+
+            step = budget.start_step()
+
+            try:
+                should_continue = await asyncio.wait_for(
+                    _director_step(chat_mutator, step), timeout=budget.remaining_seconds
+                )
+            except asyncio.TimeoutError:
+                # A TimeoutError from inside the step (e.g. no first token from the model) is not the wall-time limit
+                if budget.remaining_seconds > 0:
+                    raise
+
+                _log.warning(f"Director step {step.step} cancelled, the run exceeded {budget.max_seconds:.0f}s")
+
+                await connection_manager().send_to_chat(
+                    message=NotificationServerMessage(
+                        title="Stopped",
+                        message=f"The agents stopped, they ran for more than {budget.max_seconds:.0f}s.",
+                    ),
+                    chat_id=chat_mutator.chat.id,
+                )
+
+                break
+            finally:
+                budget.finish_step(step)
+
+            if not should_continue:
+                break
+
+            # Repeat the process for the next step
+            next_message_group_id = await _create_next_message_group(chat_mutator, agent)
+
+    _log.info(f"Director run finished: {budget.summary()}")
 
 
 execution_mode = ExecutionMode(
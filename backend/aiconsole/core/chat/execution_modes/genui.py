@@ -26,9 +26,6 @@ from aiconsole.core.chat.execution_modes.utils.generate_response_message_with_co
 from aiconsole.core.chat.execution_modes.utils.get_agent_system_message import (
     get_agent_system_message,
 )
-from aiconsole.core.gpt.create_full_prompt_with_materials import (
-    create_full_prompt_with_materials,
-)
 from aiconsole.core.gpt.function_calls import OpenAISchema
 
 
@@ -56,13 +53,15 @@ async def _execution_mode_process(
     materials: list[Material],
     rendered_materials: list[RenderedMaterial],
 ):
-    system_message = create_full_prompt_with_materials(
-        intro=get_agent_system_message(agent),
-        materials=rendered_materials,
-    )
+    system_message = get_agent_system_message(agent)
 
     await generate_response_message_with_code(
-        chat_mutator, agent, system_message, language_classes=[react_ui], enforced_language=react_ui
+        chat_mutator,
+        agent,
+        system_message,
+        language_classes=[react_ui],
+        enforced_language=react_ui,
+        rendered_materials=rendered_materials,
     )
 
 
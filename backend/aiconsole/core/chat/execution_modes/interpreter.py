@@ -30,9 +30,6 @@ from aiconsole.core.chat.execution_modes.utils.get_agent_system_message import (
 )
 from aiconsole.core.chat.execution_modes.utils.run_code import run_code
 from aiconsole.core.chat.types import AICToolCallLocation
-from aiconsole.core.gpt.create_full_prompt_with_materials import (
-    create_full_prompt_with_materials,
-)
 from aiconsole.core.gpt.function_calls import OpenAISchema
 from aiconsole.core.settings.settings import settings
 
@@ -78,12 +75,15 @@ async def _execution_mode_process(
     # Assumes an existing message group that was created for us
     last_message_group = chat_mutator.chat.message_groups[-1]
 
-    system_message = create_full_prompt_with_materials(
-        intro=get_agent_system_message(agent),
-        materials=rendered_materials,
-    )
+    system_message = get_agent_system_message(agent)
 
-    await generate_response_message_with_code(chat_mutator, agent, system_message, [python_tool, applescript_tool])
+    await generate_response_message_with_code(
+        chat_mutator,
+        agent,
+        system_message,
+        [python_tool, applescript_tool],
+        rendered_materials=rendered_materials,
+    )
 
     last_message = last_message_group.messages[-1]
 
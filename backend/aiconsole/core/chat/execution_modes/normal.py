@@ -26,9 +26,6 @@ from aiconsole.core.chat.execution_modes.utils.generate_response_message_with_co
 from aiconsole.core.chat.execution_modes.utils.get_agent_system_message import (
     get_agent_system_message,
 )
-from aiconsole.core.gpt.create_full_prompt_with_materials import (
-    create_full_prompt_with_materials,
-)
 
 _log = logging.getLogger(__name__)
 
@@ -44,11 +41,9 @@ async def _execution_mode_process(
     await generate_response_message_with_code(
         chat_mutator,
         agent,
-        system_message=create_full_prompt_with_materials(
-            intro=get_agent_system_message(agent),
-            materials=rendered_materials or rendered_materials,
-        ),
+        system_message=get_agent_system_message(agent),
         language_classes=[],
+        rendered_materials=rendered_materials,
     )
 
 
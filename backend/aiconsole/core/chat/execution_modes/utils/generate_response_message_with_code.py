@@ -6,6 +6,7 @@ from uuid import uuid4
 from litellm import ModelResponse  # type: ignore
 
 from aiconsole.core.assets.agents.agent import AICAgent
+from aiconsole.core.assets.materials.rendered_material import RenderedMaterial
 from aiconsole.core.chat.chat_mutations import (
     AppendToCodeToolCallMutation,
     AppendToContentMessageMutation,
@@ -15,7 +16,8 @@ from aiconsole.core.chat.chat_mutations import (
     SetIsStreamingToolCallMutation,
 )
 from aiconsole.core.chat.chat_mutator import ChatMutator
-from aiconsole.core.chat.convert_messages import convert_messages
+from aiconsole.core.chat.context_budget import PromptContext, context_budget
+from aiconsole.core.chat.convert_messages import convert_message_groups
 from aiconsole.core.chat.execution_modes.utils.send_code import send_code
 from aiconsole.core.gpt.function_calls import OpenAISchema
 from aiconsole.core.gpt.gpt_executor import GPTExecutor
@@ -36,6 +38,7 @@ async def generate_response_message_with_code(
     system_message: str,
     language_classes: list[Type[OpenAISchema]],
     enforced_language: Type[OpenAISchema] | None = None,
+    rendered_materials: list[RenderedMaterial] | None = None,
 ):
     executor = GPTExecutor()
 
@@ -87,11 +90,13 @@ async def generate_response_message_with_code(
                 if message.requested_format:
                     all_requested_formats.append(message.requested_format)
 
-        async for chunk_or_clear in executor.execute(
-            GPTRequest(
-                system_message=system_message,
-                gpt_mode=agent.gpt_mode,
-                messages=[message for message in convert_messages(chat_mutator.chat)],
+        min_tokens = 250
+
+        context = context_budget().fit(
+            PromptContext(
+                intro=system_message,
+                message_groups=convert_message_groups(chat_mutator.chat),
+                rendered_materials=rendered_materials or [],
                 tools=[
                     *[
                         ToolDefinition(
@@ -102,6 +107,17 @@ async def generate_response_message_with_code(
                     ],
                     *all_requested_formats,
                 ],
+            ),
+            gpt_mode=agent.gpt_mode,
+            min_tokens=min_tokens,
+        )
+
+        async for chunk_or_clear in executor.execute(
+            GPTRequest(
+                system_message=context.system_message,
+                gpt_mode=agent.gpt_mode,
+                messages=context.messages,
+                tools=context.tools,
                 tool_choice=(
                     EnforcedFunctionCall(
                         type="function", function=EnforcedFunctionCallFuncSpec(name=enforced_language.__name__)
@@ -109,10 +125,12 @@ async def generate_response_message_with_code(
                     if enforced_language
                     else None
                 ),
-                min_tokens=250,
+                min_tokens=min_tokens,
                 preferred_tokens=2000,
                 temperature=0.2,
-            )
+            ),
+            queue_id=chat_mutator.chat.id,
+            agent_id=agent.id,
         ):
 
             if chunk_or_clear == CLEAR_STR:
@@ -135,6 +135,8 @@ async def send_code(
             if not function_call.arguments:
                 continue
 
+            arguments_dict = function_call.arguments_dict
+
             if function_call.name in [language_cls.__name__ for language_cls in language_classes]:
                 # Languge is in the name of the function call
 
@@ -146,9 +148,9 @@ async def send_code(
                 code = None
                 headline = None
 
-                if function_call.arguments_dict:
-                    code = function_call.arguments_dict.get("code", None)
-                    headline = function_call.arguments_dict.get("headline", None)
+                if arguments_dict:
+                    code = arguments_dict.get("code", None)
+                    headline = arguments_dict.get("headline", None)
                 else:
                     # Sometimes we don't have a dict, but it's still a json string
 
@@ -166,12 +168,10 @@ async def send_code(
 
                 await send_language_if_needed(default_language)
 
-                if function_call.arguments_dict:
+                if arguments_dict:
                     # ok we have a dict, those are probably arguments and the name of the function call is the name of the function
 
-                    arguments_materialised = [
-                        f"{key}={repr(value)}" for key, value in function_call.arguments_dict.items()
-                    ]
+                    arguments_materialised = [f"{key}={repr(value)}" for key, value in arguments_dict.items()]
                     code = f"{function_call.name}({', '.join(arguments_materialised)})"
 
                     await send_code_delta_for_code(code)
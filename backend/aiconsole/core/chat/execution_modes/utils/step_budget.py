@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from aiconsole.consts import (
+    DIRECTOR_MAX_SECONDS,
+    DIRECTOR_MAX_STEPS,
+    DIRECTOR_MAX_TOKENS,
+)
+from aiconsole.core.gpt.usage_meter import UsageMeter
+
+_log = logging.getLogger(__name__)
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+@dataclass
+class StepTiming:
+    step: int
+    agent_id: str = ""
+    analysis_seconds: float = 0.0
+    rendering_seconds: float = 0.0
+    execution_seconds: float = 0.0
+    tokens: int = 0
+
+    @property
+    def total_seconds(self) -> float:
+        return self.analysis_seconds + self.rendering_seconds + self.execution_seconds
+
+
+class StepBudget:
+    """
+    Limits of one autonomous run of steps (number of steps, tokens of all GPT requests and wall time) and the timing
+    of every step. checkpoint() is called between steps and raises BudgetExceeded once a limit is reached.
+    """
+
+    def __init__(
+        self,
+        max_steps: int = DIRECTOR_MAX_STEPS,
+        max_tokens: int = DIRECTOR_MAX_TOKENS,
+        max_seconds: float = DIRECTOR_MAX_SECONDS,
+    ):
+        self.max_steps = max_steps
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+        self.usage = UsageMeter()
+        self.steps: list[StepTiming] = []
+        self.started_at = time.monotonic()
+        self._tokens_at_step_start = 0
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def remaining_seconds(self) -> float:
+        return max(self.max_seconds - self.elapsed_seconds, 0.0)
+
+    def exceeded(self) -> str | None:
+        if len(self.steps) >= self.max_steps:
+            return f"reached the limit of {self.max_steps} steps"
+        if self.usage.total_tokens >= self.max_tokens:
+            return f"used {self.usage.total_tokens} of {self.max_tokens} tokens"
+        if self.remaining_seconds <= 0:
+            return f"ran for more than {self.max_seconds:.0f}s"
+        return None
+
+    async def checkpoint(self):
+        # Lets a pending cancellation (stop button) interrupt the run between steps
+        await asyncio.sleep(0)
+
+        reason = self.exceeded()
+        if reason is not None:
+            raise BudgetExceeded(reason)
+
+    def start_step(self) -> StepTiming:
+        step = StepTiming(step=len(self.steps) + 1)
+        self.steps.append(step)
+        self._tokens_at_step_start = self.usage.total_tokens
+        return step
+
+    def finish_step(self, step: StepTiming):
+        step.tokens = self.usage.total_tokens - self._tokens_at_step_start
+
+        _log.info(
+            f"Step {step.step} ({step.agent_id or 'no agent'}): analysis {step.analysis_seconds:.2f}s, "
+            f"rendering {step.rendering_seconds:.2f}s, execution {step.execution_seconds:.2f}s, {step.tokens} tokens"
+        )
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.steps)} steps, {self.usage.total_tokens} tokens in {self.usage.requests} requests, "
+            f"{self.elapsed_seconds:.1f}s"
+        )
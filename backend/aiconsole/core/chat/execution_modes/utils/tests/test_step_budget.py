@@ -0,0 +1,44 @@
+import pytest
+
+from aiconsole.core.chat.execution_modes.utils.step_budget import (
+    BudgetExceeded,
+    StepBudget,
+)
+from aiconsole.core.gpt.usage_meter import metered, record_usage
+
+
+@pytest.mark.asyncio
+async def test_stops_after_max_steps():
+    budget = StepBudget(max_steps=2)
+
+    for _ in range(2):
+        await budget.checkpoint()
+        budget.finish_step(budget.start_step())
+
+    with pytest.raises(BudgetExceeded, match="2 steps"):
+        await budget.checkpoint()
+
+
+@pytest.mark.asyncio
+async def test_counts_tokens_of_metered_requests():
+    budget = StepBudget(max_tokens=1000)
+    step = budget.start_step()
+
+    with metered(budget.usage):
+        record_usage(600)
+        record_usage(500)
+
+    record_usage(10_000)  # outside of the run
+    budget.finish_step(step)
+
+    assert step.tokens == 1100
+    with pytest.raises(BudgetExceeded, match="1100 of 1000 tokens"):
+        await budget.checkpoint()
+
+
+@pytest.mark.asyncio
+async def test_stops_after_max_seconds():
+    budget = StepBudget(max_seconds=0)
+
+    with pytest.raises(BudgetExceeded, match="more than 0s"):
+        await budget.checkpoint()
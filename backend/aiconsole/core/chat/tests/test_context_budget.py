@@ -0,0 +1,93 @@
+from aiconsole.core.assets.materials.rendered_material import RenderedMaterial
+from aiconsole.core.chat.context_budget import (
+    ContextBudget,
+    PromptContext,
+    SummariseOldGroups,
+    TruncateOldToolOutputs,
+    drop_low_priority_materials,
+    drop_oldest_groups,
+)
+from aiconsole.core.gpt.types import GPTRequestTextMessage, GPTRequestToolMessage
+
+
+def _group(index: int, output: str = "") -> list:
+    return [
+        GPTRequestTextMessage(role="user", content=f"Question {index}\nwith details"),
+        GPTRequestToolMessage(tool_call_id=f"call_{index}", content=output or f"Answer {index}"),
+    ]
+
+
+def _length(context: PromptContext) -> int:
+    return len(context.system_message) + sum(len(message.content or "") for message in context.messages)
+
+
+def _over(limit: int):
+    return lambda context: _length(context) > limit
+
+
+def test_truncates_only_old_tool_outputs():
+    context = PromptContext(intro="", message_groups=[_group(i, "x" * 5000) for i in range(4)])
+
+    trimmed = TruncateOldToolOutputs(keep_recent_groups=2, max_chars=100)(context, _over(0))
+
+    assert all(len(group[1].content) < 200 for group in trimmed.message_groups[:2])
+    assert all(len(group[1].content) == 5000 for group in trimmed.message_groups[2:])
+
+
+def test_summarises_the_fewest_old_groups_needed():
+    context = PromptContext(intro="", message_groups=[_group(i, "x" * 1000) for i in range(6)])
+    stage = SummariseOldGroups(keep_recent_groups=2)
+
+    trimmed = stage(context, _over(3500))
+
+    assert _length(trimmed) <= 3500
+    assert trimmed.message_groups[0][0].name == "summary"
+    assert "Question 0" in trimmed.message_groups[0][0].content
+    assert trimmed.message_groups[-2:] == context.message_groups[-2:]
+    assert len(stage._summaries) > 0
+
+
+def test_drops_least_important_materials_first():
+    materials = [RenderedMaterial(id=f"m{i}", content="y" * 100, error="") for i in range(3)]
+    context = PromptContext(intro="intro", message_groups=[_group(0)], rendered_materials=materials)
+
+    trimmed = drop_low_priority_materials(context, _over(_length(context) - 50))
+
+    assert [material.id for material in trimmed.rendered_materials] == ["m0", "m1"]
+
+
+def test_system_message_keeps_the_importance_order_of_materials():
+    materials = [RenderedMaterial(id=id, content=f"content of {id}", error="") for id in ("zeta", "alpha", "mid")]
+    context = PromptContext(intro="intro", message_groups=[], rendered_materials=materials)
+
+    assert context.system_message == "intro\n\n\ncontent of zeta\n\n\ncontent of alpha\n\n\ncontent of mid"
+
+
+def test_always_keeps_last_group_and_trailing_messages():
+    trailing = [GPTRequestTextMessage(role="system", content="Now analyse the chat.")]
+    context = PromptContext(intro="", message_groups=[_group(i) for i in range(3)], trailing_messages=trailing)
+
+    trimmed = drop_oldest_groups(context, _over(0))
+
+    assert trimmed.message_groups == [_group(2)]
+    assert trimmed.messages[-1] == trailing[0]
+
+
+def test_budget_runs_stages_only_while_over_budget(monkeypatch):
+    calls = []
+
+    def stage(context, is_over_budget):
+        calls.append(context)
+        return PromptContext(intro="", message_groups=context.message_groups[-1:])
+
+    budget = ContextBudget(stages=[stage, stage])
+    monkeypatch.setattr(
+        "aiconsole.core.chat.context_budget.get_model_config",
+        lambda gpt_mode: type("Config", (), {"max_tokens": 1000, "encoding": "gpt-4"})(),
+    )
+    monkeypatch.setattr(PromptContext, "count_tokens", lambda self, model: len(self.message_groups) * 500)
+
+    fitted = budget.fit(PromptContext(intro="", message_groups=[_group(i) for i in range(5)]), gpt_mode="cost")
+
+    assert len(calls) == 1
+    assert fitted.message_groups == [_group(4)]
@@ -19,6 +19,7 @@ from aiconsole.core.assets.materials.rendered_material import RenderedMaterial
 
 def create_full_prompt_with_materials(intro: str, materials: list[RenderedMaterial], outro: str = ""):
     section_strs = []
+    # Callers pass materials from the most to the least important one (see PromptContext), already deterministic
     for material in materials:
         section_strs.append(material.content)
 
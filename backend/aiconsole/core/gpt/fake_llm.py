@@ -0,0 +1,270 @@
+"""
+Offline stand-in for an OpenAI compatible chat completions API, for benchmarks and load tests without an API key.
+
+    poetry run fake-llm --port 8899 --ttft 0.5 --tokens-per-second 40 [--script recorded.json]
+
+Point a gpt mode at it with GPTModeConfig(model="openai/fake-llm", api_base="http://127.0.0.1:8899/v1",
+api_key="fake") (see fake_llm_gpt_mode_config). Completions are deterministic: when the request has tools, the first
+(or the enforced) tool is called with arguments generated from its JSON schema, otherwise a fixed text is streamed.
+A script (JSON list of {"content": ..., "tool_calls": [{"name": ..., "arguments": {...}}]}) replays recorded
+completions in order instead.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from itertools import count
+from pathlib import Path
+from typing import Any, AsyncGenerator
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from uvicorn import run
+
+from aiconsole.core.gpt.types import GPTModeConfig
+
+_log = logging.getLogger(__name__)
+
+FAKE_MODEL = "fake-llm"
+DEFAULT_CONTENT = "This is a deterministic response from the fake LLM. It streams at a fixed pace for benchmarks."
+
+
+class FakeToolCall(BaseModel):
+    name: str
+    arguments: dict[str, Any]
+
+
+class FakeCompletion(BaseModel):
+    content: str | None = None
+    tool_calls: list[FakeToolCall] = []
+
+
+class FakeLLMConfig(BaseModel):
+    time_to_first_token: float = 0.0
+    tokens_per_second: float = 0.0  # 0 streams as fast as possible
+    chars_per_token: int = 4
+    script: list[FakeCompletion] = []
+
+
+def fake_llm_gpt_mode_config(port: int, max_tokens: int = 128000) -> GPTModeConfig:
+    return GPTModeConfig(
+        max_tokens=max_tokens,
+        model=f"openai/{FAKE_MODEL}",
+        api_base=f"http://127.0.0.1:{port}/v1",
+        api_key="fake",
+    )
+
+
+def _value_for_schema(name: str, schema: dict[str, Any]) -> Any:
+    if "enum" in schema:
+        return schema["enum"][0] if schema["enum"] else ""
+
+    schema_type = schema.get("type", "string")
+
+    if schema_type == "object":
+        return {
+            property_name: _value_for_schema(property_name, property_schema)
+            for property_name, property_schema in schema.get("properties", {}).items()
+        }
+    if schema_type == "array":
+        return [_value_for_schema(name, schema.get("items", {}))]
+    if schema_type == "boolean":
+        return False
+    if schema_type in ("integer", "number"):
+        return 0
+    if name == "code":
+        return "print('Hello from the fake LLM')"
+
+    return f"Fake {name.replace('_', ' ')}"
+
+
+def deterministic_completion(request: dict[str, Any]) -> FakeCompletion:
+    tools = request.get("tools") or []
+
+    if not tools:
+        return FakeCompletion(content=DEFAULT_CONTENT)
+
+    tool_choice = request.get("tool_choice")
+    forced_name = tool_choice.get("function", {}).get("name") if isinstance(tool_choice, dict) else None
+    tool = next((tool for tool in tools if tool["function"]["name"] == forced_name), tools[0])
+    function = tool["function"]
+
+    return FakeCompletion(
+        tool_calls=[
+            FakeToolCall(
+                name=function["name"],
+                arguments=_value_for_schema(function["name"], function.get("parameters", {"type": "object"})),
+            )
+        ]
+    )
+
+
+class FakeLLM:
+    def __init__(self, config: FakeLLMConfig):
+        self.config = config
+        self._requests = count()
+        self._ids = count()
+
+    def completion_for(self, request: dict[str, Any]) -> FakeCompletion:
+        index = next(self._requests)
+
+        if self.config.script:
+            return self.config.script[index % len(self.config.script)]
+
+        return deterministic_completion(request)
+
+    def _tokens(self, text: str) -> list[str]:
+        size = max(self.config.chars_per_token, 1)
+        return [text[index : index + size] for index in range(0, len(text), size)]
+
+    def _deltas(self, completion: FakeCompletion) -> list[dict[str, Any]]:
+        deltas: list[dict[str, Any]] = [{"role": "assistant", "content": None}]
+
+        for token in self._tokens(completion.content or ""):
+            deltas.append({"content": token})
+
+        for tool_index, tool_call in enumerate(completion.tool_calls):
+            deltas.append(
+                {
+                    "tool_calls": [
+                        {
+                            "index": tool_index,
+                            "id": f"call_fake_{tool_index}",
+                            "type": "function",
+                            "function": {"name": tool_call.name, "arguments": ""},
+                        }
+                    ]
+                }
+            )
+
+            for token in self._tokens(json.dumps(tool_call.arguments)):
+                deltas.append({"tool_calls": [{"index": tool_index, "function": {"arguments": token}}]})
+
+        return deltas
+
+    async def stream(self, request: dict[str, Any]) -> AsyncGenerator[str, None]:
+        completion = self.completion_for(request)
+        completion_id = f"chatcmpl-fake-{next(self._ids)}"
+        created = int(time.time())
+        model = request.get("model", FAKE_MODEL)
+
+        def chunk(delta: dict[str, Any] | None, finish_reason: str | None = None, **extra) -> str:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if delta is not None else [],
+                **extra,
+            }
+            return f"data: {json.dumps(data)}\n\n"
+
+        await asyncio.sleep(self.config.time_to_first_token)
+
+        deltas = self._deltas(completion)
+        delay = 1 / self.config.tokens_per_second if self.config.tokens_per_second > 0 else 0
+
+        for index, delta in enumerate(deltas):
+            if index > 1 and delay:
+                await asyncio.sleep(delay)
+            yield chunk(delta)
+
+        yield chunk({}, finish_reason="tool_calls" if completion.tool_calls else "stop")
+
+        if (request.get("stream_options") or {}).get("include_usage"):
+            prompt_tokens = len(json.dumps(request.get("messages", []))) // max(self.config.chars_per_token, 1)
+            completion_tokens = len(deltas) - 1
+            yield chunk(
+                None,
+                usage={
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            )
+
+        yield "data: [DONE]\n\n"
+
+    def response(self, request: dict[str, Any]) -> dict[str, Any]:
+        completion = self.completion_for(request)
+
+        return {
+            "id": f"chatcmpl-fake-{next(self._ids)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", FAKE_MODEL),
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "tool_calls" if completion.tool_calls else "stop",
+                    "message": {
+                        "role": "assistant",
+                        "content": completion.content,
+                        **(
+                            {
+                                "tool_calls": [
+                                    {
+                                        "id": f"call_fake_{index}",
+                                        "type": "function",
+                                        "function": {"name": call.name, "arguments": json.dumps(call.arguments)},
+                                    }
+                                    for index, call in enumerate(completion.tool_calls)
+                                ]
+                            }
+                            if completion.tool_calls
+                            else {}
+                        ),
+                    },
+                }
+            ],
+        }
+
+
+def create_fake_llm_app(config: FakeLLMConfig) -> FastAPI:
+    app = FastAPI(title="Fake LLM")
+    fake_llm = FakeLLM(config)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: dict[str, Any]):
+        if request.get("stream"):
+            return StreamingResponse(fake_llm.stream(request), media_type="text/event-stream")
+
+        await asyncio.sleep(config.time_to_first_token)
+        return fake_llm.response(request)
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": FAKE_MODEL, "object": "model", "owned_by": "aiconsole"}]}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Start an offline fake OpenAI compatible LLM server.")
+    parser.add_argument("--port", type=int, help="Port to listen on.", default=8899)
+    parser.add_argument("--ttft", type=float, help="Time to first token in seconds.", default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, help="Streaming speed, 0 for unlimited.", default=0.0)
+    parser.add_argument("--script", type=Path, help="JSON file with a list of recorded completions.", default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    config = FakeLLMConfig(
+        time_to_first_token=args.ttft,
+        tokens_per_second=args.tokens_per_second,
+        script=json.loads(args.script.read_text()) if args.script else [],
+    )
+
+    _log.info(f"Fake LLM listening on port {args.port}")
+
+    try:
+        run(create_fake_llm_app(config), host="127.0.0.1", port=args.port)
+    except KeyboardInterrupt:
+        _log.info("Exiting ...")
+
+
+if __name__ == "__main__":
+    main()
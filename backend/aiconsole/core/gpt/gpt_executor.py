@@ -15,17 +15,28 @@
 # limitations under the License.
 import asyncio
 import logging
+import time
 from typing import AsyncGenerator
 
 import litellm  # type: ignore
-
-# from litellm.caching import Cache  # type: ignore
 from openai import AuthenticationError
 
 from aiconsole.api.websockets.connection_manager import connection_manager
 from aiconsole.api.websockets.server_messages import DebugJSONServerMessage
+from aiconsole.core.gpt.llm_cache import (
+    LLMCache,
+    chunk_from_dict,
+    chunk_to_dict,
+    llm_cache,
+)
 from aiconsole.core.gpt.partial import GPTPartialResponse
+from aiconsole.core.gpt.prompt_cache_stats import prompt_cache_stats
+from aiconsole.core.gpt.rate_limiter import backoff_delay
 from aiconsole.core.gpt.request import GPTRequest
+from aiconsole.core.gpt.router import build_request_dict, gpt_router
+from aiconsole.core.gpt.single_flight import single_flight
+from aiconsole.core.gpt.telemetry import LLMRequestRecord, llm_telemetry
+from aiconsole.core.gpt.usage_meter import record_usage
 
 from .exceptions import NoOpenAPIKeyException
 from .types import CLEAR_STR, CLEAR_STR_TYPE, GPTChoice, GPTResponse, GPTResponseMessage
@@ -33,7 +44,7 @@ from .types import CLEAR_STR, CLEAR_STR_TYPE, GPTChoice, GPTResponse, GPTRespons
 _log = logging.getLogger(__name__)
 
 
-# litellm.cache = Cache(type="local")
+# Responses are cached by llm_cache (opt-in), not by litellm
 litellm.disable_cache()
 litellm.set_verbose = False
 
@@ -52,52 +63,184 @@ class GPTExecutor:
         )
         self.partial_response = GPTPartialResponse()
 
-    async def execute(self, request: GPTRequest) -> AsyncGenerator[litellm.ModelResponse | CLEAR_STR_TYPE, None]:
-        request.validate_request()
+    async def execute(
+        self, request: GPTRequest, queue_id: str = "", agent_id: str = ""
+    ) -> AsyncGenerator[litellm.ModelResponse | CLEAR_STR_TYPE, None]:
+        """
+        queue_id groups requests (e.g. of one chat) for fair queuing when the model is rate limited, queue_id and
+        agent_id are recorded in the telemetry of the request.
 
-        request_dict = {
-            "messages": request.get_messages_dump(),
-            "temperature": request.temperature,
-            "presence_penalty": request.presence_penalty,
-            **request.llm_settings,
-        }
+        Identical requests running at the same time share one upstream stream (see single_flight).
+        """
 
-        if request.tool_choice:
-            request_dict["tool_choice"] = request.tool_choice
+        request.validate_request()
 
-        if request.tools:
-            request_dict["tools"] = [tool.model_dump(exclude_none=True) for tool in request.tools]
+        request_dict = build_request_dict(request)
+        request_key = LLMCache.request_key(request_dict)
 
-        for attempt in range(3):
-            try:
-                _log.info("Executing GPT request:", request_dict)
-                self.request = request_dict
-                response = await litellm.acompletion(**request_dict, stream=True)  # caching=True, ttl=60 * 60 * 24
+        self.request = request_dict
+        self.partial_response = GPTPartialResponse()
+        usage = None
 
+        async for chunk in single_flight().stream(
+            request_key, lambda: _execute_upstream(request, request_dict, request_key, queue_id, agent_id)
+        ):
+            if isinstance(chunk, str):
                 self.partial_response = GPTPartialResponse()
-
-                async for chunk in response:  # type: ignore
-                    self.partial_response.apply_chunk(chunk)
-                    yield chunk
-                    await asyncio.sleep(0)
-
-                self.response = self.partial_response.to_final_response()
-
-                if _log.isEnabledFor(logging.DEBUG):
-                    await connection_manager().send_to_all(
-                        DebugJSONServerMessage(
-                            message="GPT", object={"request": self.request, "response": self.response.model_dump()}
-                        )
-                    )
-
-                return
-            except AuthenticationError:
-                raise NoOpenAPIKeyException()
-            except Exception as error:
-                _log.exception(f"Error on attempt {attempt}: {error}", exc_info=error)
-                if attempt == 2:
-                    raise error
-            _log.info("Retrying GPT request")
-            yield CLEAR_STR
-
-        raise Exception("Unable to complete GPT request.")
+            else:
+                self.partial_response.apply_chunk(chunk)
+                usage = getattr(chunk, "usage", None) or usage
+            yield chunk
+            await asyncio.sleep(0)
+
+        self.response = self.partial_response.to_final_response()
+        record_usage(sum(_token_counts(request, self.response, usage)))
+
+        if _log.isEnabledFor(logging.DEBUG):
+            await connection_manager().send_to_all(
+                DebugJSONServerMessage(
+                    message="GPT", object={"request": self.request, "response": self.response.model_dump()}
+                )
+            )
+
+
+def _token_counts(request: GPTRequest, response: GPTResponse, usage) -> tuple[int, int]:
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+
+    if prompt_tokens is not None and completion_tokens is not None:
+        return prompt_tokens, completion_tokens
+
+    # Not every provider reports usage when streaming
+    if not response.choices:
+        return request.count_tokens(), 0
+
+    message = response.choices[0].message
+    function_calls = {"tool_calls": [call.function.model_dump() for call in message.tool_calls]}
+
+    return request.count_tokens(), request.count_tokens_output(
+        message.content or "", function_calls if message.tool_calls else None
+    )
+
+
+async def _execute_upstream(
+    request: GPTRequest, request_dict: dict, request_key: str, queue_id: str, agent_id: str
+) -> AsyncGenerator[litellm.ModelResponse | CLEAR_STR_TYPE, None]:
+    record = LLMRequestRecord(
+        model=request_dict["model"], gpt_mode=request.gpt_mode, chat_id=queue_id, agent_id=agent_id
+    )
+    partial_response = GPTPartialResponse()
+    usage = None
+    started_at = time.monotonic()
+    first_token_at = None
+
+    try:
+        async for chunk in _stream_with_retries(request, request_dict, request_key, queue_id, record):
+            if isinstance(chunk, str):
+                partial_response = GPTPartialResponse()
+                first_token_at = None
+            else:
+                first_token_at = first_token_at or time.monotonic()
+                partial_response.apply_chunk(chunk)
+                usage = getattr(chunk, "usage", None) or usage
+            yield chunk
+    except (asyncio.CancelledError, GeneratorExit):
+        record.cancelled = True
+        raise
+    except Exception as error:
+        record.error = f"{type(error).__name__}: {error}"
+        raise
+    finally:
+        finished_at = time.monotonic()
+        record.duration = finished_at - started_at
+
+        if first_token_at is not None:
+            record.time_to_first_token = first_token_at - started_at
+            record.prompt_tokens, record.completion_tokens = _token_counts(
+                request, partial_response.to_final_response(), usage
+            )
+
+            if finished_at > first_token_at:
+                record.tokens_per_second = record.completion_tokens / (finished_at - first_token_at)
+
+        record.cached_prompt_tokens = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", 0) or 0
+        await asyncio.to_thread(llm_telemetry().record, record)
+
+
+async def _stream_with_retries(
+    request: GPTRequest, request_dict: dict, request_key: str, queue_id: str, record: LLMRequestRecord
+) -> AsyncGenerator[litellm.ModelResponse | CLEAR_STR_TYPE, None]:
+    cache = llm_cache() if LLMCache.is_cacheable(request_dict) else None
+
+    if cache:
+        cached_chunks = await asyncio.to_thread(cache.get, request_key)
+
+        if cached_chunks is not None:
+            _log.info(f"Replaying cached GPT response {request_key}")
+            record.cache_hit = True
+
+            for chunk_data in cached_chunks:
+                yield chunk_from_dict(chunk_data)
+                await asyncio.sleep(0)
+
+            return
+
+    router = gpt_router()
+
+    for attempt in range(3):
+        stream = None
+        used_tokens = 0
+        record.retries = attempt
+
+        try:
+            stream = await router.open_stream(request, queue_id)
+            model = stream.request_dict["model"]
+            record.model, record.backend = model, stream.backend
+            expected_cached_tokens = prompt_cache_stats().expected_cached_tokens(
+                stream.request_dict, stream.request.model_config.encoding
+            )
+
+            recorded_chunks = []
+            usage = None
+
+            async for chunk in stream.chunks():
+                usage = getattr(chunk, "usage", None) or usage
+                if cache:
+                    recorded_chunks.append(chunk_to_dict(chunk))
+                yield chunk
+
+            router.record_success(stream.backend)
+            prompt_cache_stats().record(model, usage, expected_cached_tokens)
+
+            # Without reported usage the reservation stands in for it
+            used_tokens = getattr(usage, "total_tokens", None) or stream.reserved_tokens
+
+            # Only answers of the requested mode are cached under its key
+            if cache and stream.request is request:
+                await asyncio.to_thread(cache.put, request_key, recorded_chunks)
+
+            return
+        except AuthenticationError:
+            raise NoOpenAPIKeyException()
+        except Exception as error:
+            _log.exception(f"Error on attempt {attempt}: {error}", exc_info=error)
+
+            if stream is not None:
+                router.record_failure(stream.backend)
+
+            if attempt == 2:
+                raise error
+
+            # No need to wait when there is a healthy fallback to switch to
+            if not router.has_healthy_candidate(request):
+                await asyncio.sleep(backoff_delay(attempt, error))
+        finally:
+            if stream is not None:
+                # Failed and aborted attempts give back their whole reservation, so retries are not throttled by it
+                stream.refund(used_tokens)
+                await stream.close()
+
+        _log.info("Retrying GPT request")
+        yield CLEAR_STR
+
+    raise Exception("Unable to complete GPT request.")
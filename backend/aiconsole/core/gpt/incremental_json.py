@@ -0,0 +1,301 @@
+import json
+import re
+from typing import Any
+
+from aiconsole.core.gpt.parse_partial_json import parse_partial_json
+
+_WHITESPACE = " \t\n\r"
+_SCALAR_START = "-0123456789tfn"
+_STRING_SPECIAL = re.compile(r'["\\]')
+_decoder = json.JSONDecoder(strict=False)
+
+# Frame states
+_KEY_OR_END = 0
+_COLON = 1
+_VALUE = 2
+_COMMA_OR_END = 3
+
+
+def _is_high_surrogate(char: str) -> bool:
+    return "\ud800" <= char <= "\udbff"
+
+
+def _is_low_surrogate(char: str) -> bool:
+    return "\udc00" <= char <= "\udfff"
+
+
+class _Frame:
+    __slots__ = ("container", "state", "key")
+
+    def __init__(self, container: dict | list):
+        self.container = container
+        self.state = _KEY_OR_END if isinstance(container, dict) else _VALUE
+        self.key: str | None = None
+
+
+class IncrementalJSONParser:
+    """
+    Parses tool call arguments as they stream in, consuming only the new characters of every chunk.
+
+    The partial value follows parse_partial_json: strings that are still streaming are visible with what has arrived
+    so far, scalars and keys are visible once complete. Strings are scanned with a regex and only their new characters
+    are decoded when the value is read, so following a long code block costs O(delta) per chunk instead of a full
+    reparse, the joined text and string value are materialized lazily, at most once per chunk. The returned dict is updated in place and must not be modified. Arguments that are not a JSON object
+    (e.g. raw code or python literals) fall back to parse_partial_json.
+    """
+
+    def __init__(self):
+        self._text: list[str] = []
+        self._joined_text: str | None = ""
+        self._stack: list[_Frame] = []
+        self._root: dict | None = None
+        self._done = False
+        self._failed = False
+
+        # String being parsed, decoded parts (and their join, None when new parts arrived) and raw (still escaped)
+        # characters that were not decoded yet
+        self._string: list[str] | None = None
+        self._string_value: str | None = ""
+        self._raw: list[str] = []
+        self._raw_length = 0
+        self._string_is_key = False
+        self._escape_start: int | None = None  # Position in the raw characters of an unfinished escape
+        self._escape_remaining = 0  # -1 while waiting for the escaped character, then the \u digits left
+
+        self._scalar: list[str] | None = None
+
+    @property
+    def text(self) -> str:
+        if self._joined_text is None:
+            self._joined_text = "".join(self._text)
+            self._text = [self._joined_text]
+
+        return self._joined_text
+
+    @property
+    def value(self) -> dict | None:
+        if self._failed:
+            return parse_partial_json(self.text)
+
+        if self._string is not None and not self._string_is_key:
+            partial = self._decode_string()
+
+            # Wait for the low half of a surrogate pair, so the partial string only ever grows
+            if partial and _is_high_surrogate(partial[-1]):
+                partial = partial[:-1]
+
+            self._assign(partial)
+
+        return self._root
+
+    @property
+    def is_complete(self) -> bool:
+        return self._done and not self._failed
+
+    def feed(self, delta: str):
+        self._text.append(delta)
+        self._joined_text = None
+
+        if self._failed:
+            return
+
+        try:
+            self._consume(delta)
+        except (ValueError, KeyError, IndexError):
+            self._failed = True
+
+    def _consume(self, s: str):
+        i = 0
+        n = len(s)
+
+        while i < n:
+            if self._string is not None:
+                i = self._consume_string(s, i)
+                continue
+
+            char = s[i]
+
+            if self._scalar is not None:
+                if char not in _WHITESPACE and char not in ",}]":
+                    self._scalar.append(char)
+                    i += 1
+                    continue
+
+                self._assign(json.loads("".join(self._scalar)))
+                self._scalar = None
+                self._value_finished()
+
+            i += 1
+
+            if char in _WHITESPACE:
+                continue
+
+            if self._done:
+                raise ValueError("Unexpected data after the end of the arguments")
+
+            if not self._stack:
+                if char != "{" or self._root is not None:
+                    raise ValueError("Arguments are not a JSON object")
+
+                self._root = {}
+                self._stack.append(_Frame(self._root))
+                continue
+
+            frame = self._stack[-1]
+
+            if frame.state == _KEY_OR_END:
+                if char == '"':
+                    self._start_string(is_key=True)
+                elif char == "}":
+                    self._close()
+                else:
+                    raise ValueError(f"Unexpected {char!r}, expected a key")
+            elif frame.state == _COLON:
+                if char != ":":
+                    raise ValueError(f"Unexpected {char!r}, expected ':'")
+                frame.state = _VALUE
+            elif frame.state == _VALUE:
+                if char == '"':
+                    self._assign("")
+                    self._start_string(is_key=False)
+                elif char == "{" or char == "[":
+                    container: dict | list = {} if char == "{" else []
+                    self._assign(container)
+                    self._stack.append(_Frame(container))
+                elif char in _SCALAR_START:
+                    self._scalar = [char]
+                elif char == "]" and isinstance(frame.container, list):
+                    self._close()
+                else:
+                    raise ValueError(f"Unexpected {char!r}, expected a value")
+            elif frame.state == _COMMA_OR_END:
+                if char == ",":
+                    frame.state = _KEY_OR_END if isinstance(frame.container, dict) else _VALUE
+                elif char in "}]":
+                    self._close()
+                else:
+                    raise ValueError(f"Unexpected {char!r}, expected ',' or the end of a container")
+
+    def _consume_string(self, s: str, i: int) -> int:
+        n = len(s)
+
+        # Finish an escape sequence that was cut by the end of the previous chunk
+        while self._escape_start is not None and i < n:
+            char = s[i]
+            self._append_raw(char)
+            i += 1
+
+            if self._escape_remaining < 0:
+                self._escape_remaining = 4 if char == "u" else 0
+            else:
+                self._escape_remaining -= 1
+
+            if self._escape_remaining == 0:
+                self._escape_start = None
+
+        if i >= n:
+            return n
+
+        match = _STRING_SPECIAL.search(s, i)
+
+        if match is None:
+            self._append_raw(s[i:])
+            return n
+
+        j = match.start()
+        self._append_raw(s[i:j])
+
+        if s[j] == '"':
+            self._finish_string()
+            return j + 1
+
+        # Backslash, the escaped character (and \u digits) may be in the next chunk
+        self._escape_start = self._raw_length
+        self._escape_remaining = -1
+        self._append_raw("\\")
+        return j + 1
+
+    def _append_raw(self, raw: str):
+        self._raw.append(raw)
+        self._raw_length += len(raw)
+
+    def _start_string(self, is_key: bool):
+        self._string = []
+        self._string_value = ""
+        self._raw = []
+        self._raw_length = 0
+        self._string_is_key = is_key
+        self._escape_start = None
+
+    def _decode_string(self) -> str:
+        """
+        Decodes raw characters that arrived since the last call, leaving out an unfinished escape sequence.
+        """
+
+        assert self._string is not None
+
+        raw = "".join(self._raw) if len(self._raw) != 1 else self._raw[0]
+        cut = self._escape_start if self._escape_start is not None else len(raw)
+
+        if cut:
+            decoded = _decoder.decode(f'"{raw[:cut]}"')
+
+            # A surrogate pair may have been split between two decoded parts
+            if self._string and _is_low_surrogate(decoded[0]) and _is_high_surrogate(self._string[-1][-1]):
+                high = self._string[-1][-1]
+                self._string[-1] = self._string[-1][:-1]
+                decoded = (high + decoded).encode("utf-16", "surrogatepass").decode("utf-16")
+
+            self._string.append(decoded)
+            self._string_value = None
+
+        self._raw = [raw[cut:]]
+        self._raw_length = len(raw) - cut
+        if self._escape_start is not None:
+            self._escape_start = 0
+
+        if self._string_value is None:
+            self._string_value = "".join(self._string)
+            self._string = [self._string_value] if self._string_value else []
+
+        return self._string_value
+
+    def _finish_string(self):
+        if self._escape_start is not None:
+            raise ValueError("Unfinished escape sequence")
+
+        value = self._decode_string()
+        frame = self._stack[-1]
+
+        if self._string_is_key:
+            frame.key = value
+            frame.state = _COLON
+            self._string = None
+            return
+
+        self._assign(value)
+        self._string = None
+        self._value_finished()
+
+    def _assign(self, value: Any):
+        frame = self._stack[-1]
+
+        if isinstance(frame.container, dict):
+            assert frame.key is not None
+            frame.container[frame.key] = value
+        elif frame.state == _VALUE:
+            frame.container.append(value)
+            frame.state = _COMMA_OR_END  # Further assignments replace the appended value
+        else:
+            frame.container[-1] = value
+
+    def _value_finished(self):
+        self._stack[-1].state = _COMMA_OR_END
+
+    def _close(self):
+        self._stack.pop()
+
+        if self._stack:
+            self._value_finished()
+        else:
+            self._done = True
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import litellm  # type: ignore
+
+from aiconsole.consts import (
+    AICONSOLE_USER_CONFIG_DIR,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_BYTES,
+    LLM_CACHE_MAX_TEMPERATURE,
+    LLM_CACHE_TTL_SECONDS,
+)
+
+_log = logging.getLogger(__name__)
+
+# Not part of the key, rotating a key should not invalidate the cache
+_KEY_EXCLUDED_FIELDS = ("api_key",)
+
+
+def chunk_to_dict(chunk: litellm.ModelResponse) -> dict:
+    return chunk.model_dump()
+
+
+def chunk_from_dict(data: dict) -> litellm.ModelResponse:
+    # Newer litellm versions stream ModelResponseStream objects, older ones ModelResponse(stream=True)
+    model_response_stream = getattr(litellm, "ModelResponseStream", None)
+
+    if model_response_stream is not None:
+        return model_response_stream(**data)
+
+    return litellm.ModelResponse(stream=True, **data)
+
+
+class LLMCache:
+    """
+    SQLite cache of streamed LLM responses, keyed by a canonical hash of the request.
+
+    Every entry holds the recorded chunks of one response so a cached response can be replayed chunk by chunk.
+    The methods block on sqlite, async callers run them with asyncio.to_thread.
+    Entries expire after ttl_seconds, and the least recently used ones are evicted once the total size of stored
+    responses exceeds max_bytes.
+    """
+
+    def __init__(self, db_path: Path, ttl_seconds: int = LLM_CACHE_TTL_SECONDS, max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    chunks BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+                """)
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses(last_used_at)"
+            )
+
+    @staticmethod
+    def request_key(request_dict: dict[str, Any]) -> str:
+        canonical = {key: value for key, value in request_dict.items() if key not in _KEY_EXCLUDED_FIELDS}
+        serialized = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(serialized.encode("utf8")).hexdigest()
+
+    @staticmethod
+    def is_cacheable(request_dict: dict[str, Any], max_temperature: float = LLM_CACHE_MAX_TEMPERATURE) -> bool:
+        """
+        Only requests sampled at up to max_temperature (by default the deterministic ones) are cached, replaying a
+        sampled answer would hide the variation the caller asked for.
+        """
+
+        temperature = request_dict.get("temperature")
+        return temperature is not None and temperature <= max_temperature
+
+    def get(self, key: str) -> list[dict] | None:
+        now = time.time()
+
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT chunks, created_at FROM llm_responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            chunks, created_at = row
+
+            if created_at < now - self.ttl_seconds:
+                self._connection.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                return None
+
+            self._connection.execute("UPDATE llm_responses SET last_used_at = ? WHERE key = ?", (now, key))
+
+        return json.loads(zlib.decompress(chunks))
+
+    def put(self, key: str, chunks: list[dict]):
+        now = time.time()
+        data = zlib.compress(json.dumps(chunks, default=str).encode("utf8"))
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, chunks, size, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), now, now),
+            )
+            self._evict(now)
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM llm_responses")
+
+    def _evict(self, now: float):
+        self._connection.execute("DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        (total,) = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()
+
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, size in self._connection.execute("SELECT key, size FROM llm_responses ORDER BY last_used_at"):
+            if total <= self.max_bytes:
+                break
+
+            evicted.append((key,))
+            total -= size
+
+        self._connection.executemany("DELETE FROM llm_responses WHERE key = ?", evicted)
+        _log.debug(f"Evicted {len(evicted)} cached LLM responses")
+
+    def close(self):
+        self._connection.close()
+
+
+@lru_cache
+def llm_cache() -> LLMCache | None:
+    if not LLM_CACHE_ENABLED:
+        return None
+
+    return LLMCache(AICONSOLE_USER_CONFIG_DIR() / "llm_cache.db")
@@ -15,11 +15,8 @@
 # limitations under the License.
 
 from litellm import ModelResponse  # type: ignore
-from litellm.utils import Delta, StreamingChoices  # type: ignore
-from openai.types.chat.chat_completion_chunk import ChoiceDeltaToolCall
-from pydantic import BaseModel
 
-from aiconsole.core.gpt.parse_partial_json import parse_partial_json
+from aiconsole.core.gpt.incremental_json import IncrementalJSONParser
 from aiconsole.core.gpt.types import (
     GPTChoice,
     GPTFunctionCall,
@@ -29,56 +26,78 @@ from aiconsole.core.gpt.types import (
     GPTToolCall,
 )
 
+# Streamed chunks are applied to plain slotted objects, a pydantic GPTResponse is built only once the stream ends.
 
-class GPTPartialFunctionCall(BaseModel):
-    name: str = ""
-    arguments_builder: list[str] = []
+
+class GPTPartialFunctionCall:
+    __slots__ = ("name", "_arguments_parser")
+
+    def __init__(self):
+        self.name = ""
+        self._arguments_parser = IncrementalJSONParser()
 
     @property
     def arguments(self) -> str:
-        self.arguments_builder = ["".join(self.arguments_builder)]
-        return self.arguments_builder[0]
+        return self._arguments_parser.text
 
     @property
     def arguments_dict(self) -> dict | None:
-        return parse_partial_json(self.arguments)
+        return self._arguments_parser.value
+
+    def append_arguments(self, arguments_delta: str):
+        self._arguments_parser.feed(arguments_delta)
+
 
+class GPTPartialToolsCall:
+    __slots__ = ("id", "type", "function")
 
-class GPTPartialToolsCall(BaseModel):
-    id: str = ""
-    type: str = ""
-    function: GPTPartialFunctionCall = GPTPartialFunctionCall()
+    def __init__(self, id: str = ""):
+        self.id = id
+        self.type = ""
+        self.function = GPTPartialFunctionCall()
 
 
-class GPTPartialMessage(BaseModel):
-    role: GPTRole | None = None
-    content_builder: list[str] | None = None
+class GPTPartialMessage:
+    __slots__ = ("role", "name", "tool_calls", "_content_builder", "_content")
 
-    tool_calls: list[GPTPartialToolsCall] = []
-    name: str | None = None
+    def __init__(self):
+        self.role: GPTRole | None = None
+        self.name: str | None = None
+        self.tool_calls: list[GPTPartialToolsCall] = []
+        self._content_builder: list[str] = []
+        self._content: str | None = None
 
     @property
-    def content(self):
-        if not self.content_builder:
-            return None
+    def content(self) -> str | None:
+        if self._content is None and self._content_builder:
+            self._content = "".join(self._content_builder)
+            self._content_builder = [self._content]
 
-        self.content_builder = ["".join(self.content_builder)]
-        return self.content_builder[0]
+        return self._content
 
+    def append_content(self, content_delta: str):
+        self._content_builder.append(content_delta)
+        self._content = None
 
-class GPTPartialChoice(BaseModel):
-    index: int = 0
-    message: GPTPartialMessage = GPTPartialMessage()
-    role: str = ""
-    finnish_reason: str = ""
 
+class GPTPartialChoice:
+    __slots__ = ("index", "message", "finnish_reason")
 
-class GPTPartialResponse(BaseModel):
-    id: str = ""
-    object: str = ""
-    created: int = 0
-    model: str = ""
-    choices: list[GPTPartialChoice] = []
+    def __init__(self, index: int = 0):
+        self.index = index
+        self.message = GPTPartialMessage()
+        self.finnish_reason = ""
+
+
+class GPTPartialResponse:
+    __slots__ = ("id", "object", "created", "model", "choices")
+
+    def __init__(self):
+        self.id = ""
+        self.object = ""
+        self.created = 0
+        self.model = ""
+        self.choices: list[GPTPartialChoice] = []
 
     def to_final_response(self):
         return GPTResponse(
@@ -119,65 +138,54 @@ class GPTPartialResponse(BaseModel):
         if chunk.model is not None:
             self.model = chunk.model
 
-        if chunk.choices:
-            chunk_choices = chunk.choices
+        for chunk_choice in chunk.choices or ():
+            index = chunk_choice.index
+
+            while index >= len(self.choices):
+                self.choices.append(GPTPartialChoice(len(self.choices)))
 
-            for chunk_choice in chunk_choices:
-                index = chunk_choice.index
+            choice = self.choices[index]
 
-                if index >= len(self.choices):
-                    self.choices.append(GPTPartialChoice())
+            if chunk_choice.finish_reason is not None:
+                choice.finnish_reason = chunk_choice.finish_reason
 
-                choice = self.choices[index]
-                choice.index = index
+            chunk_delta = getattr(chunk_choice, "delta", None)
 
-                if chunk_choice.finish_reason is not None:
-                    choice.finnish_reason = chunk_choice.finish_reason
+            if chunk_delta is None:
+                continue
 
-                message = choice.message
+            message = choice.message
 
-                if isinstance(chunk_choice, StreamingChoices):
-                    chunk_delta = chunk_choice.delta
+            name = getattr(chunk_delta, "name", None)
+            if name is not None:
+                message.name = name
 
-                    if "name" in chunk_delta:
-                        message.name = chunk_delta["name"]
+            role = getattr(chunk_delta, "role", None)
+            if role is not None:
+                message.role = role
 
-                    if "role" in chunk_delta:
-                        message.role = chunk_delta["role"]
+            content = getattr(chunk_delta, "content", None)
+            if content is not None:
+                message.append_content(content)
 
-                    if "content" in chunk_delta and chunk_delta["content"] is not None:
-                        if message.content_builder is None:
-                            message.content_builder = []
+            for tool_call in getattr(chunk_delta, "tool_calls", None) or ():
+                chunk_tool_function = tool_call.function
 
-                        message.content_builder.append(chunk_delta["content"])
+                if not chunk_tool_function:
+                    continue
 
-                    if "tool_calls" in chunk_delta:
-                        assert isinstance(chunk_delta, Delta)
-                        chunk_tool_calls = chunk_delta["tool_calls"] or []
+                chunk_tool_index: int = tool_call.index
 
-                        for tool_call in chunk_tool_calls:
-                            if isinstance(tool_call, ChoiceDeltaToolCall):
-                                chunk_tool_index: int = tool_call.index
-                                chunk_tool_function = tool_call.function
+                while len(message.tool_calls) < chunk_tool_index + 1 and tool_call.id:
+                    message.tool_calls.append(GPTPartialToolsCall(id=tool_call.id))
 
-                                if chunk_tool_function:
-                                    while len(message.tool_calls) < chunk_tool_index + 1 and tool_call.id:
-                                        message.tool_calls.append(
-                                            GPTPartialToolsCall(
-                                                id=tool_call.id,
-                                            )
-                                        )
+                partial_tool_call = message.tool_calls[chunk_tool_index]
 
-                                    if tool_call.type:
-                                        message.tool_calls[chunk_tool_index].type = tool_call.type
+                if tool_call.type:
+                    partial_tool_call.type = tool_call.type
 
-                                    if chunk_tool_function:
-                                        if chunk_tool_function.name is not None:
-                                            message.tool_calls[
-                                                chunk_tool_index
-                                            ].function.name = chunk_tool_function.name
+                if chunk_tool_function.name is not None:
+                    partial_tool_call.function.name = chunk_tool_function.name
 
-                                        if chunk_tool_function.arguments is not None:
-                                            message.tool_calls[chunk_tool_index].function.arguments_builder.append(
-                                                chunk_tool_function.arguments
-                                            )
+                if chunk_tool_function.arguments is not None:
+                    partial_tool_call.function.append_arguments(chunk_tool_function.arguments)
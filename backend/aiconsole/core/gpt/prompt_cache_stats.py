@@ -0,0 +1,97 @@
+import hashlib
+import json
+import logging
+from functools import lru_cache
+from typing import Any
+
+import litellm  # type: ignore
+
+from aiconsole.core.gpt.token_counter import token_counter
+
+_log = logging.getLogger(__name__)
+
+
+@lru_cache
+def supports_usage_in_stream(model: str) -> bool:
+    try:
+        return "stream_options" in (litellm.get_supported_openai_params(model=model) or [])
+    except Exception:
+        return False
+
+
+def _digest(value: Any) -> bytes:
+    return hashlib.blake2b(json.dumps(value, sort_keys=True).encode("utf8"), digest_size=16).digest()
+
+
+def _get(value: Any, name: str) -> Any:
+    if value is None:
+        return None
+
+    if isinstance(value, dict):
+        return value.get(name)
+
+    return getattr(value, name, None)
+
+
+class PromptCacheStats:
+    """
+    Tracks how much of every prompt can be served from the prompt prefix cache of the provider.
+
+    Providers cache the longest previously seen prompt prefix (tools first, then messages), so the prefix shared with
+    the previous request to the same model is what can be expected to be cached. When the provider reports
+    usage, the actual number of cached tokens is logged next to it.
+    """
+
+    def __init__(self):
+        self._last_prompts: dict[str, tuple[bytes, list[bytes]]] = {}
+        self.total_prompt_tokens = 0
+        self.total_cached_tokens = 0
+
+    def expected_cached_tokens(self, request_dict: dict, encoding: str) -> int:
+        model = request_dict["model"]
+        messages = request_dict["messages"]
+        tools = request_dict.get("tools", [])
+
+        tools_digest = _digest(tools)
+        message_digests = [_digest(message) for message in messages]
+
+        previous = self._last_prompts.get(model)
+        self._last_prompts[model] = (tools_digest, message_digests)
+
+        if previous is None or previous[0] != tools_digest:
+            return 0
+
+        common = 0
+        for previous_digest, digest in zip(previous[1], message_digests):
+            if previous_digest != digest:
+                break
+            common += 1
+
+        if not common:
+            return 0
+
+        return token_counter().count_messages(encoding, messages[:common]) + (
+            token_counter().count_text(encoding, json.dumps(tools)) if tools else 0
+        )
+
+    def record(self, model: str, usage: Any, expected_cached_tokens: int):
+        prompt_tokens = _get(usage, "prompt_tokens")
+
+        if prompt_tokens is None:
+            _log.info(f"Prompt cache [{model}]: ~{expected_cached_tokens} tokens of shared prefix, no usage reported")
+            return
+
+        cached_tokens = _get(_get(usage, "prompt_tokens_details"), "cached_tokens") or 0
+
+        self.total_prompt_tokens += prompt_tokens
+        self.total_cached_tokens += cached_tokens
+
+        _log.info(
+            f"Prompt cache [{model}]: {cached_tokens} cached, {prompt_tokens - cached_tokens} uncached "
+            f"of {prompt_tokens} prompt tokens (~{expected_cached_tokens} tokens of shared prefix)"
+        )
+
+
+@lru_cache
+def prompt_cache_stats() -> PromptCacheStats:
+    return PromptCacheStats()
@@ -0,0 +1,25 @@
+import random
+from typing import Callable, Iterable, TypeVar
+
+from aiconsole.consts import PROMPT_ORDERING
+
+T = TypeVar("T")
+
+
+def order_for_prompt(items: Iterable[T], key: Callable[[T], str], shuffle: bool = True) -> list[T]:
+    """
+    Orders items listed in a prompt or a tool schema according to PROMPT_ORDERING.
+
+    In the stable mode items are sorted by key, so the same inputs always give a byte identical prompt prefix.
+    Otherwise they are shuffled, or kept in the given order when shuffle is False.
+    """
+
+    items = list(items)
+
+    if PROMPT_ORDERING == "stable":
+        return sorted(items, key=key)
+
+    if shuffle:
+        return random.sample(items, len(items))
+
+    return items
@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict, deque
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any
+
+_log = logging.getLogger(__name__)
+
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+
+
+class TokenBucket:
+    """
+    Bucket holding up to per_minute units, refilled continuously. Consuming more than is available puts it into debt,
+    so a single request larger than the whole budget is let through once the bucket is full, and then paid back.
+    """
+
+    __slots__ = ("capacity", "rate", "level", "updated_at")
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60
+        self.level = self.capacity
+        self.updated_at = time.monotonic()
+
+    def configure(self, per_minute: int):
+        if per_minute != self.capacity:
+            self.capacity = float(per_minute)
+            self.rate = per_minute / 60
+            self.level = min(self.level, self.capacity)
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        needed = min(amount, self.capacity) - self.level
+        return needed / self.rate if needed > 0 else 0
+
+    def consume(self, amount: float):
+        self.level -= amount
+
+    def refund(self, amount: float):
+        self.level = min(self.capacity, self.level + amount)
+
+
+class _Waiter:
+    __slots__ = ("tokens", "future")
+
+    def __init__(self, tokens: int, future: asyncio.Future):
+        self.tokens = tokens
+        self.future = future
+
+
+class _Lane:
+    """
+    Budgets and waiting requests of one (model, api_key) pair, with a queue per owner (usually a chat).
+    """
+
+    def __init__(self):
+        self.requests: TokenBucket | None = None
+        self.tokens: TokenBucket | None = None
+        self.paused_until = 0.0
+        self.queues: OrderedDict[str, deque[_Waiter]] = OrderedDict()
+        self.dispatcher: asyncio.Task | None = None
+
+    def configure(self, rpm: int | None, tpm: int | None):
+        self.requests = _configure_bucket(self.requests, rpm)
+        self.tokens = _configure_bucket(self.tokens, tpm)
+
+    def wait_time(self, tokens: int) -> float:
+        now = time.monotonic()
+
+        return max(
+            self.paused_until - now,
+            self.requests.wait_time(1, now) if self.requests else 0,
+            self.tokens.wait_time(tokens, now) if self.tokens else 0,
+        )
+
+    def consume(self, tokens: int):
+        if self.requests:
+            self.requests.consume(1)
+        if self.tokens:
+            self.tokens.consume(tokens)
+
+
+def _configure_bucket(bucket: TokenBucket | None, per_minute: int | None) -> TokenBucket | None:
+    if not per_minute:
+        return None
+
+    if bucket is None:
+        return TokenBucket(per_minute)
+
+    bucket.configure(per_minute)
+    return bucket
+
+
+class RateLimiter:
+    """
+    Process wide governor of LLM calls, keyed by model and api key, with requests per minute and tokens per minute
+    budgets (token buckets, a model without budgets is not limited).
+
+    Requests wait in a queue per owner and the queues are served round robin, so one chat running a long director
+    loop can not starve the others. When the provider answers with a rate limit error, the whole lane is paused for
+    the retry-after time.
+    """
+
+    def __init__(self):
+        self._lanes: dict[tuple[str, str], _Lane] = {}
+
+    def _lane(self, model: str, api_key: str | None) -> _Lane:
+        key = (model, api_key or "")
+
+        if key not in self._lanes:
+            self._lanes[key] = _Lane()
+
+        return self._lanes[key]
+
+    async def acquire(
+        self,
+        model: str,
+        api_key: str | None,
+        tokens: int,
+        owner: str = "",
+        rpm: int | None = None,
+        tpm: int | None = None,
+    ):
+        lane = self._lane(model, api_key)
+        lane.configure(rpm, tpm)
+
+        if not lane.queues and lane.wait_time(tokens) <= 0:
+            lane.consume(tokens)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        lane.queues.setdefault(owner, deque()).append(_Waiter(tokens, future))
+
+        if lane.dispatcher is None or lane.dispatcher.done():
+            lane.dispatcher = asyncio.create_task(self._dispatch(lane))
+
+        await future
+
+    def pause(self, model: str, api_key: str | None, seconds: float):
+        lane = self._lane(model, api_key)
+        lane.paused_until = max(lane.paused_until, time.monotonic() + seconds)
+
+    def refund(self, model: str, api_key: str | None, tokens: int):
+        lane = self._lane(model, api_key)
+
+        if lane.tokens and tokens > 0:
+            lane.tokens.refund(tokens)
+
+    async def _dispatch(self, lane: _Lane):
+        while lane.queues:
+            owner, queue = next(iter(lane.queues.items()))
+            waiter = queue[0]
+
+            if not waiter.future.done():
+                delay = lane.wait_time(waiter.tokens)
+
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+
+                lane.consume(waiter.tokens)
+                waiter.future.set_result(None)
+
+            queue.popleft()
+
+            if queue:
+                lane.queues.move_to_end(owner)
+            else:
+                del lane.queues[owner]
+
+
+def _retry_after(error: Exception) -> float | None:
+    response = getattr(error, "response", None)
+    headers: Any = getattr(response, "headers", None) or getattr(error, "litellm_response_headers", None) or {}
+
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+
+        if "retry-after" in headers:
+            value = headers["retry-after"]
+
+            try:
+                return float(value)
+            except ValueError:
+                return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        pass
+
+    return None
+
+
+def backoff_delay(attempt: int, error: Exception | None = None) -> float:
+    """
+    Delay before retrying a failed request, the retry-after of the provider (plus jitter) when it sent one, otherwise
+    an exponential backoff with full jitter.
+    """
+
+    retry_after = _retry_after(error) if error else None
+
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_MAX_SECONDS) + random.uniform(0, BACKOFF_BASE_SECONDS)
+
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt))
+
+
+@lru_cache
+def rate_limiter() -> RateLimiter:
+    return RateLimiter()
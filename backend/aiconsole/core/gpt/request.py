@@ -14,17 +14,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import json
 import logging
 from typing import Literal
 
-import tiktoken
-
 from aiconsole.core.gpt.consts import GPTMode
+from aiconsole.core.gpt.token_counter import token_counter
 from aiconsole.core.gpt.token_error import TokenError
 from aiconsole.core.gpt.tool_definition import ToolDefinition
 from aiconsole.core.gpt.types import (
     EnforcedFunctionCall,
+    GPTModeConfig,
     GPTRequestMessage,
     GPTRequestTextMessage,
 )
@@ -36,6 +37,23 @@ _log = logging.getLogger(__name__)
 EXTRA_BUFFER_FOR_ENCODING_OVERHEAD = 50
 
 
+def get_model_config(gpt_mode: GPTMode) -> GPTModeConfig:
+    mode_config = settings().unified_settings.gpt_modes.get(gpt_mode, None)
+
+    if mode_config is None:
+        raise ValueError(
+            f"Unknown GPT mode: '{gpt_mode}', available modes: {', '.join(settings().unified_settings.gpt_modes.keys())}"
+        )
+
+    # if api_key refers to any other setting, use that setting
+
+    for extra in settings().unified_settings.extra:
+        if mode_config.api_key == extra:
+            mode_config = mode_config.model_copy(update={"api_key": settings().unified_settings.extra[extra]})
+
+    return mode_config
+
+
 class GPTRequest:
     def __init__(
         self,
@@ -56,6 +74,7 @@ class GPTRequest:
         self.temperature = temperature
         self.gpt_mode = gpt_mode
         self.presence_penalty = presence_penalty
+        self.min_tokens = min_tokens
         self.max_tokens = 0
 
         # Checks if the given prompt can fit within a specified range of token lengths for the specified AI model.
@@ -76,6 +95,24 @@ class GPTRequest:
 
         self.max_tokens = min(available_tokens, preferred_tokens)
 
+    def for_gpt_mode(self, gpt_mode: GPTMode) -> "GPTRequest":
+        """
+        Copy of the request for another gpt mode, with max_tokens fitted to the context window of its model
+        """
+
+        request = copy.copy(self)
+        request.gpt_mode = gpt_mode
+
+        available_tokens = (
+            request.model_config.max_tokens - request.count_tokens() - EXTRA_BUFFER_FOR_ENCODING_OVERHEAD
+        )
+
+        if available_tokens <= 0 or available_tokens < self.min_tokens:
+            raise TokenError(f"The prompt does not fit in the context window of the '{gpt_mode}' mode.")
+
+        request.max_tokens = min(self.max_tokens, available_tokens)
+        return request
+
     def get_messages_dump(self):
         return [message.model_dump(exclude_none=True) for message in self.all_messages]
 
@@ -106,45 +143,22 @@ class GPTRequest:
 
     @property
     def model_config(self):
-        mode_config = settings().unified_settings.gpt_modes.get(self.gpt_mode, None)
-
-        if mode_config is None:
-            raise ValueError(
-                f"Unknown GPT mode: '{self.gpt_mode}', available modes: {', '.join(settings().unified_settings.gpt_modes.keys())}"
-            )
-
-        # if api_key refers to any other setting, use that setting
-
-        for extra in settings().unified_settings.extra:
-            if mode_config.api_key == extra:
-                mode_config = mode_config.model_copy(update={"api_key": settings().unified_settings.extra[extra]})
-
-        return mode_config
+        return get_model_config(self.gpt_mode)
 
     def count_tokens(self):
-        encoding = tiktoken.encoding_for_model(self.model_config.encoding)
-
-        if self.tools:
-            functions_tokens = len(encoding.encode(",".join(json.dumps(f.model_dump()) for f in self.tools)))
-        else:
-            functions_tokens = 0
-        return self.count_messages_tokens(encoding) + functions_tokens
+        return token_counter().count_prompt(self.model_config.encoding, self.get_messages_dump(), self.tools)
 
     def count_tokens_for_model(self, model):
-        encoding = tiktoken.encoding_for_model(self.model_config.encoding)
-        return self.count_messages_tokens(encoding)
-
-    def count_messages_tokens(self, encoding):
-        messages_str = json.dumps(self.get_messages_dump())
-        messages_tokens = len(encoding.encode(messages_str))
+        return self.count_messages_tokens(self.model_config.encoding)
 
-        return messages_tokens
+    def count_messages_tokens(self, model: str):
+        return token_counter().count_messages(model, self.get_messages_dump())
 
     def count_tokens_output(self, message_content: str, message_function_call: dict | None):
-        encoding = tiktoken.encoding_for_model(self.model_config.encoding)
+        model = self.model_config.encoding
 
-        return len(encoding.encode(message_content)) + (
-            len(encoding.encode(json.dumps(message_function_call))) if message_function_call else 0
+        return token_counter().count_text(model, message_content) + (
+            token_counter().count_text(model, json.dumps(message_function_call)) if message_function_call else 0
         )
 
     def validate_request(self):
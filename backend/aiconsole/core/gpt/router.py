@@ -0,0 +1,282 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, AsyncGenerator, AsyncIterator
+
+import litellm  # type: ignore
+from openai import RateLimitError
+
+from aiconsole.core.gpt.consts import GPTMode
+from aiconsole.core.gpt.prompt_cache_stats import supports_usage_in_stream
+from aiconsole.core.gpt.rate_limiter import backoff_delay, rate_limiter
+from aiconsole.core.gpt.request import GPTRequest
+from aiconsole.core.gpt.token_error import TokenError
+from aiconsole.core.settings.settings import settings
+
+_log = logging.getLogger(__name__)
+
+LATENCY_EWMA_ALPHA = 0.3
+FAILURE_COOLDOWN_SECONDS = 15.0
+MAX_FAILURE_COOLDOWN_SECONDS = 300.0
+
+
+def build_request_dict(request: GPTRequest) -> dict[str, Any]:
+    request_dict = {
+        "messages": request.get_messages_dump(),
+        "temperature": request.temperature,
+        "presence_penalty": request.presence_penalty,
+        **request.llm_settings,
+    }
+
+    if request.tool_choice:
+        request_dict["tool_choice"] = request.tool_choice
+
+    if request.tools:
+        request_dict["tools"] = [tool.model_dump(exclude_none=True) for tool in request.tools]
+
+    if supports_usage_in_stream(request_dict["model"]):
+        request_dict["stream_options"] = {"include_usage": True}
+
+    return request_dict
+
+
+def backend_name(request_dict: dict[str, Any]) -> str:
+    api_base = request_dict.get("api_base")
+    return f"{request_dict['model']}@{api_base}" if api_base else request_dict["model"]
+
+
+@dataclass
+class BackendHealth:
+    time_to_first_token_ewma: float | None = None
+    consecutive_failures: int = 0
+    unhealthy_until: float = 0.0
+
+
+@dataclass
+class OpenedStream:
+    """
+    A stream that already produced its first chunk.
+    """
+
+    request: GPTRequest
+    request_dict: dict[str, Any]
+    backend: str
+    reserved_tokens: int
+    first_chunk: Any
+    iterator: AsyncIterator = field(repr=False)
+
+    async def chunks(self) -> AsyncGenerator[Any, None]:
+        yield self.first_chunk
+
+        async for chunk in self.iterator:
+            yield chunk
+
+    def refund(self, used_tokens: int = 0):
+        """
+        Gives the part of the reservation that was not used back to the rate limiter.
+        """
+
+        rate_limiter().refund(
+            self.request_dict["model"], self.request_dict.get("api_key"), self.reserved_tokens - used_tokens
+        )
+
+    async def close(self):
+        aclose = getattr(self.iterator, "aclose", None)
+
+        if aclose is not None:
+            try:
+                await aclose()
+            except Exception:
+                _log.debug(f"Could not close the stream of {self.backend}")
+
+
+class GPTRouter:
+    """
+    Sends a request to the gpt mode it was made for or to one of the fallback modes of that mode.
+
+    Candidates are ordered by health: backends that failed recently are skipped for a cooldown that grows with every
+    consecutive failure, the rest are ordered by the EWMA of their time to first token (backends that were never
+    measured only after the measured ones, the requested mode first on ties). When the requested mode has
+    hedge_after_seconds set and the first token does not arrive in time, a second request is started on the next
+    candidate and the slower of the two is cancelled.
+    """
+
+    def __init__(self):
+        self._health: dict[str, BackendHealth] = {}
+
+    def health(self, backend: str) -> BackendHealth:
+        if backend not in self._health:
+            self._health[backend] = BackendHealth()
+
+        return self._health[backend]
+
+    def record_first_token(self, backend: str, seconds: float):
+        health = self.health(backend)
+
+        if health.time_to_first_token_ewma is None:
+            health.time_to_first_token_ewma = seconds
+        else:
+            health.time_to_first_token_ewma += LATENCY_EWMA_ALPHA * (seconds - health.time_to_first_token_ewma)
+
+    def record_first_token_at_least(self, backend: str, seconds: float):
+        """
+        Records a backend that was cancelled before its first token, it took at least the given time.
+        """
+        latency = self.health(backend).time_to_first_token_ewma
+
+        if latency is None or seconds > latency:
+            self.record_first_token(backend, seconds)
+
+    def record_success(self, backend: str):
+        health = self.health(backend)
+        health.consecutive_failures = 0
+        health.unhealthy_until = 0.0
+
+    def record_failure(self, backend: str):
+        health = self.health(backend)
+        health.consecutive_failures += 1
+        cooldown = FAILURE_COOLDOWN_SECONDS * 2 ** (health.consecutive_failures - 1)
+        health.unhealthy_until = time.monotonic() + min(cooldown, MAX_FAILURE_COOLDOWN_SECONDS)
+
+    def candidates(self, request: GPTRequest) -> list[GPTRequest]:
+        gpt_modes = settings().unified_settings.gpt_modes
+        modes: list[GPTMode] = [request.gpt_mode]
+
+        for fallback in request.model_config.fallbacks:
+            if fallback in gpt_modes and fallback not in modes:
+                modes.append(GPTMode(fallback))
+            elif fallback not in gpt_modes:
+                _log.warning(f"Unknown fallback gpt mode '{fallback}' of '{request.gpt_mode}'")
+
+        requests = [request]
+        for mode in modes[1:]:
+            try:
+                requests.append(request.for_gpt_mode(mode))
+            except TokenError:
+                _log.debug(f"Skipping fallback '{mode}' of '{request.gpt_mode}', the prompt does not fit")
+
+        now = time.monotonic()
+
+        def sort_key(indexed: tuple[int, GPTRequest]):
+            index, candidate = indexed
+            health = self.health(backend_name(candidate.llm_settings))
+            latency = health.time_to_first_token_ewma
+            return (health.unhealthy_until > now, latency is None, latency or 0.0, index)
+
+        return [candidate for _, candidate in sorted(enumerate(requests), key=sort_key)]
+
+    def has_healthy_candidate(self, request: GPTRequest) -> bool:
+        best = self.candidates(request)[0]
+        return self.health(backend_name(best.llm_settings)).unhealthy_until <= time.monotonic()
+
+    async def open_stream(self, request: GPTRequest, queue_id: str = "") -> OpenedStream:
+        candidates = self.candidates(request)
+        hedge_after = candidates[0].model_config.hedge_after_seconds
+
+        if hedge_after is not None and len(candidates) > 1:
+            return await self._open_hedged(candidates[0], candidates[1], hedge_after, queue_id)
+
+        return await self._open(candidates[0], queue_id)
+
+    async def _open(self, request: GPTRequest, queue_id: str) -> OpenedStream:
+        request_dict = build_request_dict(request)
+        model_config = request.model_config
+        backend = backend_name(request_dict)
+        reserved_tokens = request.count_tokens() + request.max_tokens
+
+        await rate_limiter().acquire(
+            request_dict["model"],
+            request_dict.get("api_key"),
+            reserved_tokens,
+            owner=queue_id,
+            rpm=model_config.rpm,
+            tpm=model_config.tpm,
+        )
+
+        async def first_chunk():
+            response = await litellm.acompletion(**request_dict, stream=True)
+            iterator = response.__aiter__()
+
+            try:
+                return iterator, await iterator.__anext__()
+            except StopAsyncIteration:
+                raise ValueError(f"Empty response stream from {backend}")
+
+        _log.info(f"Executing GPT request on {backend}")
+        started_at = time.monotonic()
+
+        opened = False
+
+        try:
+            iterator, chunk = await asyncio.wait_for(first_chunk(), timeout=model_config.first_token_timeout)
+            opened = True
+        except asyncio.TimeoutError:
+            self.record_failure(backend)
+            raise TimeoutError(f"No first token from {backend} in {model_config.first_token_timeout}s")
+        except asyncio.CancelledError:
+            # The slower hedge, without this a backend that always loses would never look slow
+            self.record_first_token_at_least(backend, time.monotonic() - started_at)
+            raise
+        except Exception as error:
+            self.record_failure(backend)
+
+            if isinstance(error, RateLimitError):
+                rate_limiter().pause(request_dict["model"], request_dict.get("api_key"), backoff_delay(0, error))
+
+            raise
+        finally:
+            # Nothing was generated (also when cancelled as the slower hedge), the reservation is given back
+            if not opened:
+                rate_limiter().refund(request_dict["model"], request_dict.get("api_key"), reserved_tokens)
+
+        self.record_first_token(backend, time.monotonic() - started_at)
+
+        return OpenedStream(
+            request=request,
+            request_dict=request_dict,
+            backend=backend,
+            reserved_tokens=reserved_tokens,
+            first_chunk=chunk,
+            iterator=iterator,
+        )
+
+    async def _open_hedged(
+        self, primary: GPTRequest, secondary: GPTRequest, hedge_after: float, queue_id: str
+    ) -> OpenedStream:
+        primary_task = asyncio.create_task(self._open(primary, queue_id))
+        done, _ = await asyncio.wait({primary_task}, timeout=hedge_after)
+
+        if done:
+            return primary_task.result()
+
+        _log.info(f"No first token from {primary.gpt_mode} after {hedge_after}s, hedging with {secondary.gpt_mode}")
+
+        pending = {primary_task, asyncio.create_task(self._open(secondary, queue_id))}
+        error: BaseException | None = None
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winners = [task for task in done if task.exception() is None]
+
+                if winners:
+                    for extra in winners[1:]:
+                        extra.result().refund()
+                        await extra.result().close()
+
+                    return winners[0].result()
+
+                error = next(iter(done)).exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        assert error is not None
+        raise error
+
+
+@lru_cache
+def gpt_router() -> GPTRouter:
+    return GPTRouter()
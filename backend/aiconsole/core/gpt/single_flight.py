@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Callable
+
+_log = logging.getLogger(__name__)
+
+
+class _Flight:
+    __slots__ = ("chunks", "done", "error", "subscribers", "changed", "task")
+
+    def __init__(self):
+        self.chunks: list[Any] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self.subscribers = 0
+        self.changed = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+    def notify(self):
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+
+class SingleFlight:
+    """
+    Runs one upstream stream per key and fans its chunks out to every concurrent subscriber of that key.
+
+    A subscriber that joins late first gets the chunks it missed, so every subscriber sees the whole stream. An upstream
+    error is raised in every subscriber, and the upstream is cancelled when the last subscriber leaves. Once finished
+    the key is forgotten, later requests start a new flight.
+    """
+
+    def __init__(self):
+        self._flights: dict[str, _Flight] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._flights
+
+    async def stream(self, key: str, upstream: Callable[[], AsyncGenerator[Any, None]]) -> AsyncGenerator[Any, None]:
+        flight = self._flights.get(key)
+
+        if flight is None:
+            flight = _Flight()
+            self._flights[key] = flight
+            flight.task = asyncio.create_task(self._run(key, flight, upstream))
+        else:
+            _log.info(f"Attaching to in flight request {key}")
+
+        flight.subscribers += 1
+        position = 0
+
+        try:
+            while True:
+                changed = flight.changed
+
+                while position < len(flight.chunks):
+                    yield flight.chunks[position]
+                    position += 1
+
+                if flight.done:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+
+                await changed.wait()
+        finally:
+            flight.subscribers -= 1
+
+            if flight.subscribers == 0 and not flight.done and flight.task is not None:
+                flight.task.cancel()
+
+    async def _run(self, key: str, flight: _Flight, upstream: Callable[[], AsyncGenerator[Any, None]]):
+        try:
+            async for chunk in upstream():
+                flight.chunks.append(chunk)
+                flight.notify()
+        except asyncio.CancelledError:
+            flight.error = asyncio.CancelledError()
+        except Exception as error:
+            flight.error = error
+        finally:
+            flight.done = True
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.notify()
+
+
+@lru_cache
+def single_flight() -> SingleFlight:
+    return SingleFlight()
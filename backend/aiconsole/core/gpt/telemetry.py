@@ -0,0 +1,199 @@
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, fields
+from functools import lru_cache
+from typing import Any
+
+import litellm  # type: ignore
+
+_log = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 99)
+
+
+@dataclass
+class LLMRequestRecord:
+    model: str
+    gpt_mode: str = ""
+    backend: str = ""
+    chat_id: str = ""
+    agent_id: str = ""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    time_to_first_token: float | None = None
+    duration: float = 0.0
+    tokens_per_second: float | None = None
+    retries: int = 0
+    cache_hit: bool = False
+    cost: float | None = None
+    error: str | None = None
+    # Stopped by the caller (a stopped chat, a cancelled hedge), neither an error nor a completed request
+    cancelled: bool = False
+    created_at: float = 0.0
+
+
+_COLUMNS = [field.name for field in fields(LLMRequestRecord)]
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float | None:
+    try:
+        prompt_cost, completion_cost = litellm.cost_per_token(
+            model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
+        return prompt_cost + completion_cost
+    except Exception:
+        return None
+
+
+def percentiles(values: list[float]) -> dict[str, float | None]:
+    """
+    Nearest-rank percentiles.
+    """
+
+    ordered = sorted(values)
+
+    if not ordered:
+        return {f"p{percentile}": None for percentile in PERCENTILES}
+
+    return {f"p{percentile}": ordered[max(0, -(-percentile * len(ordered) // 100) - 1)] for percentile in PERCENTILES}
+
+
+class LLMTelemetry:
+    """
+    One row per LLM request (an upstream request, identical requests sharing a stream are recorded once) in the
+    llm_requests table, with tokens, latency, throughput, retries, response cache hits and an estimated cost.
+    record() blocks on sqlite, async callers run it with asyncio.to_thread.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._lock = threading.Lock()
+        self._connection = connection
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS llm_requests (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    model TEXT NOT NULL,
+                    gpt_mode TEXT,
+                    backend TEXT,
+                    chat_id TEXT,
+                    agent_id TEXT,
+                    prompt_tokens INTEGER,
+                    completion_tokens INTEGER,
+                    cached_prompt_tokens INTEGER,
+                    time_to_first_token REAL,
+                    duration REAL,
+                    tokens_per_second REAL,
+                    retries INTEGER,
+                    cache_hit BOOLEAN,
+                    cost REAL,
+                    error TEXT,
+                    cancelled BOOLEAN DEFAULT 0,
+                    created_at REAL NOT NULL
+                )
+                """)
+
+            # Tables created before cancellations were recorded
+            columns = {row[1] for row in self._connection.execute("PRAGMA table_info(llm_requests)")}
+            if "cancelled" not in columns:
+                self._connection.execute("ALTER TABLE llm_requests ADD COLUMN cancelled BOOLEAN DEFAULT 0")
+
+            self._connection.execute("CREATE INDEX IF NOT EXISTS idx_llm_requests_created ON llm_requests(created_at)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS idx_llm_requests_chat ON llm_requests(chat_id)")
+
+    def record(self, record: LLMRequestRecord):
+        if not record.created_at:
+            record.created_at = time.time()
+
+        if record.cost is None:
+            record.cost = (
+                0.0
+                if record.cache_hit
+                else estimate_cost(record.model, record.prompt_tokens, record.completion_tokens)
+            )
+
+        values = asdict(record)
+
+        try:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    f"INSERT INTO llm_requests ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    [values[column] for column in _COLUMNS],
+                )
+        except sqlite3.Error as error:
+            _log.warning(f"Could not record LLM telemetry: {error}")
+
+    def query(
+        self,
+        chat_id: str | None = None,
+        agent_id: str | None = None,
+        model: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> list[LLMRequestRecord]:
+        conditions = []
+        parameters: list[Any] = []
+
+        for column, value in (("chat_id", chat_id), ("agent_id", agent_id), ("model", model)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+
+        if since is not None:
+            conditions.append("created_at >= ?")
+            parameters.append(since)
+
+        if until is not None:
+            conditions.append("created_at < ?")
+            parameters.append(until)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM llm_requests {where} ORDER BY created_at", parameters
+            ).fetchall()
+
+        records = [LLMRequestRecord(**dict(zip(_COLUMNS, row))) for row in rows]
+
+        for record in records:
+            record.cache_hit = bool(record.cache_hit)
+            record.cancelled = bool(record.cancelled)
+
+        return records
+
+    def summary(self, **filters) -> dict[str, Any]:
+        records = self.query(**filters)
+        cancelled = [record for record in records if record.cancelled]
+        succeeded = [record for record in records if record.error is None and not record.cancelled]
+
+        return {
+            "requests": len(records),
+            "errors": len(records) - len(succeeded) - len(cancelled),
+            "cancelled": len(cancelled),
+            "cache_hits": sum(1 for record in records if record.cache_hit),
+            "retries": sum(record.retries for record in records),
+            "prompt_tokens": sum(record.prompt_tokens for record in records),
+            "completion_tokens": sum(record.completion_tokens for record in records),
+            "cached_prompt_tokens": sum(record.cached_prompt_tokens for record in records),
+            "cost": sum(record.cost or 0 for record in records),
+            "time_to_first_token": percentiles(
+                [record.time_to_first_token for record in succeeded if record.time_to_first_token is not None]
+            ),
+            "duration": percentiles([record.duration for record in succeeded]),
+            "tokens_per_second": percentiles(
+                [record.tokens_per_second for record in succeeded if record.tokens_per_second is not None]
+            ),
+        }
+
+
+@lru_cache
+def llm_telemetry() -> LLMTelemetry:
+    from aiconsole.core.db.database import db
+
+    return LLMTelemetry(db.get_connection())
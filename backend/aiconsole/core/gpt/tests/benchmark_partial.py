@@ -0,0 +1,54 @@
+"""
+Measures the per chunk overhead of GPTPartialResponse.apply_chunk and of reading the partial state the way the
+execution modes do on every chunk.
+
+    python -m aiconsole.core.gpt.tests.benchmark_partial
+"""
+
+import json
+import timeit
+
+from aiconsole.core.gpt.partial import GPTPartialResponse
+from aiconsole.core.gpt.tests.test_partial import _chunk, _tool_call_chunk
+
+CHUNK_CHARS = 4
+
+
+def _content_chunks(text: str) -> list:
+    return [_chunk(role="assistant")] + [
+        _chunk(content=text[index : index + CHUNK_CHARS]) for index in range(0, len(text), CHUNK_CHARS)
+    ]
+
+
+def _tool_call_chunks(arguments: str) -> list:
+    return [_chunk(role="assistant"), _tool_call_chunk("", id="call_1", name="python")] + [
+        _tool_call_chunk(arguments[index : index + CHUNK_CHARS]) for index in range(0, len(arguments), CHUNK_CHARS)
+    ]
+
+
+def _measure(name: str, chunks: list, read) -> None:
+    def run():
+        partial = GPTPartialResponse()
+
+        for chunk in chunks:
+            partial.apply_chunk(chunk)
+            read(partial)
+
+    runs = 5
+    seconds = min(timeit.repeat(run, number=1, repeat=runs))
+    print(f"{name}: {len(chunks)} chunks, {seconds / len(chunks) * 1e6:.2f} us per chunk")
+
+
+def main():
+    code = "for i in range(10):\n    print(f'{i} squared is {i * i}')\n" * 400
+
+    _measure("content", _content_chunks(code), lambda partial: partial.choices[0].message.content)
+    _measure(
+        "tool call",
+        _tool_call_chunks(json.dumps({"code": code, "headline": "Print squares"})),
+        lambda partial: [tool_call.function.arguments_dict for tool_call in partial.choices[0].message.tool_calls],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import json
+import logging
+
+from fastapi.testclient import TestClient
+
+from aiconsole.core.gpt import fake_llm as fake_llm_module
+from aiconsole.core.gpt.fake_llm import (
+    DEFAULT_CONTENT,
+    FakeCompletion,
+    FakeLLMConfig,
+    create_fake_llm_app,
+    deterministic_completion,
+)
+
+PLAN_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "Plan",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "agent_id": {"type": "string", "enum": ["assistant", "user"]},
+                "relevant_material_ids": {"type": "array", "items": {"type": "string", "enum": ["python"]}},
+                "is_final_step": {"type": "boolean"},
+                "next_step": {"type": "string"},
+            },
+        },
+    },
+}
+
+
+def _stream(client: TestClient, request: dict) -> list[dict]:
+    response = client.post("/v1/chat/completions", json={**request, "stream": True})
+    lines = [line[len("data: ") :] for line in response.text.split("\n\n") if line.startswith("data: ")]
+
+    assert lines[-1] == "[DONE]"
+    return [json.loads(line) for line in lines[:-1]]
+
+
+def test_calls_tool_with_arguments_matching_its_schema():
+    completion = deterministic_completion({"messages": [], "tools": [PLAN_TOOL]})
+
+    assert completion.tool_calls[0].name == "Plan"
+    assert completion.tool_calls[0].arguments == {
+        "agent_id": "assistant",
+        "relevant_material_ids": ["python"],
+        "is_final_step": False,
+        "next_step": "Fake next step",
+    }
+
+
+def test_streams_content_and_usage():
+    client = TestClient(create_fake_llm_app(FakeLLMConfig()))
+
+    chunks = _stream(client, {"messages": [], "stream_options": {"include_usage": True}})
+    content = "".join(chunk["choices"][0]["delta"].get("content") or "" for chunk in chunks if chunk["choices"])
+
+    assert content == DEFAULT_CONTENT
+    assert chunks[-1]["usage"]["completion_tokens"] > 0
+
+
+def test_replays_script_in_order():
+    client = TestClient(
+        create_fake_llm_app(FakeLLMConfig(script=[FakeCompletion(content="1"), FakeCompletion(content="2")]))
+    )
+
+    contents = [
+        client.post("/v1/chat/completions", json={"messages": []}).json()["choices"][0]["message"]["content"]
+        for _ in range(3)
+    ]
+
+    assert contents == ["1", "2", "1"]
+
+
+def test_main_configures_logging_before_serving(monkeypatch):
+    calls = []
+    monkeypatch.setattr("sys.argv", ["fake-llm", "--port", "9999"])
+    monkeypatch.setattr(fake_llm_module.logging, "basicConfig", lambda **kwargs: calls.append(kwargs["level"]))
+    monkeypatch.setattr(fake_llm_module, "run", lambda app, host, port: calls.append(port))
+
+    fake_llm_module.main()
+
+    assert calls == [logging.INFO, 9999]
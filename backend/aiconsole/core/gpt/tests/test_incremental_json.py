@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from aiconsole.core.gpt.incremental_json import IncrementalJSONParser
+from aiconsole.core.gpt.parse_partial_json import parse_partial_json
+
+ARGUMENTS = [
+    {"code": "print('hi')\n\tx = \"q\" \\ end 🙂 zażółć \u0001", "headline": "Say hi"},
+    {
+        "thinking_process": "The user wants a plan",
+        "next_step": "Write it",
+        "agent_id": "assistant",
+        "relevant_material_ids": ["python", "", "files"],
+        "is_users_turn": False,
+        "score": -1.5e3,
+        "nested": {"a": [1, [2, {}]], "b": None, "c": True},
+    },
+    {},
+]
+
+
+def _feed_in_chunks(text: str, size: int):
+    parser = IncrementalJSONParser()
+
+    for index in range(0, len(text), size):
+        parser.feed(text[index : index + size])
+        yield parser
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7])
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+@pytest.mark.parametrize("arguments", ARGUMENTS)
+def test_parses_arguments_split_into_chunks(arguments: dict, ensure_ascii: bool, size: int):
+    for parser in _feed_in_chunks(json.dumps(arguments, ensure_ascii=ensure_ascii), size):
+        pass
+
+    assert parser.value == arguments
+    assert parser.is_complete
+
+
+@pytest.mark.parametrize("size", [1, 2, 5])
+def test_streamed_code_only_grows(size: int):
+    text = json.dumps({"code": 'x = "\\n"\n' * 50 + "🙂" * 3, "headline": "Print"})
+    previous = ""
+
+    for parser in _feed_in_chunks(text, size):
+        code = (parser.value or {}).get("code", "")
+        assert code.startswith(previous)
+        previous = code
+
+    assert previous == json.loads(text)["code"]
+
+
+def test_partial_values_match_parse_partial_json():
+    text = json.dumps(ARGUMENTS[0], ensure_ascii=False)
+
+    for length in range(1, len(text) + 1):
+        parser = IncrementalJSONParser()
+        parser.feed(text[:length])
+        expected = parse_partial_json(text[:length])
+
+        if expected is not None:
+            assert parser.value == expected
+
+
+def test_shows_complete_keys_between_values():
+    parser = IncrementalJSONParser()
+    parser.feed('{"code": "print(1)", "head')
+
+    assert parser.value == {"code": "print(1)"}
+    assert not parser.is_complete
+
+
+def test_falls_back_for_non_json_arguments():
+    parser = IncrementalJSONParser()
+    parser.feed('{"code": """print(1)\n"""}')
+
+    assert parser.value == {"code": "print(1)\n"}
+
+    parser = IncrementalJSONParser()
+    parser.feed("print(1)")
+
+    assert parser.value is None
+    assert parser.text == "print(1)"
+
+
+def test_joins_text_and_strings_at_most_once_per_chunk():
+    parser = IncrementalJSONParser()
+    parser.feed('{"code": "print(1)')
+
+    assert parser.text is parser.text
+    assert parser.value["code"] is parser.value["code"]  # type: ignore
+
+    parser.feed('\\nprint(2)')
+
+    assert parser.text == '{"code": "print(1)\\nprint(2)'
+    assert parser.value == {"code": "print(1)\nprint(2)"}
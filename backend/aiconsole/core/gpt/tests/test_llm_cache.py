@@ -0,0 +1,91 @@
+import time
+
+from aiconsole.core.gpt.llm_cache import LLMCache, chunk_from_dict, chunk_to_dict
+from aiconsole.core.gpt.partial import GPTPartialResponse
+
+REQUEST = {"model": "gpt-4o", "messages": [{"role": "user", "content": "Hi"}], "temperature": 0}
+
+CHUNKS = [
+    {
+        "id": "chatcmpl-1",
+        "created": 1700000000,
+        "model": "gpt-4o",
+        "choices": [{"index": 0, "delta": {"role": "assistant", "content": "Hello"}}],
+    },
+    {
+        "id": "chatcmpl-1",
+        "created": 1700000000,
+        "model": "gpt-4o",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "tool_calls",
+                "delta": {
+                    "tool_calls": [
+                        {
+                            "index": 0,
+                            "id": "call_1",
+                            "type": "function",
+                            "function": {"name": "python", "arguments": '{"code": "print(1)"}'},
+                        }
+                    ]
+                },
+            }
+        ],
+    },
+]
+
+
+def test_request_key_is_canonical():
+    reordered = dict(reversed(list(REQUEST.items())))
+
+    assert LLMCache.request_key(REQUEST) == LLMCache.request_key({**reordered, "api_key": "sk-other"})
+    assert LLMCache.request_key(REQUEST) != LLMCache.request_key({**REQUEST, "temperature": 1})
+
+
+def test_only_deterministic_requests_are_cacheable():
+    assert LLMCache.is_cacheable(REQUEST)
+    assert not LLMCache.is_cacheable({**REQUEST, "temperature": 1})
+    assert not LLMCache.is_cacheable({key: value for key, value in REQUEST.items() if key != "temperature"})
+    assert LLMCache.is_cacheable({**REQUEST, "temperature": 0.2}, max_temperature=0.2)
+
+
+def test_replays_recorded_chunks(tmp_path):
+    cache = LLMCache(tmp_path / "cache.db")
+    key = LLMCache.request_key(REQUEST)
+
+    assert cache.get(key) is None
+
+    cache.put(key, [chunk_to_dict(chunk_from_dict(data)) for data in CHUNKS])
+
+    partial = GPTPartialResponse()
+    for data in cache.get(key) or []:
+        partial.apply_chunk(chunk_from_dict(data))
+
+    message = partial.to_final_response().choices[0].message
+    assert message.content == "Hello"
+    assert message.tool_calls[0].function.arguments_dict == {"code": "print(1)"}
+
+
+def test_expired_entries_are_not_served(tmp_path):
+    cache = LLMCache(tmp_path / "cache.db", ttl_seconds=60)
+    cache.put("key", CHUNKS)
+
+    cache._connection.execute("UPDATE llm_responses SET created_at = ?", (time.time() - 120,))
+
+    assert cache.get("key") is None
+
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    cache = LLMCache(tmp_path / "cache.db", max_bytes=10**9)
+    cache.put("first", CHUNKS)
+    cache.put("second", CHUNKS)
+    cache._connection.execute("UPDATE llm_responses SET last_used_at = last_used_at - 10 WHERE key = 'second'")
+
+    (size,) = cache._connection.execute("SELECT size FROM llm_responses WHERE key = 'first'").fetchone()
+    cache.max_bytes = size * 2
+    cache.put("third", CHUNKS)
+
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.get("third") is not None
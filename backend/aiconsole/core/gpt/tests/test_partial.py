@@ -0,0 +1,69 @@
+import json
+from types import SimpleNamespace
+
+from aiconsole.core.gpt.partial import GPTPartialResponse
+
+
+def _chunk(finish_reason=None, **delta):
+    return SimpleNamespace(
+        id="chatcmpl-1",
+        object="chat.completion.chunk",
+        created=1700000000,
+        model="gpt-4",
+        choices=[
+            SimpleNamespace(
+                index=0,
+                finish_reason=finish_reason,
+                delta=SimpleNamespace(**{"role": None, "content": None, "tool_calls": None, **delta}),
+            )
+        ],
+    )
+
+
+def _tool_call_chunk(arguments: str, id: str | None = None, name: str | None = None):
+    return _chunk(
+        tool_calls=[
+            SimpleNamespace(
+                index=0,
+                id=id,
+                type="function" if id else None,
+                function=SimpleNamespace(name=name, arguments=arguments),
+            )
+        ]
+    )
+
+
+def test_accumulates_content():
+    partial = GPTPartialResponse()
+
+    partial.apply_chunk(_chunk(role="assistant", content="Hello"))
+    assert partial.choices[0].message.content == "Hello"
+
+    partial.apply_chunk(_chunk(content=", world"))
+    partial.apply_chunk(_chunk(finish_reason="stop"))
+
+    response = partial.to_final_response()
+
+    assert response.choices[0].message.role == "assistant"
+    assert response.choices[0].message.content == "Hello, world"
+    assert response.choices[0].finnish_reason == "stop"
+    assert response.model == "gpt-4"
+
+
+def test_accumulates_tool_call_arguments():
+    arguments = json.dumps({"code": "print(1)", "headline": "Print"})
+    partial = GPTPartialResponse()
+
+    partial.apply_chunk(_chunk(role="assistant"))
+    partial.apply_chunk(_tool_call_chunk(arguments[:12], id="call_1", name="python"))
+    assert partial.choices[0].message.tool_calls[0].function.arguments_dict == {"code": "pr"}
+
+    partial.apply_chunk(_tool_call_chunk(arguments[12:]))
+
+    tool_call = partial.to_final_response().choices[0].message.tool_calls[0]
+
+    assert partial.choices[0].message.content is None
+    assert tool_call.id == "call_1"
+    assert tool_call.type == "function"
+    assert tool_call.function.name == "python"
+    assert tool_call.function.arguments == arguments
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+from aiconsole.core.gpt.consts import GPTEncoding
+from aiconsole.core.gpt.prompt_cache_stats import PromptCacheStats
+from aiconsole.core.gpt.prompt_ordering import order_for_prompt
+from aiconsole.core.gpt.token_counter import token_counter
+
+SYSTEM = {"role": "system", "content": "You are the director. " * 20}
+QUESTION = {"role": "user", "content": "What is next?"}
+TOOLS = [{"type": "function", "function": {"name": "Plan", "parameters": {"type": "object"}}}]
+
+
+def _request(*messages, tools=TOOLS):
+    return {"model": "gpt-4o", "messages": list(messages), "tools": tools}
+
+
+def test_expects_shared_prefix_to_be_cached():
+    stats = PromptCacheStats()
+
+    assert stats.expected_cached_tokens(_request(SYSTEM, QUESTION), GPTEncoding.GPT_4) == 0
+
+    expected = stats.expected_cached_tokens(
+        _request(SYSTEM, {"role": "user", "content": "Something else"}), GPTEncoding.GPT_4
+    )
+
+    assert expected > token_counter().count_text(GPTEncoding.GPT_4, SYSTEM["content"])
+
+
+def test_changed_tools_invalidate_the_prefix():
+    stats = PromptCacheStats()
+    stats.expected_cached_tokens(_request(SYSTEM, QUESTION), GPTEncoding.GPT_4)
+
+    assert stats.expected_cached_tokens(_request(SYSTEM, QUESTION, tools=[]), GPTEncoding.GPT_4) == 0
+
+
+def test_records_reported_cached_tokens():
+    stats = PromptCacheStats()
+
+    stats.record("gpt-4o", SimpleNamespace(prompt_tokens=2000, prompt_tokens_details={"cached_tokens": 1536}), 1500)
+    stats.record("gpt-4o", None, 0)
+
+    assert stats.total_prompt_tokens == 2000
+    assert stats.total_cached_tokens == 1536
+
+
+def test_stable_ordering_does_not_depend_on_input_order():
+    ids = ["python", "assistant", "files", "browser"]
+
+    assert order_for_prompt(ids, key=str) == order_for_prompt(reversed(ids), key=str) == sorted(ids)
@@ -0,0 +1,66 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from aiconsole.core.gpt.rate_limiter import RateLimiter, TokenBucket, backoff_delay
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(per_minute=60)
+    now = bucket.updated_at
+
+    assert bucket.wait_time(60, now) == 0
+
+    bucket.consume(60)
+
+    assert bucket.wait_time(1, now) == pytest.approx(1)
+    assert bucket.wait_time(1, now + 1) == pytest.approx(0)
+
+
+@pytest.mark.asyncio
+async def test_serves_owners_round_robin():
+    limiter = RateLimiter()
+    granted = []
+
+    async def request(owner: str, name: str):
+        await limiter.acquire("gpt-4o", "key", 10, owner=owner, rpm=1000, tpm=100000)
+        granted.append(name)
+
+    limiter.pause("gpt-4o", "key", 0.05)
+    await asyncio.gather(
+        request("chat-a", "a1"),
+        request("chat-a", "a2"),
+        request("chat-a", "a3"),
+        request("chat-b", "b1"),
+    )
+
+    assert granted == ["a1", "b1", "a2", "a3"]
+
+
+@pytest.mark.asyncio
+async def test_limits_tokens_per_minute():
+    limiter = RateLimiter()
+
+    await limiter.acquire("gpt-4o", "key", 6000, tpm=6000)
+    waiting = asyncio.create_task(limiter.acquire("gpt-4o", "key", 10, tpm=6000))
+    await asyncio.sleep(0.05)
+
+    assert not waiting.done()
+
+    limiter.refund("gpt-4o", "key", 6000)
+    await asyncio.wait_for(waiting, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_models_without_budget_are_not_limited():
+    limiter = RateLimiter()
+
+    await asyncio.wait_for(asyncio.gather(*(limiter.acquire("gpt-4o", None, 10**6) for _ in range(100))), timeout=1)
+
+
+def test_backoff_honours_retry_after():
+    error = SimpleNamespace(response=SimpleNamespace(headers={"retry-after": "2"}))
+
+    assert 2 <= backoff_delay(0, error) <= 3  # type: ignore
+    assert 0 <= backoff_delay(3) <= 8
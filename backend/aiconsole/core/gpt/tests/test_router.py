@@ -0,0 +1,172 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from aiconsole.core.gpt import request as request_module
+from aiconsole.core.gpt import router as router_module
+from aiconsole.core.gpt.consts import GPTMode
+from aiconsole.core.gpt.rate_limiter import RateLimiter
+from aiconsole.core.gpt.request import GPTRequest
+from aiconsole.core.gpt.router import GPTRouter
+from aiconsole.core.gpt.token_error import TokenError
+from aiconsole.core.gpt.types import GPTModeConfig, GPTRequestTextMessage
+
+MODES = {
+    "quality": GPTModeConfig(model="slow-model", fallbacks=["speed"], hedge_after_seconds=0.05),
+    "speed": GPTModeConfig(model="fast-model"),
+}
+
+
+class FakeRequest:
+    def __init__(self, gpt_mode: str):
+        self.gpt_mode = GPTMode(gpt_mode)
+        self.max_tokens = 100
+        self.temperature = 1
+        self.presence_penalty = 0
+        self.tool_choice = None
+        self.tools = []
+
+    @property
+    def model_config(self):
+        return MODES[self.gpt_mode]
+
+    @property
+    def llm_settings(self):
+        return {"model": self.model_config.model}
+
+    def for_gpt_mode(self, gpt_mode):
+        return FakeRequest(gpt_mode)
+
+    def get_messages_dump(self):
+        return [{"role": "user", "content": "Hi"}]
+
+    def count_tokens(self):
+        return 10
+
+
+class FakeStream:
+    def __init__(self, model: str, delay: float):
+        self.model = model
+        self.delay = delay
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(model=self.model)
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    delays = {"slow-model": 1.0, "fast-model": 0.0}
+    opened: list[str] = []
+
+    async def acompletion(model, **kwargs):
+        opened.append(model)
+        if delays[model] is None:
+            raise ConnectionError(model)
+        return FakeStream(model, delays[model])
+
+    unified_settings = SimpleNamespace(gpt_modes=MODES)
+    monkeypatch.setattr(router_module, "settings", lambda: SimpleNamespace(unified_settings=unified_settings))
+    monkeypatch.setattr(router_module.litellm, "acompletion", acompletion)
+
+    return SimpleNamespace(delays=delays, opened=opened)
+
+
+@pytest.mark.asyncio
+async def test_hedges_slow_backend_and_takes_the_first_token(completions):
+    router = GPTRouter()
+
+    stream = await asyncio.wait_for(router.open_stream(FakeRequest("quality")), timeout=0.5)  # type: ignore
+
+    assert stream.first_chunk.model == "fast-model"
+    assert completions.opened == ["slow-model", "fast-model"]
+    assert router.health("fast-model").time_to_first_token_ewma is not None
+
+
+@pytest.mark.asyncio
+async def test_records_the_cancelled_hedge_as_at_least_that_slow(completions):
+    router = GPTRouter()
+    router.record_first_token("slow-model", 0.01)
+
+    await router.open_stream(FakeRequest("quality"))  # type: ignore
+    await asyncio.sleep(0.01)
+
+    assert router.health("slow-model").time_to_first_token_ewma > 0.01  # type: ignore
+    assert [candidate.gpt_mode for candidate in router.candidates(FakeRequest("quality"))] == ["speed", "quality"]  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_refunds_the_reservation_of_the_cancelled_hedge(completions, monkeypatch):
+    router = GPTRouter()
+    limiter = RateLimiter()
+    monkeypatch.setattr(router_module, "rate_limiter", lambda: limiter)
+    monkeypatch.setitem(MODES, "quality", MODES["quality"].model_copy(update={"tpm": 6000}))
+
+    await router.open_stream(FakeRequest("quality"))  # type: ignore
+    await asyncio.sleep(0.01)
+
+    assert limiter._lane("slow-model", None).tokens.level == pytest.approx(6000)  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_prefers_healthy_fallback_after_failure(completions):
+    router = GPTRouter()
+    completions.delays["slow-model"] = None
+
+    with pytest.raises(ConnectionError):
+        await router.open_stream(FakeRequest("quality"))  # type: ignore
+
+    assert [candidate.gpt_mode for candidate in router.candidates(FakeRequest("quality"))] == ["speed", "quality"]  # type: ignore
+    assert router.has_healthy_candidate(FakeRequest("quality"))  # type: ignore
+
+    stream = await router.open_stream(FakeRequest("quality"))  # type: ignore
+
+    assert stream.first_chunk.model == "fast-model"
+
+
+def test_orders_candidates_by_latency_ewma():
+    router = GPTRouter()
+    router.record_first_token("a", 1.0)
+    router.record_first_token("a", 2.0)
+
+    assert router.health("a").time_to_first_token_ewma == pytest.approx(1.3)
+
+    router.record_first_token_at_least("a", 1.0)
+
+    assert router.health("a").time_to_first_token_ewma == pytest.approx(1.3)
+
+    router.record_failure("a")
+    router.record_success("a")
+
+    assert router.health("a").unhealthy_until == 0
+
+
+def test_fallback_modes_must_leave_room_for_min_tokens(monkeypatch):
+    unified_settings = SimpleNamespace(
+        gpt_modes={
+            "quality": GPTModeConfig(model="slow-model", max_tokens=10000),
+            "speed": GPTModeConfig(model="fast-model", max_tokens=300),
+        },
+        extra={},
+    )
+    monkeypatch.setattr(request_module, "settings", lambda: SimpleNamespace(unified_settings=unified_settings))
+    request = GPTRequest(
+        system_message="",
+        messages=[GPTRequestTextMessage(role="user", content="Hi")],
+        gpt_mode=GPTMode("quality"),
+        min_tokens=500,
+        preferred_tokens=1000,
+    )
+
+    with pytest.raises(TokenError):
+        request.for_gpt_mode(GPTMode("speed"))
+
+    assert request.for_gpt_mode(GPTMode("quality")).max_tokens == 1000
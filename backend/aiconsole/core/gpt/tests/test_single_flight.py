@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from aiconsole.core.gpt.single_flight import SingleFlight
+
+
+async def _collect(stream) -> list:
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.asyncio
+async def test_fans_one_upstream_out_to_concurrent_subscribers():
+    flight = SingleFlight()
+    started = 0
+
+    async def upstream():
+        nonlocal started
+        started += 1
+        for chunk in ("a", "b", "c"):
+            await asyncio.sleep(0.01)
+            yield chunk
+
+    first = asyncio.create_task(_collect(flight.stream("key", upstream)))
+    await asyncio.sleep(0.015)
+    second = asyncio.create_task(_collect(flight.stream("key", upstream)))
+
+    assert await first == ["a", "b", "c"]
+    assert await second == ["a", "b", "c"]
+    assert started == 1
+    assert not flight.in_flight("key")
+
+
+@pytest.mark.asyncio
+async def test_raises_upstream_error_in_every_subscriber():
+    flight = SingleFlight()
+
+    async def upstream():
+        yield "a"
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+
+    results = await asyncio.gather(
+        _collect(flight.stream("key", upstream)), _collect(flight.stream("key", upstream)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancels_upstream_when_last_subscriber_leaves():
+    flight = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def upstream():
+        try:
+            yield "a"
+            await asyncio.sleep(10)
+        finally:
+            cancelled.set()
+
+    stream = flight.stream("key", upstream)
+    assert await anext(stream) == "a"
+    await stream.aclose()
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
@@ -0,0 +1,58 @@
+import sqlite3
+
+import pytest
+
+from aiconsole.core.gpt import telemetry as telemetry_module
+from aiconsole.core.gpt.telemetry import LLMRequestRecord, LLMTelemetry, percentiles
+
+
+def test_nearest_rank_percentiles():
+    assert percentiles(list(range(1, 101))) == {"p50": 50, "p90": 90, "p99": 99}
+    assert percentiles([3.0]) == {"p50": 3.0, "p90": 3.0, "p99": 3.0}
+    assert percentiles([]) == {"p50": None, "p90": None, "p99": None}
+
+
+def test_summarises_filtered_requests(monkeypatch):
+    monkeypatch.setattr(
+        telemetry_module,
+        "estimate_cost",
+        lambda model, prompt_tokens, completion_tokens: (prompt_tokens * 2.5 + completion_tokens * 10) / 1_000_000,
+    )
+    telemetry = LLMTelemetry(sqlite3.connect(":memory:"))
+
+    for index in range(10):
+        telemetry.record(
+            LLMRequestRecord(
+                model="gpt-4o",
+                chat_id="a" if index < 8 else "b",
+                prompt_tokens=1000,
+                completion_tokens=100,
+                time_to_first_token=index / 10,
+                duration=1.0,
+                tokens_per_second=100.0,
+                created_at=1000 + index,
+            )
+        )
+    telemetry.record(LLMRequestRecord(model="gpt-4o", chat_id="a", cache_hit=True, created_at=1010))
+    telemetry.record(LLMRequestRecord(model="gpt-4o", chat_id="a", duration=0.01, cancelled=True, created_at=1011))
+    telemetry.record(LLMRequestRecord(model="gpt-4o", chat_id="a", duration=0.02, error="Boom", created_at=1012))
+
+    summary = telemetry.summary(chat_id="a", since=1001)
+
+    assert summary["requests"] == 10
+    assert summary["errors"] == 1
+    assert summary["cancelled"] == 1
+    assert summary["cache_hits"] == 1
+    assert summary["prompt_tokens"] == 7000
+    assert summary["time_to_first_token"]["p50"] == pytest.approx(0.4)
+    assert summary["duration"]["p50"] == 1.0
+    assert summary["cost"] == pytest.approx(7 * (1000 * 2.5 + 100 * 10) / 1_000_000)
+
+
+def test_adds_the_cancelled_column_to_existing_tables():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE llm_requests (id INTEGER PRIMARY KEY AUTOINCREMENT, model TEXT NOT NULL)")
+
+    LLMTelemetry(connection)
+
+    assert "cancelled" in {row[1] for row in connection.execute("PRAGMA table_info(llm_requests)")}
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from aiconsole.core.gpt.consts import GPTEncoding
+from aiconsole.core.gpt.token_counter import TokenCounter, get_encoding
+from aiconsole.core.gpt.tool_definition import (
+    ToolDefinition,
+    ToolFunctionDefinition,
+    ToolFunctionParameters,
+)
+from aiconsole.core.gpt.types import (
+    GPTFunctionCall,
+    GPTRequestTextMessage,
+    GPTRequestToolMessage,
+    GPTToolCall,
+)
+
+MODEL = GPTEncoding.GPT_4
+
+MESSAGES = [
+    GPTRequestTextMessage(role="system", content="You are a helpful assistant.\n\n\n# Materials\n\n* one"),
+    GPTRequestTextMessage(role="user", content="Hi! Can you count to 3?   "),
+    GPTRequestTextMessage(
+        role="assistant",
+        content=None,
+        name="assistant",
+        tool_calls=[
+            GPTToolCall(
+                id="call_1",
+                function=GPTFunctionCall(
+                    name="python_tool", arguments=json.dumps({"code": "for i in range(3):\n\tprint(i)"})
+                ),
+            )
+        ],
+    ),
+    GPTRequestToolMessage(tool_call_id="call_1", content="0\n1\n2\n"),
+    GPTRequestTextMessage(role="assistant", content='Zażółć gęślą jaźń 🙂, 1234567 "quoted" }]}, {"x": 1}'),
+    GPTRequestTextMessage(role="user", content=""),
+]
+
+TOOLS = [
+    ToolDefinition(
+        type="function",
+        function=ToolFunctionDefinition(
+            name="python_tool",
+            description="Execute code",
+            parameters=ToolFunctionParameters(
+                type="object",
+                properties={"code": {"type": "string"}, "headline": {"type": "string"}},
+                required=["code", "headline"],
+            ),
+        ),
+    )
+]
+
+
+def _legacy_messages_count(messages: list[dict]) -> int:
+    return len(get_encoding(MODEL).encode(json.dumps(messages)))
+
+
+def _dump(messages):
+    return [message.model_dump(exclude_none=True) for message in messages]
+
+
+@pytest.mark.parametrize("length", range(len(MESSAGES) + 1))
+def test_messages_count_matches_whole_prompt_encoding(length: int):
+    messages = _dump(MESSAGES[:length])
+
+    assert TokenCounter().count_messages(MODEL, messages) == _legacy_messages_count(messages)
+
+
+def test_messages_count_is_exact_when_served_from_cache():
+    counter = TokenCounter()
+
+    for length in range(len(MESSAGES) + 1):
+        messages = _dump(MESSAGES[:length])
+        assert counter.count_messages(MODEL, messages) == _legacy_messages_count(messages)
+        assert counter.count_messages(MODEL, messages) == _legacy_messages_count(messages)
+
+
+def test_tools_count_matches_legacy_count():
+    legacy = len(get_encoding(MODEL).encode(",".join(json.dumps(f.model_dump()) for f in TOOLS)))
+
+    assert TokenCounter().count_tools(MODEL, TOOLS) == legacy
+    assert TokenCounter().count_tools(MODEL, []) == 0
+
+
+def test_cache_is_bounded():
+    counter = TokenCounter(max_cached_segments=2)
+
+    counter.count_messages(MODEL, _dump(MESSAGES))
+
+    assert len(counter._counts) == 2
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from functools import lru_cache
+
+import tiktoken
+
+from aiconsole.core.gpt.tool_definition import ToolDefinition
+
+_log = logging.getLogger(__name__)
+
+MAX_CACHED_SEGMENTS = 20000
+
+
+@lru_cache
+def get_encoding(model: str) -> tiktoken.Encoding:
+    return tiktoken.encoding_for_model(model)
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf8", errors="surrogatepass"), digest_size=16).digest()
+
+
+class TokenCounter:
+    """
+    Counts prompt tokens, memoising the count of every message and tool schema set by content hash.
+
+    A prompt is measured as json.dumps of the list of message dumps. Tiktoken never merges tokens across
+    the splits of its pre-tokenizer and the ", " separator always starts a new split on the space, so the list
+    can be cut into per message segments: ("[" or " ") + message + ("," or "]"). Token counts of those segments
+    sum up exactly to the count of the whole string, so only new or changed messages are ever encoded.
+    """
+
+    def __init__(self, max_cached_segments: int = MAX_CACHED_SEGMENTS):
+        self._max_cached_segments = max_cached_segments
+        self._counts: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+
+    def count_text(self, model: str, text: str) -> int:
+        return len(get_encoding(model).encode(text))
+
+    def count_messages(self, model: str, messages: list[dict]) -> int:
+        if not messages:
+            return self._count_cached(model, "[]")
+
+        last_index = len(messages) - 1
+        total = 0
+
+        for index, message in enumerate(messages):
+            prefix = "[" if index == 0 else " "
+            suffix = "]" if index == last_index else ","
+            total += self._count_cached(model, prefix + json.dumps(message) + suffix)
+
+        return total
+
+    def count_tools(self, model: str, tools: list[ToolDefinition]) -> int:
+        if not tools:
+            return 0
+
+        return self._count_cached(model, ",".join(json.dumps(tool.model_dump()) for tool in tools))
+
+    def count_prompt(self, model: str, messages: list[dict], tools: list[ToolDefinition]) -> int:
+        return self.count_messages(model, messages) + self.count_tools(model, tools)
+
+    def clear(self):
+        self._counts.clear()
+
+    def _count_cached(self, model: str, text: str) -> int:
+        encoding_name = get_encoding(model).name
+        key = (encoding_name, _digest(text))
+
+        count = self._counts.get(key)
+
+        if count is not None:
+            self._counts.move_to_end(key)
+            return count
+
+        count = self.count_text(model, text)
+        self._counts[key] = count
+
+        if len(self._counts) > self._max_cached_segments:
+            self._counts.popitem(last=False)
+
+        return count
+
+
+@lru_cache
+def token_counter() -> TokenCounter:
+    return TokenCounter()
@@ -100,4 +100,9 @@ class GPTModeConfig(BaseModel):
     model: str | None = None
     api_key: str | None = None
     api_base: str | None = None
+    rpm: int | None = None  # Requests per minute budget shared by all modes using the same model and api key
+    tpm: int | None = None  # Tokens per minute budget, same sharing as rpm
+    fallbacks: list[str] = []  # Other gpt modes to route to when this one fails or is slow
+    first_token_timeout: float | None = None  # Seconds to wait for the first chunk before failing the attempt
+    hedge_after_seconds: float | None = None  # Start the request on the first fallback too when no token by then
     extra: dict[str, Any] = {}
@@ -0,0 +1,35 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current_meter: ContextVar["UsageMeter | None"] = ContextVar("usage_meter", default=None)
+
+
+class UsageMeter:
+    """
+    Sums the tokens of all GPT requests made inside metered(meter), e.g. by all steps of one director run.
+    """
+
+    def __init__(self):
+        self.total_tokens = 0
+        self.requests = 0
+
+    def add(self, tokens: int):
+        self.total_tokens += tokens
+        self.requests += 1
+
+
+@contextmanager
+def metered(meter: UsageMeter):
+    token = _current_meter.set(meter)
+
+    try:
+        yield meter
+    finally:
+        _current_meter.reset(token)
+
+
+def record_usage(tokens: int):
+    meter = _current_meter.get()
+
+    if meter is not None:
+        meter.add(tokens)
@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from aiconsole.consts import SETTINGS_POLL_INTERVAL_SECONDS
+from aiconsole.core.settings.db.settings_table import SettingsTable
+from aiconsole.utils.events import InternalEvent, internal_events
+
+_log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class SettingsUpdatedEvent(InternalEvent):
+    pass
+
+
+class SettingsChangeWatcher:
+    """
+    Emits SettingsUpdatedEvent on the loop it was started on whenever the settings version changes, whether the
+    settings were saved by this process or by another connection to the database.
+
+    Polling only reads PRAGMA data_version, the version counter is read when another connection committed something.
+    """
+
+    def __init__(self, table: SettingsTable, interval: float = SETTINGS_POLL_INTERVAL_SECONDS):
+        self._table = table
+        self._interval = interval
+        self._data_version = table.data_version()
+        self._version = table.version
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._poll())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def check(self) -> bool:
+        data_version = self._table.data_version()
+
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self._table.refresh_version()
+
+        if self._table.version == self._version:
+            return False
+
+        self._version = self._table.version
+        await internal_events().emit(SettingsUpdatedEvent())
+        return True
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self._interval)
+
+            try:
+                await self.check()
+            except Exception:
+                _log.exception("Error while checking for settings changes")
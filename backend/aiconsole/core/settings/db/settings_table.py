@@ -0,0 +1,163 @@
+import ast
+import json
+import logging
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Any
+
+from pydantic import ValidationError
+
+from aiconsole_toolkit.settings.partial_settings_data import PartialSettingsData
+
+_log = logging.getLogger(__name__)
+
+NESTED_KEY_SEPARATOR = "/"
+
+# Lists of entries to remove from the map settings, e.g. materials_to_reset removes materials/<id>
+_RESET_SUFFIX = "_to_reset"
+
+
+def _decode(key: str, value: str | None) -> Any:
+    if value is None:
+        return None
+
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        pass
+
+    # Rows written before settings were stored as JSON hold str(value)
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        _log.debug(f"Setting {key} is not JSON, reading it as a plain string")
+        return value
+
+
+def _validate(data: dict[str, Any]) -> PartialSettingsData:
+    """
+    Typed decoding of the stored values, a key that does not validate is dropped instead of failing all settings.
+    """
+
+    while True:
+        try:
+            return PartialSettingsData.model_validate(data)
+        except ValidationError as error:
+            invalid_keys = {str(detail["loc"][0]) for detail in error.errors() if detail["loc"]}
+
+            if not invalid_keys & data.keys():
+                raise
+
+            _log.warning(f"Ignoring invalid stored settings: {', '.join(sorted(invalid_keys))}")
+            data = {key: value for key, value in data.items() if key not in invalid_keys}
+
+
+class SettingsTable:
+    """
+    Settings in the settings table, one JSON encoded row per top level key, or per entry of a map setting
+    (materials/<id>, gpt_modes/<mode>, user_profile/<field> ...), so that changing one entry upserts a single row.
+
+    Global settings have no project_id. All the keys of one save are written in a single transaction, which also bumps
+    the settings version counter shared by all connections to the database.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._lock = threading.Lock()
+        self._connection = connection
+        self._create_tables()
+        self.version = self.stored_version()
+
+    def _create_tables(self):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS settings_version (id INTEGER PRIMARY KEY CHECK (id = 0), version INTEGER)"
+            )
+            self._connection.execute("INSERT OR IGNORE INTO settings_version (id, version) VALUES (0, 0)")
+
+    def data_version(self) -> int:
+        """
+        Changes whenever another connection commits to the database, checking it does not read any table.
+        """
+
+        with self._lock:
+            return self._connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def stored_version(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT version FROM settings_version WHERE id = 0").fetchone()[0]
+
+    def refresh_version(self) -> int:
+        self.version = self.stored_version()
+        return self.version
+
+    def load(self, project_id: str | None) -> PartialSettingsData:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, value FROM settings WHERE is_global = ? AND project_id IS ? ORDER BY id",
+                (project_id is None, project_id),
+            ).fetchall()
+
+        data: dict[str, Any] = {}
+        nested: dict[str, dict[str, Any]] = {}
+
+        for key, value in rows:
+            top_level_key, separator, entry = key.partition(NESTED_KEY_SEPARATOR)
+
+            if separator:
+                nested.setdefault(top_level_key, {})[entry] = _decode(key, value)
+            else:
+                data[key] = _decode(key, value)
+
+        for key, entries in nested.items():
+            whole = data.get(key)
+            data[key] = {**whole, **entries} if isinstance(whole, dict) else entries
+
+        return _validate(data)
+
+    def save(self, settings_data: PartialSettingsData, project_id: str | None):
+        upserts: list[tuple[str, str]] = []
+        deletes: list[str] = []
+
+        for key, value in settings_data.model_dump(mode="json", exclude_none=True).items():
+            if key.endswith(_RESET_SUFFIX):
+                map_key = key.removesuffix(_RESET_SUFFIX)
+                deletes.extend(f"{map_key}{NESTED_KEY_SEPARATOR}{entry}" for entry in value)
+            elif isinstance(value, dict):
+                upserts.extend(
+                    (f"{key}{NESTED_KEY_SEPARATOR}{entry}", json.dumps(entry_value))
+                    for entry, entry_value in value.items()
+                )
+            else:
+                upserts.append((key, json.dumps(value)))
+
+        is_global = project_id is None
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM settings WHERE key = ? AND is_global = ? AND project_id IS ?",
+                [(key, is_global, project_id) for key in deletes],
+            )
+
+            for key, value in upserts:
+                updated = self._connection.execute(
+                    "UPDATE settings SET value = ?, updated_at = CURRENT_TIMESTAMP "
+                    "WHERE key = ? AND is_global = ? AND project_id IS ?",
+                    (value, key, is_global, project_id),
+                )
+
+                if not updated.rowcount:
+                    self._connection.execute(
+                        "INSERT INTO settings (key, value, is_global, project_id) VALUES (?, ?, ?, ?)",
+                        (key, value, is_global, project_id),
+                    )
+
+            self._connection.execute("UPDATE settings_version SET version = version + 1 WHERE id = 0")
+            self.version = self._connection.execute("SELECT version FROM settings_version WHERE id = 0").fetchone()[0]
+
+
+@lru_cache
+def settings_table() -> SettingsTable:
+    from aiconsole.core.db.database import db
+
+    return SettingsTable(db.get_connection())
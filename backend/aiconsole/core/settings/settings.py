@@ -14,52 +14,167 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import copy
 import logging
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
+from typing import Any
 
+from pydantic import BaseModel, ConfigDict
+
+from aiconsole.core.settings.db.settings_change_watcher import (
+    SettingsChangeWatcher,
+    SettingsUpdatedEvent,
+)
+from aiconsole.core.settings.db.settings_table import settings_table
 from aiconsole.core.settings.settings_notifications import SettingsNotifications
 from aiconsole.core.settings.utils.merge_settings_data import merge_settings_data
 from aiconsole.core.storage.db_storage import create_storage
+from aiconsole.utils.events import internal_events
 from aiconsole_toolkit.settings.partial_settings_data import PartialSettingsData
 from aiconsole_toolkit.settings.settings_data import SettingsData
 
 _log = logging.getLogger(__name__)
 
+
+class SettingsSnapshot(SettingsData):
+    """
+    Read only view of the unified settings, shared by all readers until the settings change.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError("Settings snapshots are read only, use settings().save to change them")
+
+
+class _FrozenDict(dict):
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _read_only
+
+    def __deepcopy__(self, memo):
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+
+class _FrozenList(list):
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(value, memo) for value in self]
+
+
+@lru_cache
+def _frozen_model_class(model_class: type[BaseModel]) -> type[BaseModel]:
+    return type(model_class.__name__, (model_class,), {"model_config": ConfigDict(frozen=True)})
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Copies nested settings (gpt modes, user profile, statuses ...) into read only counterparts.
+    """
+    if isinstance(value, BaseModel):
+        model_class = value.__class__ if value.model_config.get("frozen") else _frozen_model_class(value.__class__)
+        fields = {name: _freeze(field) for name, field in value}
+        return model_class.model_construct(value.model_fields_set, **fields)
+
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+
+    if isinstance(value, list):
+        return _FrozenList(_freeze(item) for item in value)
+
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class _CachedSnapshot:
+    version: int
+    data: SettingsSnapshot
+
+
 class Settings:
     _storage = None
     _settings_notifications: SettingsNotifications | None = None
+    _change_watcher: SettingsChangeWatcher | None = None
+    _snapshot: _CachedSnapshot | None = None
+    _version: int = 0
 
     def configure(self, project_path: Path | None = None):
         self.destroy()
         self._storage = create_storage(project_path)
         self._settings_notifications = SettingsNotifications()
+        internal_events().subscribe(SettingsUpdatedEvent, self._when_settings_updated)
+        self._start_change_watcher()
         _log.info("Settings configured with database storage")
 
     def destroy(self):
+        if self._change_watcher:
+            self._change_watcher.stop()
+            self._change_watcher = None
+
+        internal_events().unsubscribe(SettingsUpdatedEvent, self._when_settings_updated)
         self._storage = None
         self._settings_notifications = None
+        self.invalidate()
+
+    def _start_change_watcher(self):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            _log.debug("No running event loop, changes of the settings by other processes will not be noticed")
+            return
+
+        self._change_watcher = SettingsChangeWatcher(settings_table())
+        self._change_watcher.start()
 
     @property
-    def unified_settings(self) -> SettingsData:
+    def version(self) -> int:
+        """
+        Bumped on every change of the settings, the unified_settings snapshot is rebuilt once per version.
+        """
+        return self._version
+
+    def invalidate(self):
+        self._version += 1
+        self._snapshot = None
+
+    async def _when_settings_updated(self, event: SettingsUpdatedEvent, **kwargs):
+        self.invalidate()
+
+        if self._settings_notifications:
+            await self._settings_notifications.notify()
+
+    @property
+    def unified_settings(self) -> SettingsSnapshot:
         if not self._storage or not self._settings_notifications:
             raise ValueError("Settings not configured")
 
-        # Get all settings from database
-        settings_data = SettingsData()
-        
-        # Merge with any existing settings
-        return merge_settings_data(settings_data, self._storage.global_settings, self._storage.project_settings)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self._version:
+            return snapshot.data
+
+        # Built outside of any lock, a build that raced with invalidate() is tagged with the old version and never served
+        version = self._version
+        merged = merge_settings_data(SettingsData(), self._storage.global_settings, self._storage.project_settings)
+        fields = {name: _freeze(value) for name, value in merged}
+        data = SettingsSnapshot.model_construct(merged.model_fields_set, **fields)
+        self._snapshot = _CachedSnapshot(version=version, data=data)
+        return data
 
     def save(self, settings_data: PartialSettingsData, to_global: bool):
         if not self._storage or not self._settings_notifications:
             raise ValueError("Settings not configured")
 
         self._settings_notifications.suppress_next_notification()
-        
-        # Save each setting to database
-        for key, value in settings_data.model_dump(exclude_none=True).items():
-            self._storage.save_setting(key, str(value), to_global)
+
+        try:
+            self._storage.save(settings_data, to_global)
+        finally:
+            self.invalidate()
+
 
 # Singleton instance
 @lru_cache()
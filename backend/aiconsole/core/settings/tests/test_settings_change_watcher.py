@@ -0,0 +1,81 @@
+import sqlite3
+
+import pytest
+
+from aiconsole.core.settings.db.settings_change_watcher import (
+    SettingsChangeWatcher,
+    SettingsUpdatedEvent,
+)
+from aiconsole.core.settings.db.settings_table import SettingsTable
+from aiconsole.utils.events import internal_events
+from aiconsole_toolkit.settings.partial_settings_data import PartialSettingsData
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "aiconsole.db"
+
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "CREATE TABLE settings (id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL, value TEXT, "
+            "is_global BOOLEAN DEFAULT 1, project_id TEXT, updated_at TIMESTAMP, UNIQUE(key, project_id))"
+        )
+
+    connections: list[sqlite3.Connection] = []
+
+    def connect() -> SettingsTable:
+        connections.append(sqlite3.connect(path))
+        return SettingsTable(connections[-1])
+
+    yield connect
+
+    for connection in connections:
+        connection.close()
+
+
+@pytest.fixture
+def events():
+    received: list[SettingsUpdatedEvent] = []
+
+    async def _handler(event: SettingsUpdatedEvent, **kwargs):
+        received.append(event)
+
+    internal_events().subscribe(SettingsUpdatedEvent, _handler)
+    yield received
+    internal_events().unsubscribe(SettingsUpdatedEvent, _handler)
+
+
+@pytest.mark.asyncio
+async def test_notices_saves_of_other_connections(database, events):
+    watcher = SettingsChangeWatcher(database())
+    other_process = database()
+
+    assert not await watcher.check()
+
+    other_process.save(PartialSettingsData(code_autorun=True), project_id=None)
+
+    assert await watcher.check()
+    assert not await watcher.check()
+    assert len(events) == 1
+
+
+@pytest.mark.asyncio
+async def test_notices_saves_of_this_connection(database, events):
+    table = database()
+    watcher = SettingsChangeWatcher(table)
+
+    table.save(PartialSettingsData(code_autorun=True), project_id=None)
+
+    assert await watcher.check()
+    assert len(events) == 1
+
+
+@pytest.mark.asyncio
+async def test_stops_polling(database):
+    watcher = SettingsChangeWatcher(database(), interval=0.01)
+
+    watcher.start()
+    assert watcher.running
+
+    watcher.stop()
+    assert not watcher.running
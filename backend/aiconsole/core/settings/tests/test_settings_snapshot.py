@@ -0,0 +1,98 @@
+import pydantic
+import pytest
+
+from aiconsole.core.assets.types import AssetStatus
+from aiconsole.core.settings import settings as settings_module
+from aiconsole.core.settings.db.settings_change_watcher import SettingsUpdatedEvent
+from aiconsole.core.settings.settings import Settings
+from aiconsole.utils.events import internal_events
+from aiconsole_toolkit.settings.partial_settings_data import PartialSettingsData
+
+
+class _FakeStorage:
+    def __init__(self):
+        self.reads = 0
+        self.saved: dict[str, str] = {}
+
+    @property
+    def global_settings(self) -> PartialSettingsData:
+        self.reads += 1
+        return PartialSettingsData(code_autorun=self.saved.get("code_autorun") == "True")
+
+    @property
+    def project_settings(self) -> PartialSettingsData:
+        return PartialSettingsData()
+
+    def save(self, settings_data: PartialSettingsData, to_global: bool):
+        self.saved.update({key: str(value) for key, value in settings_data.model_dump(exclude_none=True).items()})
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    fake = _FakeStorage()
+    monkeypatch.setattr(settings_module, "create_storage", lambda project_path: fake)
+    return fake
+
+
+@pytest.fixture
+def configured(storage):
+    settings = Settings()
+    settings.configure()
+    yield settings
+    settings.destroy()
+
+
+def test_serves_the_same_snapshot_until_settings_change(configured, storage):
+    first = configured.unified_settings
+
+    assert configured.unified_settings is first
+    assert storage.reads == 1
+
+
+def test_snapshot_is_read_only(configured):
+    with pytest.raises(pydantic.ValidationError):
+        configured.unified_settings.code_autorun = True
+
+
+def test_nested_settings_of_the_snapshot_are_read_only(configured):
+    snapshot = configured.unified_settings
+    gpt_mode = next(iter(snapshot.gpt_modes))
+
+    with pytest.raises(TypeError):
+        snapshot.gpt_modes[gpt_mode] = snapshot.gpt_modes[gpt_mode]
+    with pytest.raises(TypeError):
+        snapshot.materials["material"] = AssetStatus.FORCED
+    with pytest.raises(TypeError):
+        snapshot.gpt_modes[gpt_mode].fallbacks.append("speed")
+    with pytest.raises(pydantic.ValidationError):
+        snapshot.gpt_modes[gpt_mode].max_tokens = 1
+    with pytest.raises(pydantic.ValidationError):
+        snapshot.user_profile.username = "someone else"
+
+    assert snapshot.model_dump(mode="json")["gpt_modes"][gpt_mode]["max_tokens"] > 1
+    assert snapshot.model_copy(deep=True).gpt_modes == snapshot.gpt_modes
+
+
+def test_save_invalidates_the_snapshot(configured, storage):
+    version = configured.version
+    assert configured.unified_settings.code_autorun is False
+
+    configured.save(PartialSettingsData(code_autorun=True), to_global=True)
+
+    assert configured.version > version
+    assert configured.unified_settings.code_autorun is True
+    assert storage.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_external_change_invalidates_the_snapshot(configured, storage, monkeypatch):
+    first = configured.unified_settings
+
+    async def _notify():
+        pass
+
+    monkeypatch.setattr(configured._settings_notifications, "notify", _notify)
+    await internal_events().emit(SettingsUpdatedEvent())
+
+    assert configured.unified_settings is not first
+    assert storage.reads == 2
@@ -0,0 +1,93 @@
+import sqlite3
+
+import pytest
+
+from aiconsole.core.assets.types import AssetStatus
+from aiconsole.core.settings.db.settings_table import SettingsTable
+from aiconsole.core.users.types import PartialUserProfile
+from aiconsole_toolkit.settings.partial_settings_data import PartialSettingsData
+
+
+@pytest.fixture
+def connection():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("""
+        CREATE TABLE settings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            key TEXT NOT NULL,
+            value TEXT,
+            is_global BOOLEAN DEFAULT 1,
+            project_id TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(key, project_id)
+        )
+        """)
+    yield connection
+    connection.close()
+
+
+def _rows(connection: sqlite3.Connection) -> dict[str, str]:
+    return dict(connection.execute("SELECT key, value FROM settings").fetchall())
+
+
+def test_round_trips_typed_values(connection):
+    table = SettingsTable(connection)
+
+    table.save(
+        PartialSettingsData(
+            code_autorun=True,
+            openai_api_key="sk-test",
+            user_profile=PartialUserProfile(username="user"),
+            materials={"a": AssetStatus.FORCED},
+        ),
+        project_id=None,
+    )
+
+    loaded = table.load(project_id=None)
+    assert loaded.code_autorun is True
+    assert loaded.openai_api_key == "sk-test"
+    assert loaded.user_profile is not None and loaded.user_profile.username == "user"
+    assert loaded.materials == {"a": AssetStatus.FORCED}
+
+
+def test_upserts_single_map_entries(connection):
+    table = SettingsTable(connection)
+    table.save(PartialSettingsData(materials={"a": AssetStatus.ENABLED, "b": AssetStatus.ENABLED}), project_id=None)
+
+    table.save(PartialSettingsData(materials={"b": AssetStatus.DISABLED}), project_id=None)
+
+    assert table.load(project_id=None).materials == {"a": AssetStatus.ENABLED, "b": AssetStatus.DISABLED}
+    assert len(_rows(connection)) == 2
+
+
+def test_resets_map_entries(connection):
+    table = SettingsTable(connection)
+    table.save(PartialSettingsData(agents={"a": AssetStatus.ENABLED, "b": AssetStatus.DISABLED}), project_id="p")
+
+    table.save(PartialSettingsData(agents_to_reset=["a"], agents={"c": AssetStatus.ENABLED}), project_id="p")
+
+    assert table.load(project_id="p").agents == {"b": AssetStatus.DISABLED, "c": AssetStatus.ENABLED}
+
+
+def test_keeps_global_and_project_settings_apart(connection):
+    table = SettingsTable(connection)
+    table.save(PartialSettingsData(code_autorun=True), project_id=None)
+    table.save(PartialSettingsData(code_autorun=False), project_id="p")
+
+    assert table.load(project_id=None).code_autorun is True
+    assert table.load(project_id="p").code_autorun is False
+    assert table.load(project_id="other").code_autorun is None
+
+
+def test_reads_legacy_rows_and_drops_invalid_ones(connection):
+    connection.executemany(
+        "INSERT INTO settings (key, value, is_global, project_id) VALUES (?, ?, 1, NULL)",
+        [("code_autorun", "True"), ("openai_api_key", "sk-legacy"), ("gpt_modes", "{'x': <GPTModeConfig>}")],
+    )
+
+    loaded = SettingsTable(connection).load(project_id=None)
+
+    assert loaded.code_autorun is True
+    assert loaded.openai_api_key == "sk-legacy"
+    assert loaded.gpt_modes is None
@@ -9,7 +9,9 @@ from aiconsole.core.db.models import (
 from aiconsole.core.db.operations import DatabaseOperations
 from aiconsole.core.assets.types import AssetType
 from aiconsole.core.chat.types import Chat as ChatType
+from aiconsole.core.settings.db.settings_table import settings_table
 from aiconsole.core.settings.settings_storage import SettingsStorage
+from aiconsole_toolkit.settings.partial_settings_data import PartialSettingsData
 
 if TYPE_CHECKING:
     from aiconsole.core.assets.assets import Assets
@@ -28,22 +30,22 @@ class DatabaseStorage:
         DatabaseOperations.save_setting(key, value, is_global, self.project_id)
 
     @property
-    def global_settings(self) -> Dict[str, Any]:
+    def global_settings(self) -> PartialSettingsData:
         """Get all global settings"""
-        settings = {}
-        for setting in DatabaseOperations.get_all_settings(is_global=True):
-            settings[setting.key] = setting.value
-        return settings
+        return settings_table().load(project_id=None)
 
     @property
-    def project_settings(self) -> Dict[str, Any]:
+    def project_settings(self) -> PartialSettingsData:
         """Get all project settings"""
         if not self.project_id:
-            return {}
-        settings = {}
-        for setting in DatabaseOperations.get_all_settings(is_global=False, project_id=self.project_id):
-            settings[setting.key] = setting.value
-        return settings
+            return PartialSettingsData()
+        return settings_table().load(project_id=self.project_id)
+
+    def save(self, settings_data: PartialSettingsData, to_global: bool):
+        """Save all keys of the settings in one transaction"""
+        if not to_global and not self.project_id:
+            raise ValueError("Cannot save project settings, no project is open")
+        settings_table().save(settings_data, project_id=None if to_global else self.project_id)
 
     # Asset Storage
     def get_asset(self, asset_type: AssetType, asset_id: str) -> Optional[Asset]:
@@ -19,7 +19,7 @@ class MissingFileName(Exception):
 
 class UserProfileService:
     def get_profile(self, email: str | None = None) -> UserProfile:
-        user_profile = settings().unified_settings.user_profile
+        user_profile = UserProfile(**settings().unified_settings.user_profile.model_dump())
         if not user_profile.avatar_url:
             user_profile.avatar_url = self._get_default_avatar()
         if email:
@@ -1,3 +1,4 @@
+import asyncio
 import getpass
 import os
 import platform
@@ -7,6 +8,8 @@ from aiconsole_toolkit.env import get_current_project_venv_available_packages
 
 
 async def content(context):
+    packages = await asyncio.to_thread(get_current_project_venv_available_packages)
+
     return f"""
 ## Execution environment
 
@@ -18,5 +21,5 @@ python_version: {platform.python_version()}
 default_shell: {os.environ.get('SHELL')}
 
 ## Python Packages
-{get_current_project_venv_available_packages()}
+{packages}
 """
@@ -0,0 +1,246 @@
+import asyncio
+import logging
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import watchdog.events
+import watchdog.observers
+
+_log = logging.getLogger(__name__)
+
+DEBOUNCE_SECONDS = 1.0
+
+OnChanged = Callable[[set[Path]], Awaitable[None]]
+
+
+class FileSubscription:
+    """
+    Changes of the files under path (or of the file itself), batched until no change happened for debounce seconds
+    and delivered to on_changed on the loop that subscribed. A batch arriving while on_changed is still running is
+    delivered once it finishes.
+    """
+
+    def __init__(
+        self,
+        watcher: "FileWatcher",
+        path: Path,
+        on_changed: OnChanged,
+        loop: asyncio.AbstractEventLoop,
+        recursive: bool,
+        extension: str | None,
+        debounce: float,
+    ):
+        self._watcher = watcher
+        self.path = path
+        self.on_changed = on_changed
+        self.recursive = recursive
+        self.extension = extension
+        self.debounce = debounce
+        self.loop = loop
+        self.pending: set[Path] = set()
+        self.timer: asyncio.TimerHandle | None = None
+        self.task: asyncio.Task | None = None
+        self.active = True
+
+    def matches(self, path: Path) -> bool:
+        if self.extension and path.suffix != self.extension:
+            return False
+
+        if path == self.path:
+            return True
+
+        if self.recursive:
+            return self.path in path.parents
+
+        return path.parent == self.path
+
+    def cancel(self):
+        self._watcher.unsubscribe(self)
+
+
+class _Handler(watchdog.events.FileSystemEventHandler):
+    def __init__(self, watcher: "FileWatcher"):
+        self._watcher = watcher
+
+    def on_any_event(self, event: watchdog.events.FileSystemEvent):
+        if event.is_directory or event.event_type not in ("created", "modified", "moved", "deleted"):
+            return
+
+        paths = [Path(str(event.src_path))]
+        dest_path = getattr(event, "dest_path", None)
+        if dest_path:
+            paths.append(Path(str(dest_path)))
+
+        self._watcher.dispatch(paths)
+
+
+class FileWatcher:
+    """
+    One watchdog observer for the whole process, shared by all subscriptions.
+
+    Directories are scheduled on the observer while at least one subscription needs them, the observer thread only
+    hands events over to the loops of the subscriptions, debouncing and coalescing happen there.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._observer: watchdog.observers.Observer | None = None
+        self._subscriptions: list[FileSubscription] = []
+        self._watches: dict[tuple[Path, bool], object] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._observer is not None and self._observer.is_alive()
+
+    @property
+    def subscriptions(self) -> list[FileSubscription]:
+        return list(self._subscriptions)
+
+    def subscribe(
+        self,
+        path: Path,
+        on_changed: OnChanged,
+        recursive: bool = False,
+        extension: str | None = None,
+        debounce: float = DEBOUNCE_SECONDS,
+    ) -> FileSubscription:
+        subscription = FileSubscription(
+            self, path.absolute(), on_changed, asyncio.get_running_loop(), recursive, extension, debounce
+        )
+
+        with self._lock:
+            self._subscriptions.append(subscription)
+            self._schedule(subscription)
+
+        _log.debug(f"[{self.__class__.__name__}] Subscribed to {subscription.path}")
+        return subscription
+
+    def unsubscribe(self, subscription: FileSubscription):
+        with self._lock:
+            if subscription not in self._subscriptions:
+                return
+
+            self._subscriptions.remove(subscription)
+            subscription.active = False
+
+            directory, recursive = self._watch_key(subscription)
+            if not any(self._watch_key(other) == (directory, recursive) for other in self._subscriptions):
+                watch = self._watches.pop((directory, recursive), None)
+                if watch is not None and self._observer is not None:
+                    self._observer.unschedule(watch)
+
+        if subscription.timer is not None:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.timer.cancel)
+            except RuntimeError:
+                pass
+            subscription.timer = None
+
+        _log.debug(f"[{self.__class__.__name__}] Unsubscribed from {subscription.path}")
+
+    def stop(self):
+        """
+        Cancels all subscriptions and stops the observer thread, waiting for it to finish.
+        """
+
+        with self._lock:
+            for subscription in list(self._subscriptions):
+                self.unsubscribe(subscription)
+
+            observer, self._observer = self._observer, None
+            self._watches.clear()
+
+        if observer is not None and observer.is_alive():
+            observer.stop()
+            observer.join()
+            _log.info(f"[{self.__class__.__name__}] Observer stopped.")
+
+    @staticmethod
+    def _watch_key(subscription: FileSubscription) -> tuple[Path, bool]:
+        if subscription.path.is_dir():
+            return subscription.path, subscription.recursive
+        return subscription.path.parent, False
+
+    def _schedule(self, subscription: FileSubscription):
+        directory, recursive = self._watch_key(subscription)
+
+        if (directory, recursive) in self._watches:
+            return
+
+        if self._observer is None:
+            self._observer = watchdog.observers.Observer()
+            self._observer.daemon = True
+
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._watches[(directory, recursive)] = self._observer.schedule(
+                _Handler(self), str(directory), recursive=recursive
+            )
+        except Exception as e:
+            _log.error(f"[{self.__class__.__name__}] Error setting up observer for {directory}: {e}")
+            return
+
+        if not self._observer.is_alive():
+            self._observer.start()
+            _log.info(f"[{self.__class__.__name__}] Observer started.")
+
+    def dispatch(self, paths: list[Path]):
+        """
+        Called from the observer thread.
+        """
+
+        with self._lock:
+            matched = [
+                (subscription, {path for path in paths if subscription.matches(path)})
+                for subscription in self._subscriptions
+            ]
+
+        for subscription, changed in matched:
+            if not changed:
+                continue
+
+            try:
+                subscription.loop.call_soon_threadsafe(self._collect, subscription, changed)
+            except RuntimeError:
+                _log.debug(f"[{self.__class__.__name__}] Loop of {subscription.path} is closed, dropping changes")
+
+    def _collect(self, subscription: FileSubscription, changed: set[Path]):
+        if not subscription.active:
+            return
+
+        subscription.pending |= changed
+
+        if subscription.timer is not None:
+            subscription.timer.cancel()
+
+        subscription.timer = subscription.loop.call_later(subscription.debounce, self._flush, subscription)
+
+    def _flush(self, subscription: FileSubscription):
+        subscription.timer = None
+
+        if not subscription.active or not subscription.pending:
+            return
+
+        if subscription.task is not None and not subscription.task.done():
+            # Delivered when the running callback finishes
+            return
+
+        changed, subscription.pending = subscription.pending, set()
+        subscription.task = subscription.loop.create_task(subscription.on_changed(changed))
+        subscription.task.add_done_callback(lambda task: self._when_delivered(subscription, task))
+
+    def _when_delivered(self, subscription: FileSubscription, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            _log.error(
+                f"[{self.__class__.__name__}] Error handling changes of {subscription.path}: {task.exception()}"
+            )
+
+        if subscription.pending and subscription.timer is None:
+            self._flush(subscription)
+
+
+@lru_cache
+def file_watcher() -> FileWatcher:
+    return FileWatcher()
@@ -0,0 +1,77 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from aiconsole.utils.file_watcher import FileWatcher
+
+
+@pytest.fixture
+def watcher():
+    watcher = FileWatcher()
+    yield watcher
+    watcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_shares_one_observer_between_subscriptions(watcher, tmp_path):
+    async def on_changed(paths: set[Path]):
+        pass
+
+    first = watcher.subscribe(tmp_path / "materials", on_changed, recursive=True)
+    second = watcher.subscribe(tmp_path / "agents", on_changed, recursive=True)
+
+    assert watcher.running
+    assert watcher.subscriptions == [first, second]
+
+    first.cancel()
+    assert watcher.subscriptions == [second]
+
+
+@pytest.mark.asyncio
+async def test_debounces_and_coalesces_changes(watcher, tmp_path):
+    batches: list[set[Path]] = []
+    delivered = asyncio.Event()
+
+    async def on_changed(paths: set[Path]):
+        batches.append(paths)
+        delivered.set()
+
+    subscription = watcher.subscribe(tmp_path, on_changed, recursive=True, extension=".toml", debounce=0.05)
+
+    watcher.dispatch([tmp_path / "a.toml", tmp_path / "ignored.txt"])
+    watcher.dispatch([tmp_path / "nested" / "b.toml"])
+    watcher.dispatch([tmp_path / "a.toml"])
+
+    await asyncio.wait_for(delivered.wait(), timeout=1)
+    await asyncio.sleep(0.1)
+
+    assert batches == [{subscription.path / "a.toml", subscription.path / "nested" / "b.toml"}]
+
+
+@pytest.mark.asyncio
+async def test_delivers_changes_from_the_filesystem(watcher, tmp_path):
+    delivered: asyncio.Queue[set[Path]] = asyncio.Queue()
+
+    async def on_changed(paths: set[Path]):
+        await delivered.put(paths)
+
+    watcher.subscribe(tmp_path, on_changed, recursive=True, extension=".toml", debounce=0.05)
+    (tmp_path / "a.toml").write_text("name = 'a'")
+
+    assert tmp_path.absolute() / "a.toml" in await asyncio.wait_for(delivered.get(), timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_subscriptions_and_joins_the_observer(watcher, tmp_path):
+    async def on_changed(paths: set[Path]):
+        pass
+
+    subscription = watcher.subscribe(tmp_path, on_changed)
+    observer = watcher._observer
+
+    watcher.stop()
+
+    assert not subscription.active
+    assert not watcher.subscriptions
+    assert observer is not None and not observer.is_alive()
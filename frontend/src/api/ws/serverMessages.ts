@@ -79,6 +79,8 @@ export const AssetsUpdatedServerMessageSchema = BaseServerMessageSchema.extend({
   initial: z.boolean(),
   asset_type: AssetTypeSchema, // Assuming Asset is an enum
   count: z.number(),
+  changed_ids: z.array(z.string()).nullable().optional(),
+  deleted_ids: z.array(z.string()).nullable().optional(),
 });
 
 export type AssetsUpdatedServerMessage = z.infer<typeof AssetsUpdatedServerMessageSchema>;